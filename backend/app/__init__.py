@@ -3,6 +3,8 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from app.config import config
+from app.utils.serialization import FastJSONProvider
+from app.utils import metrics, profiling, tracing
 import logging
 
 db = SQLAlchemy()
@@ -11,11 +13,15 @@ migrate = Migrate()
 def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     CORS(app, origins=['http://localhost:3000'])
+    metrics.init_app(app)
+    tracing.init_app(app)
+    profiling.init_app(app)
     
     # Setup logging
     logging.basicConfig(level=logging.INFO)
@@ -23,14 +29,18 @@ def create_app(config_name='default'):
     # Import models to ensure they're registered with SQLAlchemy
     from app.models.user import User
     from app.models.tweet import Tweet
+    from app.models.tweet_media import TweetMedia
     from app.models.post import Post
+    from app.models.item_prediction import ItemPrediction
     
     # Register blueprints
     from app.routes.user_routes import user_bp
     from app.routes.health_routes import health_bp
     from app.routes.twitter_routes import twitter_routes
-    from app.utils.download_models import download_models
-    download_models()
+    
+    # Fetch and load the models, then the fusion artifacts, so requests never read them from disk
+    from app.utils import startup
+    startup.init_app(app)
     app.register_blueprint(user_bp, url_prefix='/api')
     app.register_blueprint(health_bp, url_prefix='/api')
     app.register_blueprint(twitter_routes, url_prefix='/api')
@@ -11,6 +11,99 @@ class Config:
     MAX_TWEETS_PER_REQUEST = int(os.environ.get('MAX_TWEETS_PER_REQUEST', 50))
     MAX_POSTS_PER_REQUEST = int(os.environ.get('MAX_POSTS_PER_REQUEST', 20))
     SCRAPING_DELAY = int(os.environ.get('SCRAPING_DELAY', 2))
+    REFRESH_MODE = os.environ.get('REFRESH_MODE', 'incremental')  # incremental or full
+    
+    # Background scrape queue (see scrape_workers.py)
+    SCRAPE_QUEUE_PATH = os.environ.get('SCRAPE_QUEUE_PATH') or os.path.join('instance', 'scrape_queue.db')
+    SCRAPE_LEASE_SECONDS = int(os.environ.get('SCRAPE_LEASE_SECONDS', 600))
+    SCRAPE_MAX_ATTEMPTS = int(os.environ.get('SCRAPE_MAX_ATTEMPTS', 3))
+    SCRAPE_BACKOFF_SECONDS = int(os.environ.get('SCRAPE_BACKOFF_SECONDS', 30))
+    SCRAPE_WORKERS = int(os.environ.get('SCRAPE_WORKERS', 2))
+    
+    # Per-tweet heuristic scoring (GET /api/user/<username>/heuristics)
+    HEURISTICS_MAX_TWEETS = int(os.environ.get('HEURISTICS_MAX_TWEETS', 100000))
+    HEURISTICS_CACHE_SIZE = int(os.environ.get('HEURISTICS_CACHE_SIZE', 32))  # cached user matrices, 0 disables
+    
+    # Text model tokenization
+    USE_FAST_TOKENIZERS = os.environ.get('USE_FAST_TOKENIZERS', 'true').lower() == 'true'
+    TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))  # cached encodings, 0 disables
+    
+    # Comma-separated text models to run with INT8 dynamic quantization on CPU (e.g. "xlnet,bert")
+    QUANTIZED_TEXT_MODELS = [
+        name.strip() for name in os.environ.get('QUANTIZED_TEXT_MODELS', '').split(',') if name.strip()
+    ]
+    
+    # Inference backend for the classifiers: "torch" (PyTorch/Keras) or "onnx" (ONNX Runtime)
+    INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'torch').lower()
+    ONNX_PROVIDERS = [
+        name.strip() for name in os.environ.get('ONNX_PROVIDERS', 'CPUExecutionProvider').split(',') if name.strip()
+    ]
+    ONNX_INTRA_OP_THREADS = int(os.environ.get('ONNX_INTRA_OP_THREADS', 0))  # 0 lets ONNX Runtime decide
+    ONNX_INTER_OP_THREADS = int(os.environ.get('ONNX_INTER_OP_THREADS', 0))
+    ONNX_GRAPH_OPTIMIZATION = os.environ.get('ONNX_GRAPH_OPTIMIZATION', 'all')  # disable, basic, extended, all
+    ONNX_USE_IO_BINDING = os.environ.get('ONNX_USE_IO_BINDING', 'true').lower() == 'true'
+    
+    # Early-exit cascade (fusion_technique="cascade"): models in cost order, cheapest first. The first
+    # model is the cheap stage every request starts with, followed by the requested models; later stages
+    # only see items whose top-two probability margin is below the threshold
+    CASCADE_TEXT_STAGES = [name.strip() for name in os.environ.get('CASCADE_TEXT_STAGES', 'bert,xlnet').split(',')
+                           if name.strip()]
+    CASCADE_IMAGE_STAGES = [name.strip() for name in os.environ.get('CASCADE_IMAGE_STAGES', 'vgg16,clip').split(',')
+                            if name.strip()]
+    CASCADE_MARGIN_THRESHOLD = float(os.environ.get('CASCADE_MARGIN_THRESHOLD', 0.5))
+    
+    # Cross-request micro-batching: model calls run in-process and concurrent requests share
+    # forward passes of up to BATCH_MAX_SIZE items, waiting at most BATCH_MAX_WAIT_MS to fill one
+    MICRO_BATCHING = os.environ.get('MICRO_BATCHING', 'false').lower() == 'true'
+    BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 32))
+    BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', 5))
+    
+    # Incremental profile analysis: per-item predictions are stored, so re-analysis of the same recent
+    # window (ANALYSIS_WINDOW tweets and their media) only runs the models on items they have not scored yet
+    INCREMENTAL_ANALYSIS = os.environ.get('INCREMENTAL_ANALYSIS', 'false').lower() == 'true'
+    ANALYSIS_WINDOW = int(os.environ.get('ANALYSIS_WINDOW', 100))
+    
+    # Fusion artifacts (fusion_model.pkl etc.): versions are hot-reloaded when CURRENT or their
+    # files change, checked every FUSION_RELOAD_INTERVAL seconds (0 loads once)
+    FUSION_ARTIFACT_DIR = os.environ.get('FUSION_ARTIFACT_DIR')  # defaults to app/utils/fusion_artifacts
+    FUSION_RELOAD_INTERVAL = float(os.environ.get('FUSION_RELOAD_INTERVAL', 5))
+    
+    # Startup: "sync" fetches missing model files and loads the models inside create_app; "background"
+    # does it in a thread so workers boot at once and /api/ready answers 503 until the models are loaded.
+    # Disable MODEL_DOWNLOAD_ON_STARTUP when prepare_models.py runs as a separate deploy step
+    MODEL_PREPARE_MODE = os.environ.get('MODEL_PREPARE_MODE', 'sync')  # sync or background
+    MODEL_DOWNLOAD_ON_STARTUP = os.environ.get('MODEL_DOWNLOAD_ON_STARTUP', 'true').lower() == 'true'
+    
+    # Warm-up once the models load: each of WARMUP_MODELS runs WARMUP_ROUNDS synthetic batches of every
+    # WARMUP_BATCH_SIZES size (default: 1, plus BATCH_MAX_SIZE with MICRO_BATCHING) before /api/ready passes.
+    # On by default only in background mode; in sync mode it would slow every create_app, so it is opt-in there
+    WARMUP_MODELS = [name.strip() for name in os.environ.get(
+        'WARMUP_MODELS', 'xlnet,bert,vgg16,clip' if MODEL_PREPARE_MODE == 'background' else ''
+    ).split(',') if name.strip()]
+    WARMUP_BATCH_SIZES = [int(size) for size in os.environ.get('WARMUP_BATCH_SIZES', '').split(',') if size]
+    WARMUP_ROUNDS = int(os.environ.get('WARMUP_ROUNDS', 2))
+    
+    # Request tracing: ?trace=1 or an "X-Trace: 1" header returns the request's span tree under
+    # "trace" in JSON responses; traced requests are appended to TRACE_FILE (JSON lines) when set
+    TRACE_FILE = os.environ.get('TRACE_FILE')
+    TRACE_ALL_REQUESTS = os.environ.get('TRACE_ALL_REQUESTS', 'false').lower() == 'true'  # export every request
+    TRACE_MAX_SPANS = int(os.environ.get('TRACE_MAX_SPANS', 10000))
+    
+    # Opt-in profiling of a PROFILE_SAMPLE_RATE fraction (0 disables) of requests to the listed
+    # endpoints: stack samples every PROFILE_INTERVAL_MS (plus cProfile with PROFILE_CPROFILE)
+    # written per request and aggregated as folded flame-graph stacks under PROFILE_DIR
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_ENDPOINTS = os.environ.get(
+        'PROFILE_ENDPOINTS', 'analyze_user_profile,analyze_user,get_bias_detection'
+    ).split(',')
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join('instance', 'profiles'))
+    PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+    PROFILE_CPROFILE = os.environ.get('PROFILE_CPROFILE', 'false').lower() == 'true'
+    
+    # Analysis cache serialization
+    CACHE_SERIALIZER = os.environ.get('CACHE_SERIALIZER', 'json')  # json or msgpack
+    CACHE_COMPRESS_THRESHOLD = int(os.environ.get('CACHE_COMPRESS_THRESHOLD', 4096))  # bytes, 0 disables
+    CACHE_COMPRESSION_LEVEL = int(os.environ.get('CACHE_COMPRESSION_LEVEL', 3))
     
     # Pagination
     DEFAULT_PAGE_SIZE = 20
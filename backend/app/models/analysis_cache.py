@@ -1,6 +1,8 @@
 import sqlite3
 import os
-import json
+from app.config import Config
+from app.utils.metrics import record_cache, timed
+from app.utils.serialization import pack_blob, unpack_blob
 from datetime import datetime
 import logging
 
@@ -11,11 +13,22 @@ class AnalysisCache:
     
     def __init__(self):
         self.db_path = os.path.join('instance', 'x_sentiment.db')
+        self.serializer = Config.CACHE_SERIALIZER
+        self.compress_threshold = Config.CACHE_COMPRESS_THRESHOLD
+        self.compression_level = Config.CACHE_COMPRESSION_LEVEL
+    
+    def _pack(self, value):
+        """Encode a cache column value"""
+        if not value:
+            return None
+        return pack_blob(value, codec=self.serializer, compress_threshold=self.compress_threshold,
+                         compression_level=self.compression_level)
     
     def _get_connection(self):
         """Get database connection"""
         return sqlite3.connect(self.db_path)
     
+    @timed('analysis_cache', 'get')
     def get_cached_analysis(self, username, analysis_type):
         """Get cached analysis for a user and analysis type"""
         try:
@@ -34,19 +47,21 @@ class AnalysisCache:
             if row:
                 user_profile, tweets_data, analysis_results, is_dynamic, updated_at = row
                 return {
-                    'user_profile': json.loads(user_profile) if user_profile else None,
-                    'tweets_data': json.loads(tweets_data) if tweets_data else None,
-                    'analysis_results': json.loads(analysis_results) if analysis_results else None,
+                    'user_profile': unpack_blob(user_profile) if user_profile else None,
+                    'tweets_data': unpack_blob(tweets_data) if tweets_data else None,
+                    'analysis_results': unpack_blob(analysis_results) if analysis_results else None,
                     'is_dynamic': bool(is_dynamic),
                     'updated_at': datetime.fromisoformat(updated_at) if updated_at else datetime.utcnow()
                 }
             
+            record_cache('analysis', 'miss')
             return None
             
         except Exception as e:
             logger.error(f"Error getting cached analysis: {e}")
             return None
     
+    @timed('analysis_cache', 'put')
     def cache_analysis(self, username, analysis_type, user_profile, tweets_data, analysis_results, is_dynamic=False):
         """Cache analysis results"""
         try:
@@ -69,9 +84,9 @@ class AnalysisCache:
                         is_dynamic = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE username = ? AND analysis_type = ?
                 ''', (
-                    json.dumps(user_profile) if user_profile else None,
-                    json.dumps(tweets_data) if tweets_data else None,
-                    json.dumps(analysis_results) if analysis_results else None,
+                    self._pack(user_profile),
+                    self._pack(tweets_data),
+                    self._pack(analysis_results),
                     is_dynamic,
                     username, analysis_type
                 ))
@@ -83,9 +98,9 @@ class AnalysisCache:
                     VALUES (?, ?, ?, ?, ?, ?)
                 ''', (
                     username, analysis_type,
-                    json.dumps(user_profile) if user_profile else None,
-                    json.dumps(tweets_data) if tweets_data else None,
-                    json.dumps(analysis_results) if analysis_results else None,
+                    self._pack(user_profile),
+                    self._pack(tweets_data),
+                    self._pack(analysis_results),
                     is_dynamic
                 ))
             
@@ -125,7 +140,9 @@ class AnalysisCache:
         
         try:
             age = datetime.utcnow() - cache_entry['updated_at']
-            return age.total_seconds() < (max_age_hours * 3600)
+            fresh = age.total_seconds() < (max_age_hours * 3600)
+            record_cache('analysis', 'hit' if fresh else 'stale')
+            return fresh
         except Exception as e:
             logger.error(f"Error checking cache freshness: {e}")
             return False 
\ No newline at end of file
@@ -0,0 +1,42 @@
+from app import db
+from datetime import datetime
+
+class ItemPrediction(db.Model):
+    """Class probabilities of one model for one tweet text or media file"""
+    __tablename__ = 'item_predictions'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'item_type', 'item_key', 'model_name', 'variant', name='uq_item_prediction'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    # 'text' items are keyed by tweet_id, 'image' items by local media path
+    item_type = db.Column(db.String(10), nullable=False)
+    item_key = db.Column(db.String(500), nullable=False)
+    model_name = db.Column(db.String(20), nullable=False)
+    # Backend and precision the model ran with (e.g. "torch", "torch-int8", "onnx"); outputs differ slightly
+    variant = db.Column(db.String(20), nullable=False, default='torch')
+
+    prob_non_radical = db.Column(db.Float, nullable=False)
+    prob_political = db.Column(db.Float, nullable=False)
+    prob_radical = db.Column(db.Float, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ItemPrediction {self.model_name}/{self.variant}:{self.item_type}:{self.item_key}>'
+
+    @property
+    def probabilities(self):
+        return [self.prob_non_radical, self.prob_political, self.prob_radical]
+
+    def to_dict(self):
+        return {
+            'item_type': self.item_type,
+            'item_key': self.item_key,
+            'model_name': self.model_name,
+            'variant': self.variant,
+            'probabilities': self.probabilities,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
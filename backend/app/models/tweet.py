@@ -1,7 +1,7 @@
 from app import db
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import JSON
-import json
+from .tweet_media import TweetMedia
 
 class Tweet(db.Model):
     __tablename__ = 'tweets'
@@ -14,18 +14,45 @@ class Tweet(db.Model):
     text = db.Column(db.Text, nullable=False)
     language = db.Column(db.String(10), nullable=True)
     
-    # Media and URLs
-    media_urls = db.Column(db.Text)  # JSON string of URLs
-    local_media_paths = db.Column(db.Text)  # JSON string of local file paths
+    # URLs and hashtags
     urls = db.Column(db.JSON, nullable=True)  # Array of expanded URLs
     hashtags = db.Column(db.JSON, nullable=True)  # Array of hashtags
     
     # Timestamp
     posted_at = db.Column(db.DateTime, nullable=False)
+    # Set whenever a re-scrape rewrites the row, so caches over tweet text can tell it changed
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Media rows are loaded in one extra query per batch of tweets
+    media = db.relationship('TweetMedia', backref='tweet', lazy='selectin',
+                            order_by='TweetMedia.position', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Tweet {self.tweet_id}>'
     
+    @property
+    def media_urls(self):
+        return [m.media_url for m in self.media if m.media_url]
+    
+    @property
+    def local_media_paths(self):
+        return [m.local_path for m in self.media if m.local_path]
+    
+    def set_media(self, media_urls=None, local_media_paths=None, media=None):
+        """Replace media rows from scraper output.
+
+        ``media`` is a list of ``{'media_url', 'local_path'}`` pairs; when it is
+        missing, URLs and local paths are stored as separate rows.
+        """
+        if media is None:
+            media = [{'media_url': url, 'local_path': None} for url in (media_urls or [])]
+            media += [{'media_url': None, 'local_path': path} for path in (local_media_paths or [])]
+        
+        self.media = [
+            TweetMedia(position=i, media_url=item.get('media_url'), local_path=item.get('local_path'))
+            for i, item in enumerate(media)
+        ]
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -36,6 +63,6 @@ class Tweet(db.Model):
             'urls': self.urls,
             'hashtags': self.hashtags,
             'posted_at': self.posted_at.isoformat() if self.posted_at else None,
-            'media_urls': json.loads(self.media_urls) if self.media_urls else [],
-            'local_media_paths': json.loads(self.local_media_paths) if self.local_media_paths else [],
-        }
\ No newline at end of file
+            'media_urls': self.media_urls,
+            'local_media_paths': self.local_media_paths,
+        }
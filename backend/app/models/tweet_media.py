@@ -0,0 +1,24 @@
+from app import db
+
+class TweetMedia(db.Model):
+    __tablename__ = 'tweet_media'
+
+    id = db.Column(db.Integer, primary_key=True)
+    tweet_id = db.Column(db.Integer, db.ForeignKey('tweets.id', ondelete='CASCADE'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    # Remote URL and downloaded copy (either may be missing)
+    media_url = db.Column(db.String(1000), nullable=True)
+    local_path = db.Column(db.String(500), nullable=True, index=True)
+
+    def __repr__(self):
+        return f'<TweetMedia {self.tweet_id}:{self.position}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'tweet_id': self.tweet_id,
+            'position': self.position,
+            'media_url': self.media_url,
+            'local_path': self.local_path
+        }
@@ -2,6 +2,7 @@ from app import db
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import JSON
 from .tweet import Tweet
+from .item_prediction import ItemPrediction
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -37,6 +38,7 @@ class User(db.Model):
     # Relationships
     tweets = db.relationship('Tweet', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     posts = db.relationship('Post', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    item_predictions = db.relationship('ItemPrediction', lazy='dynamic', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<User {self.username}>'
@@ -1,5 +1,8 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
 from app import db
+from app.utils.metrics import render_metrics
+from app.utils.startup import READINESS
+from app.utils.warmup import model_states
 
 health_bp = Blueprint('health', __name__)
 
@@ -20,4 +23,27 @@ def health_check():
             'status': 'unhealthy',
             'database': 'disconnected',
             'error': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage timings, cache hit counts and request metrics in Prometheus text format"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+@health_bp.route('/live', methods=['GET'])
+def liveness():
+    """Liveness: the process serves requests, whether or not the models are loaded yet"""
+    return jsonify({'status': 'alive'})
+
+
+@health_bp.route('/ready', methods=['GET'])
+def readiness():
+    """
+    Readiness: 200 once model artifacts are loaded and every model is warm,
+    503 while starting or after a failed startup. Includes per-model warm-up state and timings.
+    """
+    state = READINESS.snapshot()
+    state['models'] = model_states()
+    return jsonify(state), 200 if state['status'] == 'ready' else 503
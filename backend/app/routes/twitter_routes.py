@@ -3,17 +3,16 @@ from flask import Blueprint, request, jsonify
 from app.services.x_data_fetcher import XDataFetcher
 from app.services.x_scraper import XScraper
 from app.services.gemini_ai_service import GeminiAIService
-from app.utils.models import load_models, analyze_text, analyze_image
 from app.utils.bias_detection import detect_bias, calculate_fairness_metrics
 from app.utils.social_impact import calculate_social_impact, get_protected_groups
 from app.utils.community_outreach import get_community_metrics
+from app.utils.analysis_context import AnalysisContext
 from app.models.analysis_cache import AnalysisCache
 import logging
 
 twitter_routes = Blueprint('twitter_routes', __name__)
 
-# Initialize models and services
-models = load_models()
+# Initialize services; the models load with the first analysis (or at startup, see app.utils.startup)
 x_fetcher = XDataFetcher()
 x_scraper = XScraper()
 analysis_cache = AnalysisCache()
@@ -50,8 +49,13 @@ def analyze_user():
         tweets = x_scraper.scrape_user_tweets(username)
         
         # Analyze text content
+        from app.utils.models import load_models, analyze_text, analyze_image
+        models = load_models()
         text_analysis = analyze_text(tweets, text_model, models)
         
+        # Normalize and tokenize the corpus once for all heuristic scorers
+        analysis_context = AnalysisContext(text_analysis)
+        
         # Analyze images if available
         image_analysis = None
         if user_data.get('profile_image_url'):
@@ -90,13 +94,13 @@ def analyze_user():
             except Exception as e:
                 logging.error(f"Gemini analysis failed, falling back to static data: {e}")
                 # Fallback to static analysis
-                bias_results = detect_bias(text_analysis, user_data)
-                social_impact = calculate_social_impact(text_analysis, user_data)
+                bias_results = detect_bias(analysis_context, user_data)
+                social_impact = calculate_social_impact(analysis_context, user_data)
                 community_metrics = get_community_metrics()
         else:
             # Use static analysis
-            bias_results = detect_bias(text_analysis, user_data)
-            social_impact = calculate_social_impact(text_analysis, user_data)
+            bias_results = detect_bias(analysis_context, user_data)
+            social_impact = calculate_social_impact(analysis_context, user_data)
             community_metrics = get_community_metrics()
         
         # Combine results
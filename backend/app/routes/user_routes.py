@@ -1,16 +1,18 @@
 from flask import Blueprint, request, jsonify
 from app.services.x_data_fetcher import XDataFetcher  # Updated import
 from app.services.database import DatabaseService
-from app.utils.validators import validate_username
+from app.services.profile_refresh import ProfileNotFound, refresh_profile
+from app.utils.validators import parse_bool, validate_username
 from app.models.user import User
 from app.utils.decorators import handle_errors
+from app.utils.metrics import record_cache
+from app.utils.streaming import stream_listing, wants_stream
 from app.config import Config
 import logging
 import os
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
-from app.utils.multi_models import multimodal_predict
 from app import db
 import shutil
 from  dotenv import  load_dotenv
@@ -48,8 +50,15 @@ def get_user_info():
         # Check if user exists in database and was scraped recently
         user_data = db_service.get_user_by_username(username)
         
-        if user_data and db_service.is_recently_scraped(user_data, hours=1):
+        recently_scraped = user_data is not None and db_service.is_recently_scraped(user_data, hours=1)
+        record_cache('profile', 'hit' if recently_scraped else ('stale' if user_data else 'miss'))
+        if recently_scraped:
             # Return cached data
+            if wants_stream():
+                return stream_listing(
+                    {'success': True, 'user': user_data.to_dict(), 'source': 'cache'},
+                    {'tweets': db_service.iter_user_tweets(user_data.id, limit=50)}
+                )
             tweets = db_service.get_user_tweets(user_data.id, limit=50)
             # posts = db_service.get_user_posts(user_data.id, limit=20)
             
@@ -86,6 +95,12 @@ def get_user_info():
         
         logger.info(f"Successfully fetched and saved data for {username}")
         
+        if wants_stream():
+            return stream_listing(
+                {'success': True, 'user': user_obj.to_dict(), 'source': 'fresh'},
+                {'tweets': tweet_objs}
+            )
+        
         return jsonify({
             'success': True,
             'user': user_obj.to_dict(),
@@ -101,60 +116,49 @@ def get_user_info():
 @handle_errors
 def refresh_user_data(username):
     """
-    Force refresh user data
+    Refresh user data.
+
+    In incremental mode (the default, see ``REFRESH_MODE``) only tweets newer than
+    the newest stored one are scraped and appended, and downloaded media is kept.
+    Pass ``mode=full`` (query string or JSON body) to wipe and re-scrape everything.
     """
     if not validate_username(username):
         return jsonify({'error': 'Invalid username format'}), 400
     
     username = username.replace('@', '').strip()
-    user = db_service.get_user_by_username(username)
-    user_folder_path = os.path.join('downloaded_images', username)  # adjust path if needed
-    if os.path.exists(user_folder_path):
-        shutil.rmtree(user_folder_path)
-        logger.info(f"Deleted folder at {user_folder_path}")
-    else:
-        logger.warning(f"No folder found at {user_folder_path}")
+    data = request.get_json(silent=True) or {}
+    mode = request.args.get('mode') or data.get('mode') or Config.REFRESH_MODE
     
     try:
         # Use hybrid data fetcher
         data_fetcher = XDataFetcher()
-        
         try:
-            # Get fresh profile info
-            profile_data = data_fetcher.get_user_profile(username)
-            if not profile_data:
-                return jsonify({'error': 'User not found or profile is private'}), 404
-            
-            # Get fresh tweets
-            tweets_data = data_fetcher.get_user_tweets(username, max_tweets=Config.MAX_TWEETS_PER_REQUEST)
-            
-            
+            refreshed = refresh_profile(data_fetcher, username, mode, Config.MAX_TWEETS_PER_REQUEST,
+                                        db_service=db_service)
+        except ProfileNotFound:
+            return jsonify({'error': 'User not found or profile is private'}), 404
         finally:
             # Clean up resources
             data_fetcher.close()
         
-        if tweets_data:
-            tweets = db_service.get_user_tweets(user.id, limit=10000)  # Get all tweets for count
-            posts = db_service.get_user_posts(user.id, limit=10000)   # Get all posts for count
-            
-            tweets_count = len(tweets)
-            posts_count = len(posts)
-            
-            # Delete user (cascade will handle tweets and posts)
-            db.session.delete(user)
-            db.session.commit()
-           
+        user_obj, tweet_objs = refreshed['user'], refreshed['tweets']
+        incremental = refreshed['mode'] == 'incremental'
+        logger.info(f"Successfully refreshed data for {username} ({'incremental' if incremental else 'full'}, "
+                    f"{len(tweet_objs)} tweets scraped)")
         
-        # Update database
-        user_obj = db_service.save_user(profile_data)
-        tweet_objs = db_service.save_tweets(user_obj.id, tweets_data)
-        
-        logger.info(f"Successfully refreshed data for {username}")
+        if wants_stream():
+            return stream_listing(
+                {'success': True, 'user': user_obj.to_dict(), 'mode': 'incremental' if incremental else 'full',
+                 'new_tweets_count': len(tweet_objs), 'message': 'Data refreshed successfully'},
+                {'tweets': tweet_objs}
+            )
         
         return jsonify({
             'success': True,
             'user': user_obj.to_dict(),
             'tweets': [tweet.to_dict() for tweet in tweet_objs],
+            'mode': 'incremental' if incremental else 'full',
+            'new_tweets_count': len(tweet_objs),
             'message': 'Data refreshed successfully'
         })
         
@@ -282,35 +286,89 @@ def get_user_profile(username):
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        # Get all tweets for this user
-        tweets = db_service.get_user_tweets(user.id, limit=1000)
-        
-        # Get recent tweets
-        recent_tweets = db_service.get_user_tweets(user.id, limit=50)
-        
-        # Separate tweets with and without media
-        tweets_with_media = [tweet for tweet in tweets if tweet.media_urls]
-        tweets_without_media = [tweet for tweet in tweets if not tweet.media_urls]
+        # Count stored tweets without loading them
+        tweets_in_db = db_service.count_user_tweets(user.id)
+        tweets_with_media = db_service.count_user_tweets(user.id, with_media=True)
+        latest_tweet = db_service.get_latest_tweet(user.id)
         
         user_data = user.to_dict(include_tweets=False)
         user_data.update({
             'success': True,
-            'tweets': [tweet.to_dict() for tweet in recent_tweets],  # All tweets for TweetList component
-            'posts': [tweet.to_dict() for tweet in tweets_with_media[:20]],  # Posts with media
             'stats': {
-                'tweets_in_db': len(tweets),
-                'tweets_with_media': len(tweets_with_media),
-                'tweets_without_media': len(tweets_without_media),
-                'last_tweet_date': recent_tweets[0].posted_at.isoformat() if recent_tweets else None,
+                'tweets_in_db': tweets_in_db,
+                'tweets_with_media': tweets_with_media,
+                'tweets_without_media': tweets_in_db - tweets_with_media,
+                'last_tweet_date': latest_tweet.posted_at.isoformat() if latest_tweet else None,
             }
         })
         
+        recent_tweets = db_service.iter_user_tweets(user.id, limit=50)  # All tweets for TweetList component
+        media_tweets = db_service.iter_user_tweets(user.id, limit=20, with_media=True)  # Posts with media
+        
+        if wants_stream():
+            return stream_listing(user_data, {'tweets': recent_tweets, 'posts': media_tweets})
+        
+        user_data['tweets'] = [tweet.to_dict() for tweet in recent_tweets]
+        user_data['posts'] = [tweet.to_dict() for tweet in media_tweets]
+        
         return jsonify(user_data), 200
         
     except Exception as e:
         logger.error(f"Error getting profile for {username}: {e}")
         return jsonify({'error': 'Failed to fetch profile'}), 500
 
+@user_bp.route('/user/<username>/heuristics', methods=['GET'])
+@handle_errors
+def get_user_heuristics(username):
+    """Per-tweet and per-time-window bias/impact heuristics over stored tweets"""
+    from app.utils.vectorized_scoring import WINDOWS, HeuristicMatrix, get_matrix_cache
+    
+    window = request.args.get('window', 'day')
+    if window not in WINDOWS:
+        return jsonify({'error': f"window must be one of {', '.join(WINDOWS)}"}), 400
+    metric = request.args.get('metric', 'overall_bias')
+    top = min(request.args.get('top', 20, type=int), Config.MAX_PAGE_SIZE)
+    limit = min(request.args.get('limit', Config.HEURISTICS_MAX_TWEETS, type=int), Config.HEURISTICS_MAX_TWEETS)
+    
+    try:
+        user = db_service.get_user_by_username(username)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        def build_matrix():
+            rows = db_service.get_user_tweet_texts(user.id, limit=limit)
+            return HeuristicMatrix.from_texts(
+                [row.text or '' for row in rows],
+                tweet_ids=[row.tweet_id for row in rows],
+                posted_at=[row.posted_at for row in rows]
+            )
+        
+        version = db_service.get_tweets_version(user.id)
+        matrix = get_matrix_cache().get_or_build((user.id, limit, version), build_matrix)
+        
+        aggregate = matrix.aggregate_scores()
+        if metric not in aggregate:
+            return jsonify({'error': f"metric must be one of {', '.join(aggregate)}"}), 400
+        
+        flagged = matrix.top_tweets(metric, limit=top)
+        texts = db_service.get_tweet_texts(user.id, [tweet['tweet_id'] for tweet in flagged])
+        for tweet in flagged:
+            tweet['text'] = texts.get(tweet['tweet_id'])
+        
+        return jsonify({
+            'success': True,
+            'username': user.username,
+            'tweets_scored': matrix.counts.shape[0],
+            'window': window,
+            'aggregate': aggregate,
+            'windows': matrix.window_scores(window),
+            'flagged_tweets': flagged
+        })
+        
+    except Exception as e:
+        logger.error(f"Error scoring heuristics for {username}: {e}")
+        return jsonify({'error': 'Failed to score tweets'}), 500
+
 @user_bp.route('/profile/<username>', methods=['DELETE'])
 @handle_errors
 def delete_user_profile(username):
@@ -406,6 +464,100 @@ def bulk_delete_profiles():
         db.session.rollback()
         return jsonify({'error': 'Failed to bulk delete profiles'}), 500
 
+def _get_scrape_queue():
+    from app.services.scrape_queue import ScrapeQueue
+    return ScrapeQueue(
+        Config.SCRAPE_QUEUE_PATH,
+        lease_seconds=Config.SCRAPE_LEASE_SECONDS,
+        max_attempts=Config.SCRAPE_MAX_ATTEMPTS,
+        backoff_seconds=Config.SCRAPE_BACKOFF_SECONDS
+    )
+
+@user_bp.route('/scrape-jobs', methods=['POST'])
+@handle_errors
+def enqueue_scrape_jobs():
+    """Queue accounts for the background scrape workers"""
+    try:
+        data = request.get_json(silent=True) or {}
+        usernames = data.get('usernames') or ([data['username']] if data.get('username') else [])
+        if not usernames:
+            return jsonify({'error': 'No usernames provided'}), 400
+        
+        max_tweets = min(int(data.get('max_tweets', Config.MAX_TWEETS_PER_REQUEST)), 500)
+        mode = data.get('mode', Config.REFRESH_MODE)
+        if mode not in ('incremental', 'full'):
+            return jsonify({'error': 'mode must be incremental or full'}), 400
+        priority = int(data.get('priority', 0))
+        
+        queue = _get_scrape_queue()
+        queued = []
+        skipped = []
+        invalid = []
+        for username in usernames:
+            if not validate_username(username):
+                invalid.append(username)
+                continue
+            username = username.replace('@', '').strip()
+            job_id = queue.enqueue(username, max_tweets=max_tweets, mode=mode, priority=priority)
+            if job_id:
+                queued.append({'username': username, 'job_id': job_id})
+            else:
+                skipped.append(username)
+        
+        return jsonify({
+            'success': True,
+            'queued': queued,
+            'already_queued': skipped,
+            'invalid': invalid
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error queueing scrape jobs: {e}")
+        return jsonify({'error': 'Failed to queue scrape jobs'}), 500
+
+@user_bp.route('/scrape-jobs', methods=['GET'])
+@handle_errors
+def get_scrape_jobs():
+    """Queue counts, running jobs and recent jobs"""
+    try:
+        queue = _get_scrape_queue()
+        limit = min(request.args.get('limit', 50, type=int), Config.MAX_PAGE_SIZE)
+        return jsonify({
+            'success': True,
+            **queue.stats(),
+            'jobs': queue.list_jobs(status=request.args.get('status'), limit=limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error reading scrape jobs: {e}")
+        return jsonify({'error': 'Failed to read scrape jobs'}), 500
+
+def _incremental_model_outputs(user_id, text_model_names, image_model_names):
+    """
+    Model outputs over the same recent window as a full analysis, running the
+    models only on tweets/media of that window they have not scored yet
+    """
+    from app.services.prediction_store import PredictionStore
+    from app.utils.multi_models import predict_model_items
+    store = PredictionStore()
+
+    text_items = {
+        row.tweet_id: row.text
+        for row in db_service.get_user_tweet_texts(user_id, limit=Config.ANALYSIS_WINDOW) if row.text
+    }
+    image_paths = db_service.get_user_media_paths(user_id, limit=Config.ANALYSIS_WINDOW)
+
+    text_outputs, text_stats = store.update_profile(
+        user_id, 'text', text_model_names, text_items,
+        lambda name, items: predict_model_items('text', name, items)
+    )
+    image_outputs, image_stats = store.update_profile(
+        user_id, 'image', image_model_names, {path: path for path in image_paths},
+        lambda name, items: predict_model_items('image', name, items)
+    )
+    precomputed = {'text': text_outputs, 'image': image_outputs}
+    return list(text_items.values()), image_paths, precomputed, {'text': text_stats, 'image': image_stats}
+
 @user_bp.route('/user/<username>/analyze', methods=['POST'])
 @handle_errors
 def analyze_user_profile(username):
@@ -421,42 +573,49 @@ def analyze_user_profile(username):
     text_model_names = data.get('text_model', ['xlnet'])
     fusion_technique = data.get('fusion_technique', 'weighted_average')
     alpha = data.get('alpha', 0.5)
+    cascade_threshold = data.get('cascade_threshold')
+    if cascade_threshold is not None:
+        try:
+            cascade_threshold = float(cascade_threshold)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'cascade_threshold must be a number'}), 400
+    if fusion_technique == 'cascade':
+        from app.utils.cascade import plan_stages
+        for kind, requested, cost_order in (('text', text_model_names, Config.CASCADE_TEXT_STAGES),
+                                            ('image', image_model_names, Config.CASCADE_IMAGE_STAGES)):
+            stages = plan_stages(requested, cost_order)
+            if len(stages) == 1:
+                return jsonify({'error': f"cascade needs a cheap and an expensive {kind} model, "
+                                         f"got only {stages[0]}"}), 400
+    incremental = parse_bool(data.get('incremental', Config.INCREMENTAL_ANALYSIS))
+    if incremental is None:
+        return jsonify({'error': 'incremental must be a boolean'}), 400
+    # Cascade decides per item which models run, so it always scores from scratch
+    incremental = incremental and fusion_technique != 'cascade'
     try:
         # Get user data from database
         user_data = db_service.get_user_by_username(username)
         if not user_data:
             return jsonify({'error': 'User not found. Please fetch user data first.'}), 404
         
-        # Get user tweets for analysis
-        tweets = db_service.get_user_tweets(user_data.id, limit=100)
-        if not tweets:
+        if not db_service.count_user_tweets(user_data.id):
             return jsonify({'error': 'No tweets found for analysis'}), 404
         
-        # Extract tweet texts and LOCAL media paths
-        tweet_texts = [tweet.text for tweet in tweets if tweet.text]
-        local_media_paths = []
-        for tweet in tweets:
-            # Check if tweet has local_media_paths field
-            if hasattr(tweet, 'local_media_paths') and tweet.local_media_paths:
-                if isinstance(tweet.local_media_paths, list):
-                    local_media_paths.extend(tweet.local_media_paths)
-                else:
-                    # If it's a string (JSON), parse it
-                    try:
-                        import json
-                        paths = json.loads(tweet.local_media_paths)
-                        if isinstance(paths, list):
-                            local_media_paths.extend(paths)
-                    except:
-                        pass
-            
-
-        # Remove duplicates and filter existing files
-        local_media_paths = list(set(local_media_paths))
-
+        precomputed, incremental_stats = None, None
+        if incremental:
+            # Same window as below; only items the models have not seen are inferred
+            tweet_texts, local_media_paths, precomputed, incremental_stats = _incremental_model_outputs(
+                user_data.id, text_model_names, image_model_names
+            )
+        else:
+            # Tweet texts and LOCAL media paths of the most recent tweets
+            recent = db_service.get_user_tweet_texts(user_data.id, limit=Config.ANALYSIS_WINDOW)
+            tweet_texts = [row.text for row in recent if row.text]
+            local_media_paths = db_service.get_user_media_paths(user_data.id, limit=Config.ANALYSIS_WINDOW)
         
         # Import and use multimodal classifier
         try:
+            from app.utils.multi_models import multimodal_predict
             
             # Get analysis results
             analysis_results = multimodal_predict(
@@ -466,9 +625,12 @@ def analyze_user_profile(username):
                 image_models=image_model_names,
                 fusion_technique=fusion_technique,
                 alpha=alpha,
-                username=username
-
+                username=username,
+                cascade_threshold=cascade_threshold,
+                precomputed=precomputed
             )
+            if incremental_stats is not None:
+                analysis_results['incremental'] = incremental_stats
 
             # Structure the response
             response_data = {
@@ -1,15 +1,18 @@
 from app import db
 from app.models.user import User
 from app.models.tweet import Tweet
+from app.models.tweet_media import TweetMedia
 from app.models.post import Post
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple, Dict
+from typing import Iterable, List, Optional, Tuple, Dict
+from app.utils.metrics import timed
+from sqlalchemy import func
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
 class DatabaseService:
+    @timed('db', 'save_user')
     def save_user(self, user_data: dict) -> User:
         """Save or update user data"""
         try:
@@ -40,6 +43,7 @@ class DatabaseService:
             logger.error(f"Error saving user: {e}")
             raise
     
+    @timed('db', 'save_tweets')
     def save_tweets(self, user_id: int, tweets_data: List[Dict]) -> List[Tweet]:
         """Save tweets to database with simplified structure"""
         try:
@@ -55,8 +59,11 @@ class DatabaseService:
                     # Update existing tweet
                     existing_tweet.text = tweet_data.get('text', '')
                     existing_tweet.language = tweet_data.get('language', 'en')
-                    existing_tweet.media_urls = json.dumps(tweet_data.get('media_urls', []))
-                    existing_tweet.local_media_paths = json.dumps(tweet_data.get('local_media_paths', []))
+                    existing_tweet.set_media(
+                        tweet_data.get('media_urls', []),
+                        tweet_data.get('local_media_paths', []),
+                        tweet_data.get('media')
+                    )
                     existing_tweet.urls = tweet_data.get('urls', [])
                     existing_tweet.hashtags = tweet_data.get('hashtags', [])
                     existing_tweet.posted_at = tweet_data.get('posted_at', datetime.utcnow())
@@ -69,12 +76,15 @@ class DatabaseService:
                         tweet_id=tweet_data['tweet_id'],
                         text=tweet_data.get('text', ''),
                         language=tweet_data.get('language', 'en'),
-                        media_urls=json.dumps(tweet_data.get('media_urls', [])),
-                        local_media_paths=json.dumps(tweet_data.get('local_media_paths', [])),
                         urls=tweet_data.get('urls', []),
                         hashtags=tweet_data.get('hashtags', []),
                         posted_at=tweet_data.get('posted_at', datetime.utcnow())
                     )
+                    tweet.set_media(
+                        tweet_data.get('media_urls', []),
+                        tweet_data.get('local_media_paths', []),
+                        tweet_data.get('media')
+                    )
                     
                     db.session.add(tweet)
                     tweet_objects.append(tweet)
@@ -88,6 +98,7 @@ class DatabaseService:
             logger.error(f"Error saving tweets: {e}")
             raise
     
+    @timed('db', 'save_posts')
     def save_posts(self, user_id: int, posts_data: List[dict]) -> List[Post]:
         """Save posts for a user"""
         try:
@@ -122,18 +133,83 @@ class DatabaseService:
             logger.error(f"Error saving posts: {e}")
             raise
     
+    @timed('db', 'get_user_by_username')
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
         return User.query.filter_by(username=username).first()
     
+    @timed('db', 'get_user_tweets')
     def get_user_tweets(self, user_id: int, limit: int = 50) -> List[Tweet]:
         """Get user tweets"""
         return Tweet.query.filter_by(user_id=user_id).order_by(Tweet.posted_at.desc()).limit(limit).all()
     
+    def _user_tweets_query(self, user_id: int, with_media: bool = False):
+        query = Tweet.query.filter_by(user_id=user_id)
+        if with_media:
+            query = query.filter(Tweet.media.any(TweetMedia.media_url.isnot(None)))
+        return query
+    
+    def iter_user_tweets(self, user_id: int, limit: int = 50, with_media: bool = False,
+                         chunk_size: int = 200) -> Iterable[Tweet]:
+        """Lazily iterate user tweets newest first, fetching ``chunk_size`` rows at a time"""
+        query = self._user_tweets_query(user_id, with_media).order_by(Tweet.posted_at.desc())
+        return query.limit(limit).yield_per(chunk_size)
+    
+    @timed('db', 'count_user_tweets')
+    def count_user_tweets(self, user_id: int, with_media: bool = False) -> int:
+        """Count stored tweets without loading them"""
+        return self._user_tweets_query(user_id, with_media).count()
+    
+    @timed('db', 'get_tweets_version')
+    def get_tweets_version(self, user_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+        """(count, newest row id, last update) of a user's tweets; changes when tweets are added, removed or rewritten"""
+        row = db.session.query(func.count(Tweet.id), func.max(Tweet.id), func.max(Tweet.updated_at)) \
+            .filter(Tweet.user_id == user_id).one()
+        return tuple(row)
+    
+    @timed('db', 'get_latest_tweet')
+    def get_latest_tweet(self, user_id: int) -> Optional[Tweet]:
+        """Get the most recently posted stored tweet"""
+        return Tweet.query.filter_by(user_id=user_id).order_by(Tweet.posted_at.desc()).first()
+    
+    @timed('db', 'get_user_tweet_ids')
+    def get_user_tweet_ids(self, user_id: int, limit: int = 200) -> List[str]:
+        """Get tweet IDs of the most recent stored tweets"""
+        rows = db.session.query(Tweet.tweet_id).filter_by(user_id=user_id) \
+            .order_by(Tweet.posted_at.desc()).limit(limit).all()
+        return [row.tweet_id for row in rows]
+    
+    @timed('db', 'get_user_tweet_texts')
+    def get_user_tweet_texts(self, user_id: int, limit: int = 100000) -> List[Tuple[str, str, datetime]]:
+        """Get (tweet_id, text, posted_at) rows without building Tweet objects"""
+        return db.session.query(Tweet.tweet_id, Tweet.text, Tweet.posted_at).filter_by(user_id=user_id) \
+            .order_by(Tweet.posted_at.desc()).limit(limit).all()
+    
+    @timed('db', 'get_tweet_texts')
+    def get_tweet_texts(self, user_id: int, tweet_ids: List[str]) -> Dict[str, str]:
+        """Map the given tweet IDs of a user to their text"""
+        if not tweet_ids:
+            return {}
+        rows = db.session.query(Tweet.tweet_id, Tweet.text) \
+            .filter(Tweet.user_id == user_id, Tweet.tweet_id.in_(tweet_ids)).all()
+        return {row.tweet_id: row.text for row in rows}
+    
+    @timed('db', 'get_user_media_paths')
+    def get_user_media_paths(self, user_id: int, limit: int = 100) -> List[str]:
+        """Get distinct local media paths for the user's most recent tweets"""
+        recent_tweets = db.session.query(Tweet.id).filter_by(user_id=user_id) \
+            .order_by(Tweet.posted_at.desc()).limit(limit).subquery()
+        rows = db.session.query(TweetMedia.local_path).distinct() \
+            .filter(TweetMedia.tweet_id.in_(db.session.query(recent_tweets.c.id))) \
+            .filter(TweetMedia.local_path.isnot(None)).all()
+        return [row.local_path for row in rows]
+    
+    @timed('db', 'get_user_posts')
     def get_user_posts(self, user_id: int, limit: int = 20) -> List[Post]:
         """Get user posts"""
         return Post.query.filter_by(user_id=user_id).order_by(Post.posted_at.desc()).limit(limit).all()
     
+    @timed('db', 'get_user_tweets_paginated')
     def get_user_tweets_paginated(self, user_id: int, page: int, per_page: int) -> Tuple[List[Tweet], int]:
         """Get user tweets with pagination"""
         query = Tweet.query.filter_by(user_id=user_id).order_by(Tweet.posted_at.desc())
@@ -141,6 +217,7 @@ class DatabaseService:
         tweets = query.offset((page - 1) * per_page).limit(per_page).all()
         return tweets, total
     
+    @timed('db', 'get_user_posts_paginated')
     def get_user_posts_paginated(self, user_id: int, page: int, per_page: int) -> Tuple[List[Post], int]:
         """Get user posts with pagination"""
         query = Post.query.filter_by(user_id=user_id).order_by(Post.posted_at.desc())
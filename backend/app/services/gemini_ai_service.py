@@ -7,6 +7,7 @@ import requests
 from io import BytesIO
 import base64
 from dotenv import load_dotenv
+from app.utils.metrics import timed
 
 load_dotenv()
 
@@ -34,6 +35,7 @@ class GeminiAIService:
             logger.error(f"Failed to initialize Gemini AI service: {e}")
             raise
     
+    @timed('gemini', 'bias_detection')
     def analyze_bias_detection(self, tweets: List[Dict], user_profile: Dict) -> Dict:
         """Analyze tweets for bias detection using Gemini"""
         try:
@@ -107,6 +109,7 @@ class GeminiAIService:
             logger.error(f"Error type: {type(e).__name__}")
             return self._get_default_bias_results()
     
+    @timed('gemini', 'social_impact')
     def analyze_social_impact(self, tweets: List[Dict], user_profile: Dict) -> Dict:
         """Analyze tweets for social justice impact using Gemini"""
         try:
@@ -176,6 +179,7 @@ class GeminiAIService:
             logger.error(f"Error type: {type(e).__name__}")
             return self._get_default_social_impact()
     
+    @timed('gemini', 'community_outreach')
     def analyze_community_outreach(self, tweets: List[Dict], user_profile: Dict) -> Dict:
         """Analyze tweets for community outreach and educational impact using Gemini"""
         try:
@@ -247,6 +251,7 @@ class GeminiAIService:
             logger.error(f"Error type: {type(e).__name__}")
             return self._get_default_community_outreach()
     
+    @timed('gemini', 'images_for_bias')
     def analyze_images_for_bias(self, image_paths: List[str]) -> Dict:
         """Analyze images for bias using Gemini Vision"""
         try:
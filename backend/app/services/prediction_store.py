@@ -0,0 +1,123 @@
+from app import db
+from app.config import Config
+from app.models.item_prediction import ItemPrediction
+from sqlalchemy.exc import IntegrityError
+from typing import Callable, Dict, List, Mapping, Tuple
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (model_name, items) -> per-item class probabilities, shape (len(items), 3)
+PredictItems = Callable[[str, List], np.ndarray]
+
+# Bound on item keys per IN (...) clause
+KEY_CHUNK_SIZE = 500
+
+
+def model_variant(model_name: str) -> str:
+    """Backend and precision ``model_name`` currently runs with, per INFERENCE_BACKEND and QUANTIZED_TEXT_MODELS"""
+    backend = Config.INFERENCE_BACKEND
+    if backend == 'torch' and model_name in Config.QUANTIZED_TEXT_MODELS:
+        return 'torch-int8'
+    return backend
+
+
+class PredictionStore:
+    """
+    Per-item model outputs, so re-analysis only runs the models on new items.
+
+    Rows are keyed by model variant as well, so predictions made with another
+    backend or precision are never mixed into a score.
+    """
+
+    def stored_predictions(self, user_id: int, item_type: str, model_name: str,
+                           keys: List[str]) -> Dict[str, List[float]]:
+        """Stored probabilities of the current variant of this model for the given item keys"""
+        variant = model_variant(model_name)
+        stored = {}
+        for start in range(0, len(keys), KEY_CHUNK_SIZE):
+            rows = db.session.query(
+                ItemPrediction.item_key, ItemPrediction.prob_non_radical,
+                ItemPrediction.prob_political, ItemPrediction.prob_radical
+            ).filter(
+                ItemPrediction.user_id == user_id,
+                ItemPrediction.item_type == item_type,
+                ItemPrediction.model_name == model_name,
+                ItemPrediction.variant == variant,
+                ItemPrediction.item_key.in_(keys[start:start + KEY_CHUNK_SIZE])
+            ).all()
+            stored.update({row.item_key: [row.prob_non_radical, row.prob_political, row.prob_radical]
+                           for row in rows})
+        return stored
+
+    def record(self, user_id: int, item_type: str, model_name: str,
+               keys: List[str], probs: np.ndarray):
+        """Store new item predictions in one transaction"""
+        if not keys:
+            return
+        variant = model_variant(model_name)
+        try:
+            db.session.bulk_insert_mappings(ItemPrediction, [
+                {
+                    'user_id': user_id,
+                    'item_type': item_type,
+                    'item_key': key,
+                    'model_name': model_name,
+                    'variant': variant,
+                    'prob_non_radical': float(row[0]),
+                    'prob_political': float(row[1]),
+                    'prob_radical': float(row[2])
+                }
+                for key, row in zip(keys, probs)
+            ])
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            if not isinstance(e, IntegrityError):
+                logger.error(f"Error recording {model_name} predictions for user {user_id}: {e}")
+            raise
+
+    def _record_new(self, user_id: int, item_type: str, model_name: str, new: Dict[str, np.ndarray]):
+        """
+        Record ``new`` predictions; when a concurrent analysis stored some of
+        the same keys first (uq_item_prediction), keep its rows and record only the rest
+        """
+        try:
+            self.record(user_id, item_type, model_name, list(new), np.array(list(new.values())).reshape(-1, 3))
+        except IntegrityError:
+            stored = self.stored_predictions(user_id, item_type, model_name, list(new))
+            remaining = {key: probs for key, probs in new.items() if key not in stored}
+            logger.info(f"{len(new) - len(remaining)} {model_name} predictions for user {user_id} "
+                        f"were stored concurrently; recording the other {len(remaining)}")
+            self.record(user_id, item_type, model_name, list(remaining),
+                        np.array(list(remaining.values())).reshape(-1, 3))
+
+    def update_profile(self, user_id: int, item_type: str, model_names: List[str],
+                       items: Mapping[str, object], predict_items: PredictItems) -> Tuple[Dict, Dict]:
+        """
+        Score only the items each model has not seen yet, then return every
+        model's mean probabilities over ``items``, from stored and new predictions.
+
+        ``items`` maps item keys (tweet_id or media path) to model inputs. The
+        models run on new items only; the stored rows of the window are read
+        back to average them.
+        """
+        keys = list(items)
+        outputs, stats = {}, {}
+        for model_name in model_names:
+            stored = self.stored_predictions(user_id, item_type, model_name, keys)
+            new_keys = [key for key in keys if key not in stored]
+            probs = predict_items(model_name, [items[key] for key in new_keys]) if new_keys else np.empty((0, 3))
+            new = dict(zip(new_keys, np.asarray(probs).reshape(-1, 3)))
+
+            self._record_new(user_id, item_type, model_name, new)
+            if keys:
+                outputs[model_name] = np.mean([stored[key] if key in stored else new[key] for key in keys], axis=0)
+            stats[model_name] = {
+                'variant': model_variant(model_name),
+                'new_items': len(new_keys),
+                'analyzed_items': len(keys)
+            }
+        return outputs, stats
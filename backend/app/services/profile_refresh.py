@@ -0,0 +1,72 @@
+import logging
+import os
+import shutil
+from typing import Callable, Dict, Optional
+
+from app import db
+from app.services.database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+# checkpoint(stage, **progress) runs before each stage; raising aborts the refresh before its next write
+Checkpoint = Callable[..., None]
+
+
+class ProfileNotFound(ValueError):
+    pass
+
+
+def refresh_profile(source, username: str, mode: str, max_tweets: int,
+                    checkpoint: Optional[Checkpoint] = None, db_service: Optional[DatabaseService] = None) -> Dict:
+    """
+    Scrape ``username`` with ``source`` (XDataFetcher or XScraper) and store it.
+
+    In incremental mode (for an already stored user) only tweets newer than the
+    newest stored one are fetched and appended, and downloaded media is kept.
+    Otherwise media is wiped, and once new tweets arrive the user is deleted
+    and saved again. Returns the saved user, the new tweets and the mode used.
+    """
+    checkpoint = checkpoint or (lambda stage, **progress: None)
+    db_service = db_service or DatabaseService()
+    user = db_service.get_user_by_username(username)
+    incremental = mode == 'incremental' and user is not None
+
+    since = None
+    known_tweet_ids = None
+    if incremental:
+        latest_tweet = db_service.get_latest_tweet(user.id)
+        since = latest_tweet.posted_at if latest_tweet else None
+        known_tweet_ids = set(db_service.get_user_tweet_ids(user.id))
+    else:
+        checkpoint('cleanup')
+        user_folder_path = os.path.join('downloaded_images', username)
+        if os.path.exists(user_folder_path):
+            shutil.rmtree(user_folder_path)
+            logger.info(f"Deleted folder at {user_folder_path}")
+
+    checkpoint('profile')
+    profile_data = source.get_user_profile(username)
+    if not profile_data:
+        raise ProfileNotFound(f"User {username} not found or profile is private")
+
+    checkpoint('tweets')
+    tweets_data = source.get_user_tweets(
+        username,
+        max_tweets=max_tweets,
+        since=since,
+        known_tweet_ids=known_tweet_ids
+    )
+
+    checkpoint('saving', tweets=len(tweets_data))
+    if tweets_data and user and not incremental:
+        # Delete user (cascade will handle tweets and posts)
+        db.session.delete(user)
+        db.session.commit()
+
+    user_obj = db_service.save_user(profile_data)
+    tweet_objs = db_service.save_tweets(user_obj.id, tweets_data)
+    return {
+        'user': user_obj,
+        'tweets': tweet_objs,
+        'mode': 'incremental' if incremental else 'full'
+    }
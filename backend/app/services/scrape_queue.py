@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class ScrapeQueue:
+    """Durable SQLite-backed queue of account scrape jobs shared by worker processes"""
+
+    def __init__(self, db_path: Optional[str] = None, lease_seconds: int = 600,
+                 max_attempts: int = 3, backoff_seconds: int = 30):
+        self.db_path = db_path or os.path.join('instance', 'scrape_queue.db')
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.init_schema()
+
+    def _get_connection(self):
+        """Get database connection (autocommit; transactions are explicit)"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def init_schema(self):
+        """Create the jobs table if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._get_connection()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username VARCHAR(50) NOT NULL,
+                    max_tweets INTEGER NOT NULL DEFAULT 50,
+                    mode VARCHAR(20) NOT NULL DEFAULT 'incremental',
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner VARCHAR(100),
+                    lease_expires_at REAL,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    progress TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS ix_scrape_jobs_status_next
+                ON scrape_jobs (status, next_attempt_at)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS ix_scrape_jobs_username
+                ON scrape_jobs (username)
+            ''')
+        finally:
+            conn.close()
+
+    def enqueue(self, username: str, max_tweets: int = 50, mode: str = 'incremental',
+                priority: int = 0) -> Optional[int]:
+        """Add a job unless the account already has a pending or leased one"""
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            active = conn.execute(
+                'SELECT id FROM scrape_jobs WHERE username = ? AND status IN (?, ?)',
+                (username, PENDING, LEASED)
+            ).fetchone()
+            if active:
+                conn.execute('COMMIT')
+                return None
+
+            cursor = conn.execute('''
+                INSERT INTO scrape_jobs
+                (username, max_tweets, mode, priority, status, next_attempt_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (username, max_tweets, mode, priority, PENDING, now, now, now))
+            conn.execute('COMMIT')
+            return cursor.lastrowid
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def lease(self, worker_id: str) -> Optional[Dict]:
+        """
+        Claim the next runnable job for ``worker_id``.
+
+        Pending jobs whose backoff has elapsed and leased jobs whose lease expired
+        (crashed worker) are both eligible. The claim runs under BEGIN IMMEDIATE so
+        two workers can never lease the same job.
+        """
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            while True:
+                row = conn.execute('''
+                    SELECT * FROM scrape_jobs
+                    WHERE (status = ? AND next_attempt_at <= ?)
+                       OR (status = ? AND lease_expires_at < ?)
+                    ORDER BY priority DESC, id
+                    LIMIT 1
+                ''', (PENDING, now, LEASED, now)).fetchone()
+
+                if not row:
+                    conn.execute('COMMIT')
+                    return None
+
+                if row['status'] == LEASED and row['attempts'] >= self.max_attempts:
+                    # Worker died on its last attempt
+                    conn.execute('''
+                        UPDATE scrape_jobs
+                        SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                        WHERE id = ?
+                    ''', (FAILED, f"Lease expired on worker {row['lease_owner']}", now, row['id']))
+                    continue
+                break
+
+            conn.execute('''
+                UPDATE scrape_jobs
+                SET status = ?, lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1,
+                    progress = NULL, updated_at = ?
+                WHERE id = ?
+            ''', (LEASED, worker_id, now + self.lease_seconds, now, row['id']))
+            conn.execute('COMMIT')
+
+            job = dict(row)
+            job['attempts'] += 1
+            job['lease_owner'] = worker_id
+            return job
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: int, worker_id: str, progress: Optional[Dict] = None) -> bool:
+        """Extend the lease and record progress; False if the lease was lost"""
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            if progress is None:
+                cursor = conn.execute('''
+                    UPDATE scrape_jobs SET lease_expires_at = ?, updated_at = ?
+                    WHERE id = ? AND status = ? AND lease_owner = ?
+                ''', (now + self.lease_seconds, now, job_id, LEASED, worker_id))
+            else:
+                cursor = conn.execute('''
+                    UPDATE scrape_jobs SET lease_expires_at = ?, progress = ?, updated_at = ?
+                    WHERE id = ? AND status = ? AND lease_owner = ?
+                ''', (now + self.lease_seconds, json.dumps(progress), now, job_id, LEASED, worker_id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict] = None) -> bool:
+        """Mark a leased job as done"""
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute('''
+                UPDATE scrape_jobs
+                SET status = ?, result = ?, error = NULL, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE id = ? AND lease_owner = ?
+            ''', (DONE, json.dumps(result) if result is not None else None, now, job_id, worker_id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> str:
+        """Record a failure; retry with exponential backoff until max_attempts"""
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT attempts FROM scrape_jobs WHERE id = ? AND lease_owner = ?',
+                (job_id, worker_id)
+            ).fetchone()
+            if not row:
+                conn.execute('COMMIT')
+                return LEASED  # lease was taken over by another worker
+
+            attempts = row['attempts']
+            if attempts >= self.max_attempts:
+                status, next_attempt_at = FAILED, now
+            else:
+                status = PENDING
+                next_attempt_at = now + self.backoff_seconds * (2 ** (attempts - 1))
+
+            conn.execute('''
+                UPDATE scrape_jobs
+                SET status = ?, error = ?, next_attempt_at = ?, lease_owner = NULL,
+                    lease_expires_at = NULL, updated_at = ?
+                WHERE id = ?
+            ''', (status, str(error)[:2000], next_attempt_at, now, job_id))
+            conn.execute('COMMIT')
+            return status
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict:
+        """Job counts by status plus progress of running jobs"""
+        conn = self._get_connection()
+        try:
+            counts = {status: 0 for status in (PENDING, LEASED, DONE, FAILED)}
+            for row in conn.execute('SELECT status, COUNT(*) AS n FROM scrape_jobs GROUP BY status'):
+                counts[row['status']] = row['n']
+
+            running = [
+                {
+                    'id': row['id'],
+                    'username': row['username'],
+                    'worker': row['lease_owner'],
+                    'attempts': row['attempts'],
+                    'progress': json.loads(row['progress']) if row['progress'] else None
+                }
+                for row in conn.execute(
+                    'SELECT id, username, lease_owner, attempts, progress FROM scrape_jobs WHERE status = ?',
+                    (LEASED,)
+                )
+            ]
+            return {'counts': counts, 'running': running}
+        finally:
+            conn.close()
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """List the most recent jobs, optionally filtered by status"""
+        conn = self._get_connection()
+        try:
+            if status:
+                rows = conn.execute(
+                    'SELECT * FROM scrape_jobs WHERE status = ? ORDER BY id DESC LIMIT ?', (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute('SELECT * FROM scrape_jobs ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+
+            jobs = []
+            for row in rows:
+                job = dict(row)
+                job['progress'] = json.loads(job['progress']) if job['progress'] else None
+                job['result'] = json.loads(job['result']) if job['result'] else None
+                jobs.append(job)
+            return jobs
+        finally:
+            conn.close()
+
+    def has_runnable_jobs(self) -> bool:
+        """Whether any job is pending or still leased"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                'SELECT 1 FROM scrape_jobs WHERE status IN (?, ?) LIMIT 1', (PENDING, LEASED)
+            ).fetchone()
+            return row is not None
+        finally:
+            conn.close()
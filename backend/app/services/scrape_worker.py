@@ -0,0 +1,156 @@
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import Flask
+
+from app import db
+from app.config import config
+from app.services.scrape_queue import ScrapeQueue
+
+logger = logging.getLogger(__name__)
+
+
+def create_worker_app(config_name: str = 'default') -> Flask:
+    """Minimal app for database access only (no blueprints or model downloads)"""
+    app = Flask('app')  # same instance folder as create_app
+    app.config.from_object(config[config_name])
+    db.init_app(app)
+
+    from app.models.user import User
+    from app.models.tweet import Tweet
+    from app.models.tweet_media import TweetMedia
+    from app.models.post import Post
+    from app.models.item_prediction import ItemPrediction
+
+    return app
+
+
+class LeaseLost(Exception):
+    """The job's lease expired or was taken over, so this worker must stop writing"""
+
+
+class _LeaseKeeper(threading.Thread):
+    """Extends a job lease in the background while a long scrape runs"""
+
+    def __init__(self, queue: ScrapeQueue, job_id: int, worker_id: str, interval: float):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            if not self.queue.heartbeat(self.job_id, self.worker_id):
+                logger.warning(f"Worker {self.worker_id} lost lease on job {self.job_id}")
+                self.lost = True
+                return
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class ScrapeWorker:
+    """Pulls jobs from a ScrapeQueue and scrapes them with one long-lived browser"""
+
+    def __init__(self, queue: ScrapeQueue, app: Flask, worker_id: Optional[str] = None):
+        self.queue = queue
+        self.app = app
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.scraper = None
+
+    def _get_scraper(self):
+        """Create the browser on first use and reuse it across jobs"""
+        if self.scraper is None:
+            from app.services.x_scraper import XScraper
+            self.scraper = XScraper(delay=self.app.config.get('SCRAPING_DELAY', 2))
+        return self.scraper
+
+    def _reset_scraper(self):
+        """Drop a browser that may be in a bad state after an error"""
+        if self.scraper is not None:
+            try:
+                self.scraper.close()
+            except Exception as e:
+                logger.warning(f"Error closing scraper: {e}")
+            self.scraper = None
+
+    def process(self, job: Dict, keeper: Optional[_LeaseKeeper] = None) -> Dict:
+        """Scrape one account and store it; returns a small result summary"""
+        from app.services.profile_refresh import refresh_profile
+
+        def checkpoint(stage, **progress):
+            # Abort before the next scrape or write once another worker may own the job
+            if (keeper is not None and keeper.lost) or \
+                    not self.queue.heartbeat(job['id'], self.worker_id, {'stage': stage, **progress}):
+                raise LeaseLost(f"Lease on job {job['id']} lost before stage '{stage}'")
+
+        with self.app.app_context():
+            refreshed = refresh_profile(self._get_scraper(), job['username'], job['mode'], job['max_tweets'],
+                                        checkpoint=checkpoint)
+            return {
+                'user_id': refreshed['user'].id,
+                'mode': refreshed['mode'],
+                'new_tweets_count': len(refreshed['tweets'])
+            }
+
+    def run_once(self) -> bool:
+        """Lease and process a single job; False if nothing was runnable"""
+        job = self.queue.lease(self.worker_id)
+        if not job:
+            return False
+
+        logger.info(f"Worker {self.worker_id} picked job {job['id']} (@{job['username']}, attempt {job['attempts']})")
+        keeper = _LeaseKeeper(self.queue, job['id'], self.worker_id, max(self.queue.lease_seconds / 3, 1))
+        keeper.start()
+        try:
+            result = self.process(job, keeper)
+            if keeper.lost:
+                logger.warning(f"Job {job['id']} finished after its lease was lost; result not recorded")
+            else:
+                self.queue.complete(job['id'], self.worker_id, result)
+                logger.info(f"Job {job['id']} done: {result}")
+        except LeaseLost as e:
+            # The job belongs to another worker now; it records the outcome
+            logger.warning(f"Job {job['id']} (@{job['username']}) abandoned: {e}")
+        except Exception as e:
+            self._reset_scraper()
+            status = self.queue.fail(job['id'], self.worker_id, str(e))
+            logger.error(f"Job {job['id']} (@{job['username']}) failed, now {status}: {e}")
+        finally:
+            keeper.stop()
+        return True
+
+    def run(self, idle_sleep: float = 5.0, stop_when_empty: bool = False,
+            stop_event: Optional[threading.Event] = None):
+        """Process jobs until stopped (or until the queue drains)"""
+        try:
+            while not (stop_event and stop_event.is_set()):
+                if self.run_once():
+                    continue
+                if stop_when_empty and not self.queue.has_runnable_jobs():
+                    break
+                time.sleep(idle_sleep)
+        finally:
+            self._reset_scraper()
+
+
+def run_worker(worker_index: int = 0, config_name: str = 'default', idle_sleep: float = 5.0,
+               stop_when_empty: bool = False):
+    """Entry point for one worker process"""
+    logging.basicConfig(level=logging.INFO)
+    app = create_worker_app(config_name)
+    queue = ScrapeQueue(
+        app.config['SCRAPE_QUEUE_PATH'],
+        lease_seconds=app.config['SCRAPE_LEASE_SECONDS'],
+        max_attempts=app.config['SCRAPE_MAX_ATTEMPTS'],
+        backoff_seconds=app.config['SCRAPE_BACKOFF_SECONDS']
+    )
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{worker_index}"
+    ScrapeWorker(queue, app, worker_id).run(idle_sleep=idle_sleep, stop_when_empty=stop_when_empty)
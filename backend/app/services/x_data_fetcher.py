@@ -1,6 +1,7 @@
 # import tweepy
 # import os
 # from datetime import datetime
+from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 from app.services.x_scraper import XScraper
@@ -43,9 +44,10 @@ class XDataFetcher:
         """Get user profile using web scraping"""
         return self.scraper.get_user_profile(username)
     
-    def get_user_tweets(self, username: str, max_tweets: int = 50) -> List[Dict]:
-        """Get user tweets using web scraping"""
-        return self.scraper.get_user_tweets(username, max_tweets)
+    def get_user_tweets(self, username: str, max_tweets: int = 50, since: Optional[datetime] = None,
+                        known_tweet_ids: Optional[set] = None) -> List[Dict]:
+        """Get user tweets using web scraping, optionally only those newer than ``since``"""
+        return self.scraper.get_user_tweets(username, max_tweets, since=since, known_tweet_ids=known_tweet_ids)
     
     def get_user_posts(self, username: str, max_posts: int = 20) -> List[Dict]:
         """Get user posts using web scraping"""
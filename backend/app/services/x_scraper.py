@@ -12,7 +12,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 from typing import Dict, List, Optional
 import re
@@ -20,6 +20,7 @@ from langdetect import detect
 from googletrans import Translator
 import os
 from dotenv import load_dotenv
+from app.utils.metrics import timed
 load_dotenv(override=True)
 logger = logging.getLogger(__name__)
 CHROME_DRIVER_PATH = os.getenv('CHROME_DRIVER_PATH')
@@ -38,6 +39,7 @@ class XScraper:
             os.makedirs(self.images_dir)
             logger.info(f"Created images directory: {self.images_dir}")
     
+    @timed('scraper_driver_start')
     def setup_driver(self, headless=False):
         """Setup Chrome driver with options"""
         chrome_options = Options()
@@ -69,6 +71,7 @@ class XScraper:
             logger.error(f"Failed to setup Chrome driver: {e}")
             raise
     
+    @timed('scraper_image_download')
     def download_image(self, url: str, username: str, tweet_id: str = None) -> Optional[str]:
         """
         Download image from URL and return local path
@@ -122,6 +125,7 @@ class XScraper:
             logger.error(f"Failed to download image {url}: {e}")
             return None
     
+    @timed('scraper_profile')
     def get_user_profile(self, username: str) -> Optional[Dict]:
         """Scrape basic user profile information"""
         try:      
@@ -175,6 +179,7 @@ class XScraper:
             print(f"❌ Error scraping profile for {username}: {e}")
             return None
         
+    @timed('scraper_scroll')
     def _handle_retry_and_scroll(self, consecutive_no_new_tweets: int, total_scrolls: int):
         """Handle retry buttons and enhanced scrolling"""
         try:
@@ -261,6 +266,7 @@ class XScraper:
 
         except Exception:
             return False
+    @timed('scraper_translate')
     def translate_text(self,text: str, source_lang: str, target_lang: str = 'en') -> str:
         """
         Translate YouTube transcript text from source language to target language.
@@ -362,7 +368,9 @@ class XScraper:
         
         return chunks
 
-    def get_user_tweets(self, username: str, max_tweets: int = 50, media_only: bool = False) -> List[Dict]:
+    @timed('scraper_tweets')
+    def get_user_tweets(self, username: str, max_tweets: int = 50, media_only: bool = False,
+                        since: Optional[datetime] = None, known_tweet_ids: Optional[set] = None) -> List[Dict]:
         """
         Scrape user tweets with improved logic from working scraper
         
@@ -370,6 +378,9 @@ class XScraper:
             username: Twitter username
             max_tweets: Maximum number of tweets to scrape
             media_only: If True, only return tweets with media
+            since: Posted time of the newest stored tweet; scrolling stops once
+                an older (non-pinned) tweet is reached
+            known_tweet_ids: Tweet IDs already stored; reaching one also stops scrolling
         
         Returns:
             List of tweet dictionaries with simplified structure
@@ -390,12 +401,15 @@ class XScraper:
             
             tweets = []
             processed_texts = set()  # Avoid duplicates
+            known_tweet_ids = known_tweet_ids or set()
+            since = self._as_naive_utc(since) if since else None
+            reached_known_tweets = False
             consecutive_no_new_tweets = 0
             max_consecutive_attempts = 8
             total_scrolls = 0
             max_total_scrolls = 50
             
-            while len(tweets) < max_tweets and consecutive_no_new_tweets < max_consecutive_attempts and total_scrolls < max_total_scrolls:
+            while len(tweets) < max_tweets and consecutive_no_new_tweets < max_consecutive_attempts and total_scrolls < max_total_scrolls and not reached_known_tweets:
                 tweets_before = len(tweets)
                 
                 # Find tweet elements using improved selector
@@ -433,6 +447,26 @@ class XScraper:
                         except:
                             pass  # No reply indicator found, continue
                         
+                        # Extract tweet time
+                        try:
+                            time_elem = article.find_element(By.XPATH, './/time')
+                            tweet_time = time_elem.get_attribute("datetime")
+                            # Convert to datetime object
+                            posted_at = datetime.fromisoformat(tweet_time.replace('Z', '+00:00')) if tweet_time else datetime.utcnow()
+                        except:
+                            posted_at = datetime.utcnow()
+                        
+                        status_id = self._get_status_id(article)
+                        
+                        # Stop once we reach tweets that are already stored (pinned tweets are out of order)
+                        if since or known_tweet_ids:
+                            is_known = status_id in known_tweet_ids or (since and self._as_naive_utc(posted_at) <= since)
+                            if is_known:
+                                if self._is_pinned(article):
+                                    continue
+                                reached_known_tweets = True
+                                break
+                        
                         # Handle "Show more" for main tweet only
                         try:
                             main_tweet_area = article.find_element(By.XPATH, './/div[@data-testid="tweetText"]')
@@ -459,18 +493,13 @@ class XScraper:
                         
                         processed_texts.add(tweet_text)
                         
-                        # Extract tweet time
-                        try:
-                            time_elem = article.find_element(By.XPATH, './/time')
-                            tweet_time = time_elem.get_attribute("datetime")
-                            # Convert to datetime object
-                            posted_at = datetime.fromisoformat(tweet_time.replace('Z', '+00:00')) if tweet_time else datetime.utcnow()
-                        except:
-                            posted_at = datetime.utcnow()
+                        # Prefer the status ID from the permalink; it is stable across scrapes
+                        tweet_id = status_id or hashlib.md5(tweet_text[:50].encode()).hexdigest()[:16]
                         
                         # Extract media links from main tweet only
                         media_links = []
                         local_media_paths = []
+                        media_items = []
                         
                         try:
                             # Look for images in the main tweet area, not in quoted tweets
@@ -489,10 +518,10 @@ class XScraper:
                                             media_links.append(img_url)
                                             
                                             # Download image
-                                            tweet_id = str(abs(hash(tweet_text[:50])))
                                             local_path = self.download_image(img_url, username, tweet_id)
                                             if local_path:
                                                 local_media_paths.append(local_path)
+                                            media_items.append({'media_url': img_url, 'local_path': local_path})
                                                 
                                 except Exception as e:
                                     print(f"Failed to process image: {e}")
@@ -507,6 +536,7 @@ class XScraper:
                                 src = video.get_attribute('src')
                                 if src and src not in media_links:
                                     media_links.append(src)
+                                    media_items.append({'media_url': src, 'local_path': None})
                         except:
                             pass
                         
@@ -517,9 +547,6 @@ class XScraper:
                         if media_only and not media_links:
                             continue
                         
-                        # Generate tweet ID
-                        tweet_id = str(abs(hash(tweet_text[:50])))
-                        
                         # Create simplified tweet data
                         tweet_data = {
                             'tweet_id': tweet_id,
@@ -527,6 +554,7 @@ class XScraper:
                             'language': 'en',  # Default language
                             'media_urls': media_links,
                             'local_media_paths': local_media_paths,
+                            'media': media_items,
                             'urls': urls,
                             'hashtags': self._extract_hashtags(tweet_text),
                             'posted_at': posted_at
@@ -543,6 +571,10 @@ class XScraper:
                     except Exception as e:
                         continue
                 
+                if reached_known_tweets:
+                    print(f"⏹️ Reached already stored tweets for @{username}")
+                    break
+                
                 # Check if we got new tweets
                 tweets_after = len(tweets)
                 if tweets_after > tweets_before:
@@ -567,6 +599,30 @@ class XScraper:
             print(f"❌ Error scraping tweets for @{username}: {e}")
             return []
 
+    def _get_status_id(self, article) -> Optional[str]:
+        """Extract the numeric status ID from the tweet permalink"""
+        try:
+            link = article.find_element(By.XPATH, './/time/ancestor::a[contains(@href, "/status/")]')
+            match = re.search(r'/status/(\d+)', link.get_attribute("href") or '')
+            return match.group(1) if match else None
+        except Exception:
+            return None
+    
+    def _is_pinned(self, article) -> bool:
+        """Check whether the tweet is pinned to the top of the profile"""
+        try:
+            context = article.find_element(By.XPATH, './/div[@data-testid="socialContext"]')
+            return 'pinned' in context.text.lower()
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _as_naive_utc(value: datetime) -> datetime:
+        """Normalize aware datetimes to naive UTC, as stored in the database"""
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    
     def scrape_user_tweets(self, username: str, max_tweets: int = 50) -> List[Dict]:
         """
         Alias for get_user_tweets method for compatibility with routes
@@ -0,0 +1,62 @@
+from collections import Counter
+from functools import cached_property
+from typing import Dict, List, Union
+
+from app.utils.keyword_engine import TOKEN_PATTERN, get_keyword_engine, tweet_texts
+
+
+class AnalysisContext:
+    """
+    Tweet corpus prepared once per request and shared by the heuristic scorers.
+
+    Normalization, tokenization and derived features (token counts, keyword
+    hits) are computed lazily on first use and memoized, so
+    ``detect_bias``, ``calculate_fairness_metrics`` and ``calculate_social_impact``
+    can all run over the same corpus without re-joining or re-lowercasing it.
+    Scorers accept either this object or the raw ``text_analysis`` dict.
+    """
+
+    def __init__(self, text_analysis: Dict):
+        self.text_analysis = text_analysis
+        self.tweets = text_analysis.get('tweets', []) or []
+
+    @classmethod
+    def ensure(cls, text_analysis: Union['AnalysisContext', Dict]) -> 'AnalysisContext':
+        """Return ``text_analysis`` if it already is a context, else wrap it"""
+        if isinstance(text_analysis, cls):
+            return text_analysis
+        return cls(text_analysis)
+
+    def get(self, key, default=None):
+        """Dict-style access to the underlying text_analysis payload"""
+        return self.text_analysis.get(key, default)
+
+    @property
+    def tweet_count(self) -> int:
+        return len(self.tweets)
+
+    @cached_property
+    def texts(self) -> List[str]:
+        return tweet_texts(self.text_analysis)
+
+    @cached_property
+    def normalized_texts(self) -> List[str]:
+        """Lowercased texts with collapsed whitespace"""
+        return [' '.join(text.lower().split()) for text in self.texts]
+
+    @cached_property
+    def tweet_tokens(self) -> List[List[str]]:
+        """Word tokens of each tweet"""
+        return [TOKEN_PATTERN.findall(text) for text in self.normalized_texts]
+
+    @cached_property
+    def token_counts(self) -> Counter:
+        counts = Counter()
+        for tokens in self.tweet_tokens:
+            counts.update(tokens)
+        return counts
+
+    @cached_property
+    def keyword_counts(self) -> Dict[str, int]:
+        """Keyword category counts over the whole corpus"""
+        return get_keyword_engine().count_tokens(self.token_counts)
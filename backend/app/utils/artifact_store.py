@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = 'CURRENT'
+UNVERSIONED = 'unversioned'
+
+
+class ArtifactSnapshot:
+    """One loaded artifact version and the object built from it"""
+
+    def __init__(self, version: str, value, signature: Tuple, loaded_at: float):
+        self.version = version
+        self.value = value
+        self.signature = signature
+        self.loaded_at = loaded_at
+
+
+class ArtifactStore:
+    """
+    Versioned pickled artifacts, loaded once and hot-reloaded on change.
+
+    Versions live in ``root/<version>/`` and ``root/CURRENT`` names the one
+    to serve; without it the newest version directory is used, then the
+    unversioned files in ``legacy_dir``. A watcher thread compares file
+    mtimes every ``reload_interval`` seconds and swaps in the new snapshot,
+    so readers of ``current`` never touch the disk.
+    """
+
+    def __init__(self, root: str, filenames: Sequence[str], build: Callable[[Dict, str], object],
+                 legacy_dir: Optional[str] = None, reload_interval: float = 5.0):
+        self.root = root
+        self.filenames = list(filenames)
+        self.build = build
+        self.legacy_dir = legacy_dir
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ArtifactSnapshot] = None
+        self._failed_signature: Optional[Tuple] = None
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> ArtifactSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+    def start(self) -> 'ArtifactStore':
+        """Load the active version and start watching for new ones"""
+        self.refresh()
+        if self.reload_interval > 0 and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name='artifact-watcher', daemon=True)
+            self._watcher.start()
+        return self
+
+    def refresh(self) -> ArtifactSnapshot:
+        """Reload when the active version or any of its files changed; keeps the old snapshot on failure"""
+        with self._lock:
+            version, directory = self._resolve()
+            signature = (version, self._file_stats(directory))
+            if self._snapshot is not None and signature in (self._snapshot.signature, self._failed_signature):
+                return self._snapshot
+
+            try:
+                artifacts = self._load(directory, versioned=version != UNVERSIONED)
+                snapshot = ArtifactSnapshot(version, self.build(artifacts, version), signature, time.time())
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                self._failed_signature = signature
+                logger.error(f"Could not load artifact version {version}, still serving "
+                             f"{self._snapshot.version}: {e}")
+                return self._snapshot
+
+            if self._snapshot is not None:
+                logger.info(f"Artifacts reloaded: {self._snapshot.version} -> {version}")
+            self._snapshot = snapshot
+            return snapshot
+
+    def publish(self, artifacts: Mapping[str, object], version: Optional[str] = None,
+                metadata: Optional[Mapping] = None) -> str:
+        """Write ``artifacts`` (filename -> object) as a new version and make it current"""
+        version = version or time.strftime('%Y%m%d-%H%M%S')
+        directory = os.path.join(self.root, version)
+        if os.path.exists(directory):
+            raise FileExistsError(f"Artifact version already exists: {directory}")
+
+        staging = os.path.join(self.root, f'.{version}.tmp')
+        os.makedirs(staging)
+        for filename, artifact in artifacts.items():
+            # Uncompressed so the arrays can be memory-mapped on load
+            joblib.dump(artifact, os.path.join(staging, filename))
+        if metadata is not None:
+            with open(os.path.join(staging, 'metadata.json'), 'w') as f:
+                json.dump(metadata, f, indent=2)
+        os.rename(staging, directory)
+
+        pointer = os.path.join(self.root, f'.{CURRENT_FILE}.tmp')
+        with open(pointer, 'w') as f:
+            f.write(version)
+        os.replace(pointer, os.path.join(self.root, CURRENT_FILE))
+        return version
+
+    def versions(self) -> Sequence[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if not name.startswith('.') and os.path.isdir(os.path.join(self.root, name)))
+
+    def _resolve(self) -> Tuple[str, Optional[str]]:
+        """(version, directory) to serve; directory is None when there are no artifacts at all"""
+        pointer = os.path.join(self.root, CURRENT_FILE)
+        if os.path.exists(pointer):
+            with open(pointer) as f:
+                version = f.read().strip()
+            if version and os.path.isdir(os.path.join(self.root, version)):
+                return version, os.path.join(self.root, version)
+            logger.warning(f"{pointer} names missing version {version!r}")
+
+        versions = self.versions()
+        if versions:
+            return versions[-1], os.path.join(self.root, versions[-1])
+        return UNVERSIONED, self.legacy_dir
+
+    def _file_stats(self, directory: Optional[str]) -> Tuple:
+        stats = []
+        for filename in self.filenames:
+            path = os.path.join(directory, filename) if directory else None
+            try:
+                stat = os.stat(path) if path else None
+            except OSError:
+                stat = None
+            stats.append((filename, stat.st_mtime_ns, stat.st_size) if stat else (filename, None, None))
+        return tuple(stats)
+
+    def _load(self, directory: Optional[str], versioned: bool) -> Dict[str, object]:
+        """
+        Unpickle every artifact, None for missing ones. Published versions are
+        never rewritten, so only they are memory-mapped (unversioned files may
+        be overwritten in place) and a corrupt one fails the whole reload.
+        """
+        artifacts = {}
+        for filename in self.filenames:
+            path = os.path.join(directory, filename) if directory else None
+            if path is None or not os.path.exists(path):
+                artifacts[filename] = None
+                continue
+            try:
+                artifacts[filename] = joblib.load(path, mmap_mode='r' if versioned else None)
+            except Exception as e:
+                if versioned:
+                    raise
+                logger.warning(f"Could not load artifact {path}: {e}")
+                artifacts[filename] = None
+        return artifacts
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Artifact watcher failed: {e}")
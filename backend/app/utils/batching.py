@@ -0,0 +1,135 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects items submitted from many threads into shared batches.
+
+    A worker thread waits for the first item, keeps collecting until
+    ``max_batch_size`` items are queued or ``max_wait_ms`` has passed, runs
+    ``process_batch`` once on the whole batch and resolves each item's future
+    with its row of the result. When a batch raises, its items are rerun one
+    at a time, so one bad input (e.g. a corrupt image) only fails its own
+    future rather than every request sharing the batch.
+    """
+
+    def __init__(self, name: str, process_batch: Callable[[List], Sequence],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.name = name
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self._queue: 'queue.Queue[Tuple[object, Future]]' = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name=f'batcher-{name}', daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def map(self, items: Sequence) -> List:
+        """Submit ``items`` and wait for their results, in order"""
+        futures = [self.submit(item) for item in items]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict:
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'queued': self._queue.qsize()
+        }
+
+    def _collect(self) -> List[Tuple[object, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+            except Exception as e:
+                if len(batch) == 1:
+                    logger.error(f"Item failed in {self.name}: {e}")
+                    batch[0][1].set_exception(e)
+                else:
+                    logger.warning(f"Batch of {len(items)} failed in {self.name}, retrying items one by one: {e}")
+                    self._run_isolated(batch)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def _run_isolated(self, batch: List[Tuple[object, Future]]):
+        """Rerun each item of a failed batch alone so only the items that fail get the exception"""
+        for item, future in batch:
+            try:
+                result = self.process_batch([item])[0]
+            except Exception as e:
+                logger.error(f"Item failed in {self.name}: {e}")
+                future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += 1
+            future.set_result(result)
+
+
+_batchers: Dict[Tuple[str, str], MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(kind: str, model_name: str) -> MicroBatcher:
+    """Process-wide batcher for one text or image model, sized by BATCH_MAX_SIZE / BATCH_MAX_WAIT_MS"""
+    key = (kind, model_name)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(key)
+            if batcher is None:
+                from app.config import Config
+                if kind == 'text':
+                    from .text_classification import TextClassifier
+                    classifier = TextClassifier(model_name=model_name)
+                else:
+                    from .image_classification import ImageClassifier
+                    classifier = ImageClassifier(model_name=model_name)
+
+                def process_batch(items):
+                    return classifier.predict_items(items, batch_size=len(items))
+
+                batcher = MicroBatcher(f'{kind}-{model_name}', process_batch,
+                                       max_batch_size=Config.BATCH_MAX_SIZE, max_wait_ms=Config.BATCH_MAX_WAIT_MS)
+                _batchers[key] = batcher
+    return batcher
+
+
+def batched_predict_items(kind: str, model_name: str, items: Sequence) -> np.ndarray:
+    """Per-item probabilities, computed in batches shared with concurrent callers"""
+    return np.array(get_batcher(kind, model_name).map(items)).reshape(-1, 3)
+
+
+def batcher_stats() -> Dict[str, Dict]:
+    return {batcher.name: batcher.stats() for batcher in list(_batchers.values())}
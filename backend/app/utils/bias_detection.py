@@ -1,18 +1,21 @@
-import re
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import numpy as np
+from app.utils.analysis_context import AnalysisContext
 
-def detect_bias(text_analysis: Dict, user_data: Dict) -> Dict:
+TextAnalysis = Union[Dict, AnalysisContext]
+
+def detect_bias(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """
     Detect various types of bias in the analysis results
     """
     try:
+        context = AnalysisContext.ensure(text_analysis)
         bias_results = {
-            'gender_bias': detect_gender_bias(text_analysis, user_data),
-            'racial_bias': detect_racial_bias(text_analysis, user_data),
-            'age_bias': detect_age_bias(text_analysis, user_data),
-            'socioeconomic_bias': detect_socioeconomic_bias(text_analysis, user_data)
+            'gender_bias': detect_gender_bias(context, user_data),
+            'racial_bias': detect_racial_bias(context, user_data),
+            'age_bias': detect_age_bias(context, user_data),
+            'socioeconomic_bias': detect_socioeconomic_bias(context, user_data)
         }
         
         # Calculate overall bias score
@@ -31,20 +34,14 @@ def detect_bias(text_analysis: Dict, user_data: Dict) -> Dict:
         logging.error(f"Error in bias detection: {str(e)}")
         return get_default_bias_results()
 
-def detect_gender_bias(text_analysis: Dict, user_data: Dict) -> Dict:
+def detect_gender_bias(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Detect gender-related bias in text analysis"""
     try:
-        # Gender-related keywords and patterns
-        gender_keywords = {
-            'male': ['he', 'him', 'his', 'man', 'men', 'guy', 'guys', 'male'],
-            'female': ['she', 'her', 'hers', 'woman', 'women', 'girl', 'girls', 'female']
-        }
-        
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
+        # Gender-related keywords (see KEYWORD_CATEGORIES)
+        counts = AnalysisContext.ensure(text_analysis).keyword_counts
         
-        male_count = sum(text_content.count(word) for word in gender_keywords['male'])
-        female_count = sum(text_content.count(word) for word in gender_keywords['female'])
+        male_count = counts['gender.male']
+        female_count = counts['gender.female']
         
         total_gender_mentions = male_count + female_count
         if total_gender_mentions == 0:
@@ -63,19 +60,11 @@ def detect_gender_bias(text_analysis: Dict, user_data: Dict) -> Dict:
         logging.error(f"Error in gender bias detection: {str(e)}")
         return {'score': 0.15, 'status': 'low', 'description': 'Gender bias analysis failed'}
 
-def detect_racial_bias(text_analysis: Dict, user_data: Dict) -> Dict:
+def detect_racial_bias(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Detect racial bias in text analysis"""
     try:
-        # Racial/ethnic keywords and patterns
-        racial_keywords = [
-            'race', 'racial', 'ethnic', 'minority', 'majority', 'diversity',
-            'black', 'white', 'asian', 'hispanic', 'latino', 'african', 'european'
-        ]
-        
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
-        
-        racial_mentions = sum(text_content.count(word) for word in racial_keywords)
+        # Racial/ethnic keywords (see KEYWORD_CATEGORIES)
+        racial_mentions = AnalysisContext.ensure(text_analysis).keyword_counts['racial']
         
         # Simple heuristic: more racial mentions might indicate bias
         bias_score = min(racial_mentions * 0.1, 1.0)
@@ -90,20 +79,14 @@ def detect_racial_bias(text_analysis: Dict, user_data: Dict) -> Dict:
         logging.error(f"Error in racial bias detection: {str(e)}")
         return {'score': 0.08, 'status': 'very-low', 'description': 'Racial bias analysis failed'}
 
-def detect_age_bias(text_analysis: Dict, user_data: Dict) -> Dict:
+def detect_age_bias(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Detect age-related bias in text analysis"""
     try:
-        # Age-related keywords and patterns
-        age_keywords = {
-            'young': ['young', 'youth', 'teen', 'teenager', 'kid', 'child'],
-            'old': ['old', 'elderly', 'senior', 'aged', 'boomer', 'millennial']
-        }
-        
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
+        # Age-related keywords (see KEYWORD_CATEGORIES)
+        counts = AnalysisContext.ensure(text_analysis).keyword_counts
         
-        young_count = sum(text_content.count(word) for word in age_keywords['young'])
-        old_count = sum(text_content.count(word) for word in age_keywords['old'])
+        young_count = counts['age.young']
+        old_count = counts['age.old']
         
         total_age_mentions = young_count + old_count
         if total_age_mentions == 0:
@@ -122,20 +105,11 @@ def detect_age_bias(text_analysis: Dict, user_data: Dict) -> Dict:
         logging.error(f"Error in age bias detection: {str(e)}")
         return {'score': 0.22, 'status': 'moderate', 'description': 'Age bias analysis failed'}
 
-def detect_socioeconomic_bias(text_analysis: Dict, user_data: Dict) -> Dict:
+def detect_socioeconomic_bias(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Detect socioeconomic bias in text analysis"""
     try:
-        # Socioeconomic keywords and patterns
-        socioeconomic_keywords = [
-            'rich', 'poor', 'wealthy', 'poverty', 'money', 'income',
-            'class', 'economic', 'financial', 'expensive', 'cheap',
-            'luxury', 'affordable', 'cost', 'price', 'wealth'
-        ]
-        
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
-        
-        socioeconomic_mentions = sum(text_content.count(word) for word in socioeconomic_keywords)
+        # Socioeconomic keywords (see KEYWORD_CATEGORIES)
+        socioeconomic_mentions = AnalysisContext.ensure(text_analysis).keyword_counts['socioeconomic']
         
         # Simple heuristic: more socioeconomic mentions might indicate bias
         bias_score = min(socioeconomic_mentions * 0.08, 1.0)
@@ -161,7 +135,7 @@ def get_bias_status(bias_score: float) -> str:
     else:
         return 'high'
 
-def calculate_fairness_metrics(text_analysis: Dict, user_data: Dict) -> Dict:
+def calculate_fairness_metrics(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Calculate fairness metrics for the analysis"""
     try:
         # This would typically involve more sophisticated fairness calculations
@@ -0,0 +1,72 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+NUM_CLASSES = 3
+
+
+def margins(probs: np.ndarray) -> np.ndarray:
+    """Gap between the top two class probabilities of each row"""
+    if len(probs) == 0:
+        return np.empty(0)
+    top_two = np.sort(probs, axis=1)[:, -2:]
+    return top_two[:, 1] - top_two[:, 0]
+
+
+def plan_stages(requested: Sequence[str], cost_order: Sequence[str]) -> List[str]:
+    """
+    Cascade stages for the requested models: the configured cheap stage
+    (``cost_order[0]``) first, so confident items exit before any expensive
+    model, then the requested models cheapest first (models missing from
+    ``cost_order`` go last). Nothing runs when no model is requested.
+    """
+    if not requested:
+        return []
+    order = list(cost_order)
+    stages = order[:1] + [name for name in dict.fromkeys(requested) if name not in order[:1]]
+    return stages[:1] + sorted(stages[1:], key=lambda name: order.index(name) if name in order else len(order))
+
+
+def run_cascade(items: Sequence, stages: List[str],
+                predict_items: Callable[[str, List], np.ndarray],
+                margin_threshold: float) -> Tuple[np.ndarray, Dict]:
+    """
+    Early-exit inference over ``stages`` (cheapest model first).
+
+    Each stage scores the items still pending and accepts those whose top-two
+    margin reaches ``margin_threshold``; the rest move on to the next stage.
+    The last stage accepts everything it sees. Returns one probability row
+    per item (from the stage that accepted it) and per-stage hit rates.
+    """
+    items = list(items)
+    probs = np.full((len(items), NUM_CLASSES), 1 / NUM_CLASSES)
+    pending = np.arange(len(items))
+    stage_stats = []
+    model_calls = 0
+
+    for position, model_name in enumerate(stages):
+        if len(pending) == 0:
+            break
+
+        stage_probs = predict_items(model_name, [items[i] for i in pending])
+        model_calls += len(pending)
+        is_last = position == len(stages) - 1
+        accepted = np.ones(len(pending), dtype=bool) if is_last else margins(stage_probs) >= margin_threshold
+
+        probs[pending[accepted]] = stage_probs[accepted]
+        stage_stats.append({
+            'model': model_name,
+            'items_scored': int(len(pending)),
+            'items_accepted': int(accepted.sum()),
+            'hit_rate': float(accepted.sum() / len(items))
+        })
+        pending = pending[~accepted]
+
+    full_calls = len(items) * len(stages)
+    stats = {
+        'stages': stage_stats,
+        'items': len(items),
+        'model_calls': model_calls,
+        'compute_saved': float(1 - model_calls / full_calls) if full_calls else 0.0
+    }
+    return probs, stats
@@ -0,0 +1,224 @@
+import logging
+import threading
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from .artifact_store import UNVERSIONED, ArtifactStore
+from .model_paths import BASE_DIR, FUSION_ARTIFACT_DIR
+
+logger = logging.getLogger(__name__)
+
+FUSION_TECHNIQUES = ('weighted_average', 'feature_fusion', 'attention', 'stacking', 'learned_weights')
+NEUTRAL = np.full(3, 1 / 3)
+DEFAULT_PROBS = np.array([0.33, 0.33, 0.34])
+
+# Constructor argument -> artifact filename
+ARTIFACT_FILES = {
+    'feature_model': 'fusion_model.pkl',
+    'feature_scaler': 'feature_scaler.pkl',
+    'meta_classifier': 'meta_classifier.pkl',
+    'fusion_weights': 'fusion_weights.pkl'
+}
+
+
+class ModelOutputs:
+    """
+    Mean class probabilities of every base model for a batch of users.
+
+    ``probs`` has shape (users, models, 3) with the text models first. A
+    modality a user has no items for holds neutral probabilities, the same
+    value the classifiers return for an empty input.
+    """
+
+    def __init__(self, probs: np.ndarray, text_models: Sequence[str], image_models: Sequence[str],
+                 text_counts: np.ndarray, image_counts: np.ndarray):
+        self.probs = probs
+        self.text_models = list(text_models)
+        self.image_models = list(image_models)
+        self.text_counts = np.asarray(text_counts)
+        self.image_counts = np.asarray(image_counts)
+
+    @classmethod
+    def from_user(cls, text_outputs: Mapping[str, np.ndarray], image_outputs: Mapping[str, np.ndarray],
+                  text_models: Sequence[str], image_models: Sequence[str],
+                  num_texts: int, num_images: int) -> 'ModelOutputs':
+        """Single-user outputs from per-model mean probabilities"""
+        rows = [text_outputs.get(name, NEUTRAL) for name in text_models]
+        rows += [image_outputs.get(name, NEUTRAL) for name in image_models]
+        probs = np.array(rows, dtype=float).reshape(1, len(rows), 3)
+        return cls(probs, text_models, image_models, np.array([num_texts]), np.array([num_images]))
+
+    @classmethod
+    def concatenate(cls, batches: List['ModelOutputs']) -> 'ModelOutputs':
+        first = batches[0]
+        return cls(np.concatenate([batch.probs for batch in batches]), first.text_models, first.image_models,
+                   np.concatenate([batch.text_counts for batch in batches]),
+                   np.concatenate([batch.image_counts for batch in batches]))
+
+    @property
+    def num_users(self) -> int:
+        return self.probs.shape[0]
+
+    @property
+    def has_text(self) -> np.ndarray:
+        return self.text_counts > 0
+
+    @property
+    def has_image(self) -> np.ndarray:
+        return self.image_counts > 0
+
+    def text_mean(self) -> np.ndarray:
+        """(users, 3) mean over the text models"""
+        text = self.probs[:, :len(self.text_models)]
+        return text.sum(axis=1) / max(1, len(self.text_models))
+
+    def image_mean(self) -> np.ndarray:
+        """(users, 3) mean over the image models"""
+        image = self.probs[:, len(self.text_models):]
+        return image.sum(axis=1) / max(1, len(self.image_models))
+
+
+class FusionEngine:
+    """
+    Every fusion technique as array operations over ModelOutputs.
+
+    The fusion artifacts are loaded once, so any number of techniques and
+    users can be fused from a single inference pass.
+    """
+
+    def __init__(self, feature_model=None, feature_scaler=None, meta_classifier=None,
+                 fusion_weights: Optional[Mapping] = None, version: str = UNVERSIONED):
+        self.version = version
+        self.feature_model = feature_model
+        self.feature_scaler = feature_scaler if feature_scaler is not None else StandardScaler()
+        self.meta_classifier = meta_classifier
+        fusion_weights = fusion_weights or {}
+        self.text_weight = fusion_weights.get('text_weight', 0.5)
+        self.image_weight = fusion_weights.get('image_weight', 0.5)
+        self.bias = np.asarray(fusion_weights.get('bias', np.zeros(3)))
+
+    @classmethod
+    def from_artifacts(cls, artifacts: Mapping[str, object], version: str = UNVERSIONED) -> 'FusionEngine':
+        """Engine from loaded artifacts keyed by filename (see ARTIFACT_FILES); missing ones are None"""
+        return cls(version=version, **{arg: artifacts.get(filename) for arg, filename in ARTIFACT_FILES.items()})
+
+    def fuse(self, technique: str, outputs: ModelOutputs, alpha: float = 0.5) -> Tuple[np.ndarray, Dict]:
+        """(users, 3) final probabilities plus per-user extras for one technique"""
+        if technique == 'weighted_average':
+            return self.weighted_average(outputs, alpha), {}
+        if technique == 'feature_fusion':
+            return self.feature_fusion(outputs), {}
+        if technique == 'attention':
+            return self.attention(outputs)
+        if technique == 'stacking':
+            return self.stacking(outputs), {}
+        if technique == 'learned_weights':
+            return self.learned_weights(outputs), {
+                'text_weight': np.full(outputs.num_users, float(self.text_weight)),
+                'image_weight': np.full(outputs.num_users, float(self.image_weight))
+            }
+        raise ValueError(f"Unknown fusion technique: {technique}")
+
+    def fuse_all(self, outputs: ModelOutputs, alpha: float = 0.5) -> Dict[str, Tuple[np.ndarray, Dict]]:
+        return {technique: self.fuse(technique, outputs, alpha) for technique in FUSION_TECHNIQUES}
+
+    def _present_means(self, outputs: ModelOutputs) -> Tuple[np.ndarray, np.ndarray]:
+        """Modality means with zeros where the user has no items of that modality"""
+        text = np.where(outputs.has_text[:, None], outputs.text_mean(), 0.0)
+        image = np.where(outputs.has_image[:, None], outputs.image_mean(), 0.0)
+        return text, image
+
+    def weighted_average(self, outputs: ModelOutputs, alpha: float = 0.5) -> np.ndarray:
+        return alpha * outputs.text_mean() + (1 - alpha) * outputs.image_mean()
+
+    def feature_fusion(self, outputs: ModelOutputs) -> np.ndarray:
+        features = np.concatenate(self._present_means(outputs), axis=1)
+        if self.feature_model is None:
+            # Softmax over the concatenated features when no model is trained,
+            # folded back to one probability per class
+            exp_scores = np.exp(features)
+            exp_scores = exp_scores.reshape(len(features), -1, 3).sum(axis=1)
+            return exp_scores / np.sum(exp_scores, axis=1, keepdims=True)
+        return self.feature_model.predict_proba(self.feature_scaler.transform(features))
+
+    def attention(self, outputs: ModelOutputs) -> Tuple[np.ndarray, Dict]:
+        text, image = self._present_means(outputs)
+        text_conf, image_conf = text.max(axis=1), image.max(axis=1)
+        total = text_conf + image_conf
+        text_weight = np.where(total > 0, text_conf / np.where(total > 0, total, 1), 0.5)
+        image_weight = np.where(total > 0, image_conf / np.where(total > 0, total, 1), 0.5)
+
+        # A missing modality gets no weight
+        text_weight = np.where(~outputs.has_text, 0.0, np.where(~outputs.has_image, 1.0, text_weight))
+        image_weight = np.where(~outputs.has_text, 1.0, np.where(~outputs.has_image, 0.0, image_weight))
+
+        final = text_weight[:, None] * text + image_weight[:, None] * image
+        return final, {'text_weight': text_weight, 'image_weight': image_weight}
+
+    def stacking(self, outputs: ModelOutputs) -> np.ndarray:
+        final = np.tile(DEFAULT_PROBS, (outputs.num_users, 1))
+
+        # Users are grouped by which modalities they have, since that sets the models to stack
+        for has_text in (True, False):
+            for has_image in (True, False):
+                users = np.flatnonzero((outputs.has_text == has_text) & (outputs.has_image == has_image))
+                names = (outputs.text_models if has_text else []) + (outputs.image_models if has_image else [])
+                if len(users) == 0 or not names:
+                    continue
+                final[users] = self._stack(outputs, users, names)
+        return final
+
+    def _stack(self, outputs: ModelOutputs, users: np.ndarray, names: List[str]) -> np.ndarray:
+        model_names = outputs.text_models + outputs.image_models
+        if isinstance(self.meta_classifier, Mapping):
+            # Trained per model combination, keyed (and ordered) by sorted model names
+            key = tuple(sorted(names))
+            classifier = self.meta_classifier.get(key)
+            if classifier is not None:
+                columns = [model_names.index(name) for name in key]
+                return classifier.predict_proba(outputs.probs[users][:, columns].reshape(len(users), -1))
+            # No classifier was trained on this combination of models
+            return outputs.probs[users][:, [model_names.index(name) for name in names]].mean(axis=1)
+
+        # A single legacy classifier of unknown column order, used only when the width matches
+        columns = [model_names.index(name) for name in names]
+        model_probs = outputs.probs[users][:, columns]
+        width = getattr(self.meta_classifier, 'n_features_in_', None)
+        if self.meta_classifier is None or (width is not None and width != len(columns) * 3):
+            return model_probs.mean(axis=1)
+        return self.meta_classifier.predict_proba(model_probs.reshape(len(users), -1))
+
+    def learned_weights(self, outputs: ModelOutputs) -> np.ndarray:
+        text, image = self._present_means(outputs)
+        final = self.text_weight * text + self.image_weight * image + self.bias
+        totals = final.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, final / np.where(totals > 0, totals, 1), DEFAULT_PROBS)
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """
+    Process-wide fusion artifact store, watching FUSION_ARTIFACT_DIR every
+    FUSION_RELOAD_INTERVAL seconds. Unversioned pickles next to this module
+    are served until a version is published.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from app.config import Config
+                _store = ArtifactStore(Config.FUSION_ARTIFACT_DIR or FUSION_ARTIFACT_DIR,
+                                       list(ARTIFACT_FILES.values()), FusionEngine.from_artifacts,
+                                       legacy_dir=BASE_DIR,
+                                       reload_interval=Config.FUSION_RELOAD_INTERVAL).start()
+    return _store
+
+
+def get_fusion_engine() -> FusionEngine:
+    """Engine for the currently served artifact version; never reads from disk once the store is started"""
+    return get_artifact_store().current.value
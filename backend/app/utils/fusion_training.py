@@ -0,0 +1,147 @@
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from .fusion_engine import ARTIFACT_FILES, NEUTRAL, FusionEngine, ModelOutputs
+
+NUM_CLASSES = 3
+EPSILON = 1e-9
+
+
+def sample_profiles(text_probs: np.ndarray, text_labels: np.ndarray,
+                    image_probs: np.ndarray, image_labels: np.ndarray,
+                    text_models: Sequence[str], image_models: Sequence[str],
+                    num_profiles: int, max_texts: int = 50, max_images: int = 10,
+                    purity: Tuple[float, float] = (0.6, 1.0), missing_rate: float = 0.15,
+                    seed: int = 0) -> Tuple[ModelOutputs, np.ndarray]:
+    """
+    Synthetic profiles built from cached per-item outputs.
+
+    The datasets hold unpaired tweets and images, while the fusion models see
+    per-profile means, so each profile draws a label, then texts and images
+    of mostly that label (the rest from any class). A modality is dropped
+    with probability ``missing_rate`` so text-only and image-only profiles are
+    covered. Classes without images (Political) get images from any class.
+
+    ``text_probs`` is (texts, text models, 3) and ``image_probs`` is
+    (images, image models, 3).
+    """
+    rng = np.random.default_rng(seed)
+    text_pools = {label: np.flatnonzero(text_labels == label) for label in range(NUM_CLASSES)}
+    image_pools = {label: np.flatnonzero(image_labels == label) for label in range(NUM_CLASSES)}
+    classes = [label for label, pool in text_pools.items() if len(pool)]
+
+    def draw(pools, total, count, label):
+        pool = pools[label] if len(pools[label]) else np.arange(total)
+        on_label = rng.random(count) < rng.uniform(*purity)
+        return np.where(on_label, rng.choice(pool, count), rng.integers(0, total, count))
+
+    num_models = len(text_models) + len(image_models)
+    probs = np.tile(NEUTRAL, (num_profiles, num_models, 1))
+    text_counts = np.zeros(num_profiles, dtype=int)
+    image_counts = np.zeros(num_profiles, dtype=int)
+    labels = rng.choice(classes, num_profiles)
+
+    for row, label in enumerate(labels):
+        drop = rng.random()
+        has_text = len(text_probs) > 0 and not (len(image_probs) and drop < missing_rate)
+        has_image = len(image_probs) > 0 and not (has_text and drop > 1 - missing_rate)
+        if has_text:
+            picked = draw(text_pools, len(text_probs), int(rng.integers(1, max_texts + 1)), label)
+            probs[row, :len(text_models)] = text_probs[picked].mean(axis=0)
+            text_counts[row] = len(picked)
+        if has_image:
+            picked = draw(image_pools, len(image_probs), int(rng.integers(1, max_images + 1)), label)
+            probs[row, len(text_models):] = image_probs[picked].mean(axis=0)
+            image_counts[row] = len(picked)
+
+    return ModelOutputs(probs, text_models, image_models, text_counts, image_counts), labels
+
+
+def _log_loss(probs: np.ndarray, labels: np.ndarray) -> float:
+    return float(-np.mean(np.log(np.clip(probs[np.arange(len(labels)), labels], EPSILON, 1))))
+
+
+def fit_feature_fusion(outputs: ModelOutputs, labels: np.ndarray) -> Tuple[LogisticRegression, StandardScaler]:
+    """Logistic regression over the concatenated text and image means"""
+    features = np.concatenate(FusionEngine()._present_means(outputs), axis=1)
+    scaler = StandardScaler().fit(features)
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(features), labels)
+    return model, scaler
+
+
+def _subsets(names: List[str]) -> List[List[str]]:
+    return [list(subset) for size in range(len(names) + 1) for subset in itertools.combinations(names, size)]
+
+
+def fit_meta_classifier(outputs: ModelOutputs,
+                        labels: np.ndarray) -> Optional[Dict[Tuple[str, ...], LogisticRegression]]:
+    """
+    One logistic regression per combination of base models, keyed by the
+    sorted model names (also their feature order), so stacking can serve any
+    model selection and users missing a modality. Each is fitted on the
+    profiles that have the modalities it uses.
+    """
+    names = outputs.text_models + outputs.image_models
+    classifiers = {}
+    for text_subset in _subsets(outputs.text_models):
+        for image_subset in _subsets(outputs.image_models):
+            key = tuple(sorted(text_subset + image_subset))
+            if not key:
+                continue
+            users = np.ones(outputs.num_users, dtype=bool)
+            if text_subset:
+                users &= outputs.has_text
+            if image_subset:
+                users &= outputs.has_image
+            if not users.any() or len(np.unique(labels[users])) < 2:
+                continue
+            features = outputs.probs[users][:, [names.index(name) for name in key]].reshape(int(users.sum()), -1)
+            classifiers[key] = LogisticRegression(max_iter=1000).fit(features, labels[users])
+    return classifiers or None
+
+
+def fit_learned_weights(outputs: ModelOutputs, labels: np.ndarray) -> Dict:
+    """Non-negative modality weights and class bias minimizing log loss of the learned_weights technique"""
+
+    def loss(params):
+        engine = FusionEngine(fusion_weights={'text_weight': params[0], 'image_weight': params[1],
+                                              'bias': params[2:]})
+        return _log_loss(engine.learned_weights(outputs), labels)
+
+    start = np.array([0.5, 0.5, 0.0, 0.0, 0.0])
+    result = minimize(loss, start, method='L-BFGS-B', bounds=[(0, None)] * len(start))
+    return {
+        'text_weight': float(result.x[0]),
+        'image_weight': float(result.x[1]),
+        'bias': np.asarray(result.x[2:])
+    }
+
+
+def fit_fusion_models(outputs: ModelOutputs, labels: np.ndarray) -> Dict[str, object]:
+    """Every fusion artifact, keyed by filename for ArtifactStore.publish"""
+    feature_model, feature_scaler = fit_feature_fusion(outputs, labels)
+    fitted = {
+        'feature_model': feature_model,
+        'feature_scaler': feature_scaler,
+        'meta_classifier': fit_meta_classifier(outputs, labels),
+        'fusion_weights': fit_learned_weights(outputs, labels)
+    }
+    return {ARTIFACT_FILES[arg]: artifact for arg, artifact in fitted.items() if artifact is not None}
+
+
+def evaluate(engine: FusionEngine, outputs: ModelOutputs, labels: np.ndarray,
+             alpha: float = 0.5) -> Dict[str, Dict[str, float]]:
+    """Accuracy and log loss of every technique"""
+    report = {}
+    for technique, (probs, _) in engine.fuse_all(outputs, alpha).items():
+        report[technique] = {
+            'accuracy': float(np.mean(probs.argmax(axis=1) == labels)),
+            'log_loss': _log_loss(probs, labels)
+        }
+    return report
+
@@ -1,6 +1,4 @@
 from transformers import XLNetTokenizer, XLNetForSequenceClassification
-from keras.models import load_model
-from keras.preprocessing import image as keras_image
 import torch
 import torchvision.transforms as transforms
 from PIL import Image
@@ -9,28 +7,44 @@ from dotenv import load_dotenv
 import re
 import string
 from typing import List, Optional
-from .models import ImageModels
 import torch.nn.functional as F
+from app.config import Config
+from .metrics import MODEL_ITEMS, timed
+from .model_paths import CLIP_TEXT_LABELS
 
 load_dotenv(override=True)
 
 
 class ImageClassifier:
-    def __init__(self, model_name: str = "vgg16"):
+    def __init__(self, model_name: str = "vgg16", backend: Optional[str] = None):
         self.model_name = model_name
-        self.image_models = ImageModels()
+        self.backend = backend or Config.INFERENCE_BACKEND
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if model_name not in ("vgg16", "clip"):
+            raise ValueError(f"Unsupported model: {model_name}")
+
+        if self.backend == "onnx":
+            # ONNX Runtime session; TensorFlow and the eager CLIP model are never loaded
+            from .onnx_backend import get_clip_image_processor, get_onnx_model
+            self.model = get_onnx_model(model_name)
+            if model_name == "clip":
+                self.processor = get_clip_image_processor()
+            return
+
+        from .models import ImageModels
+        self.image_models = ImageModels()
         if model_name == "vgg16":
             self.model = self.image_models.vgg16_image_model
-        elif model_name == "clip":
+        else:
             self.model = self.image_models.clip_model
             self.processor = self.image_models.clip_model_processor
-        else:
-            raise ValueError(f"Unsupported model: {model_name}")
 
     def preprocess_image(self,image_path):
         """Preprocess image for model input"""
+        if self.backend == "onnx":
+            return self.load_image_array(image_path)
         try:
+            from keras.preprocessing import image as keras_image
             img = keras_image.load_img(image_path, target_size=(224, 224))
             img_array = keras_image.img_to_array(img)
             img_array = img_array / 255.0  # Normalize
@@ -39,32 +53,51 @@ class ImageClassifier:
             logger.error(f"Image preprocessing error: {e}")
             raise e
 
+    @staticmethod
+    def load_image_array(image_path) -> np.ndarray:
+        """Same array as keras load_img/img_to_array (nearest resize to 224x224), without TensorFlow"""
+        img = Image.open(image_path).convert('RGB').resize((224, 224), Image.NEAREST)
+        return np.expand_dims(np.asarray(img, dtype=np.float32) / 255.0, axis=0)
+
     def predict(self,images: List[str]) -> np.ndarray:
         if not images:
             return np.array([1 / 3, 1 / 3, 1 / 3])  # Neutral
+        return np.mean(self.predict_items(images), axis=0)
+
+    def predict_items(self, images: List[str], batch_size: int = 1) -> np.ndarray:
+        """Class probabilities for each image, shape (len(images), 3), ``batch_size`` images per forward pass"""
         probs_list = []
+        with timed('image_predict', self.model_name):
+            for start in range(0, len(images), batch_size):
+                probs_list.extend(self._forward(images[start:start + batch_size]))
+        MODEL_ITEMS.inc(len(images), model=self.model_name)
+        return np.array(probs_list).reshape(-1, 3)
+
+    def _forward(self, image_paths: List[str]) -> np.ndarray:
+        if self.backend == "onnx":
+            return self._forward_onnx(image_paths)
+
         if self.model_name == 'vgg16':
-            for img_path in images:
-                # For VGG16, we use the Keras model directly
-                img_array = self.preprocess_image(img_path)
-                preds = self.model.predict(img_array)
-                probs_list.append(preds.squeeze())
-        elif self.model_name == 'clip':
-            for img_path in images:
-                image = Image.open(img_path).convert('RGB')
-                text_labels = [
-                    "an image showing non-radical, moderate, or neutral content, sports person, athletes, normal people, families, nature, landscapes, animals, food, entertainment, celebrities, art, music, technology, science, education, business, fashion, travel",
-                    "an image showing political content, government, elections, politician, political figures, voting, campaigns, political rallies, government buildings, flags, political parties, political debates, political meetings, political speeches",
-                    "an image showing radical content, terrorism, extremism, violent protests, revolutionary symbols, anarchist symbols, hate symbols, armed conflicts, radical propaganda",
-                ]
-                inputs = self.processor(text=text_labels, images=image, return_tensors="pt", padding=True)
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    logits_per_image = outputs.logits_per_image
-                    probs = F.softmax(logits_per_image, dim=-1)
-                probs_list.append(probs[0])
-        return np.mean(probs_list, axis=0)
+            # For VGG16, we use the Keras model directly
+            img_array = np.concatenate([self.preprocess_image(img_path) for img_path in image_paths])
+            return self.model.predict(img_array, verbose=0).reshape(len(image_paths), -1)
 
+        images = [Image.open(img_path).convert('RGB') for img_path in image_paths]
+        inputs = self.processor(text=CLIP_TEXT_LABELS, images=images, return_tensors="pt", padding=True)
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            probs = F.softmax(outputs.logits_per_image, dim=-1)
+        return probs.cpu().numpy()
 
+    def _forward_onnx(self, image_paths: List[str]) -> np.ndarray:
+        from .onnx_backend import load_clip_text_embeddings, softmax
+        if self.model_name == 'vgg16':
+            img_array = np.concatenate([self.load_image_array(img_path) for img_path in image_paths])
+            return self.model.run({self.model.input_names[0]: img_array})
 
+        images = [Image.open(img_path).convert('RGB') for img_path in image_paths]
+        pixel_values = self.processor(images=images, return_tensors="np")['pixel_values']
+        image_embeds = self.model.run({'pixel_values': pixel_values})
+        text_embeds, logit_scale = load_clip_text_embeddings()
+        return softmax(logit_scale * image_embeds @ text_embeds.T)
@@ -0,0 +1,115 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+# Lowercase words, keeping hyphenated compounds ("low-income") and snake_case
+# hashtags ("#people_of_color") as single tokens
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+(?:-[a-z0-9_]+)*")
+
+# Every keyword list used by the heuristic scorers, keyed by category
+KEYWORD_CATEGORIES: Dict[str, List[str]] = {
+    # bias_detection
+    'gender.male': ['he', 'him', 'his', 'man', 'men', 'guy', 'guys', 'male'],
+    'gender.female': ['she', 'her', 'hers', 'woman', 'women', 'girl', 'girls', 'female'],
+    'racial': [
+        'race', 'racial', 'ethnic', 'minority', 'majority', 'diversity',
+        'black', 'white', 'asian', 'hispanic', 'latino', 'african', 'european'
+    ],
+    'age.young': ['young', 'youth', 'teen', 'teenager', 'kid', 'child'],
+    'age.old': ['old', 'elderly', 'senior', 'aged', 'boomer', 'millennial'],
+    'socioeconomic': [
+        'rich', 'poor', 'wealthy', 'poverty', 'money', 'income',
+        'class', 'economic', 'financial', 'expensive', 'cheap',
+        'luxury', 'affordable', 'cost', 'price', 'wealth'
+    ],
+
+    # social_impact
+    'protected.women': ['woman', 'women', 'female', 'girl', 'she', 'her'],
+    'protected.people_of_color': ['black', 'asian', 'hispanic', 'latino', 'african', 'minority'],
+    'protected.lgbtq': ['lgbt', 'lgbtq', 'gay', 'lesbian', 'transgender', 'queer'],
+    'protected.disabilities': ['disability', 'disabled', 'wheelchair', 'accessibility'],
+    'protected.religious_minorities': ['muslim', 'jewish', 'hindu', 'buddhist', 'religious'],
+    'protected.economic_disadvantaged': ['poor', 'poverty', 'low-income', 'affordable', 'economic'],
+    'representation': [
+        'diversity', 'inclusive', 'representation', 'minority', 'marginalized',
+        'equality', 'equity', 'justice', 'rights', 'freedom'
+    ],
+    'fairness': [
+        'fair', 'unfair', 'bias', 'discrimination', 'prejudice', 'stereotype',
+        'equal', 'unequal', 'justice', 'injustice', 'rights', 'freedom'
+    ],
+    'inclusivity': [
+        'inclusive', 'inclusion', 'welcome', 'accept', 'embrace', 'support',
+        'community', 'together', 'unity', 'solidarity', 'ally', 'advocate'
+    ],
+    'community': [
+        'help', 'support', 'assist', 'aid', 'volunteer', 'donate',
+        'community', 'charity', 'nonprofit', 'foundation', 'initiative'
+    ],
+    'supported_group.women': ['women'],
+    'supported_group.people_of_color': ['people_of_color'],
+    'supported_group.lgbtq': ['lgbtq'],
+    'supported_group.disabilities': ['disabilities'],
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ``text`` and split it into word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordEngine:
+    """
+    Counts keyword hits for many categories in a single pass over the tokens.
+
+    Keywords match whole tokens only, so "he" no longer matches inside "the".
+    A hyphenated token also counts each of its parts ("low-income" hits both
+    "low-income" and "income").
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]]):
+        self.categories = tuple(categories)
+        index: Dict[str, List[str]] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                index.setdefault(keyword.lower(), []).append(category)
+        self._index: Dict[str, Tuple[str, ...]] = {token: tuple(cats) for token, cats in index.items()}
+
+    def token_categories(self, token: str) -> Tuple[str, ...]:
+        """Categories hit by one token (with repeats if several keywords hit)"""
+        categories = self._index.get(token, ())
+        if '-' in token:
+            for part in token.split('-'):
+                categories += self._index.get(part, ())
+        return categories
+
+    def count_tokens(self, token_counts: Mapping[str, int]) -> Dict[str, int]:
+        """Category counts from a token -> occurrences mapping"""
+        counts = dict.fromkeys(self.categories, 0)
+        for token, occurrences in token_counts.items():
+            for category in self.token_categories(token):
+                counts[category] += occurrences
+        return counts
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Category counts for one piece of text"""
+        return self.count_tokens(Counter(tokenize(text)))
+
+    def count_texts(self, texts: Iterable[str]) -> Dict[str, int]:
+        """Category counts over a corpus of texts"""
+        token_counts = Counter()
+        for text in texts:
+            token_counts.update(tokenize(text))
+        return self.count_tokens(token_counts)
+
+
+@lru_cache(maxsize=1)
+def get_keyword_engine() -> KeywordEngine:
+    """Shared engine built once from KEYWORD_CATEGORIES"""
+    return KeywordEngine(KEYWORD_CATEGORIES)
+
+
+def tweet_texts(text_analysis: Dict) -> List[str]:
+    """Texts of the tweets in a text_analysis payload"""
+    return [tweet.get('text', '') for tweet in text_analysis.get('tweets', [])]
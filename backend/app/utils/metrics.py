@@ -0,0 +1,251 @@
+import bisect
+import sys
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from . import tracing
+
+# Seconds; spans sub-millisecond DB reads up to multi-minute scrapes
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in sorted(values)]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label combination"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List] = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in sorted(values):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state):
+                cumulative += count
+                le = 'le="{}"'.format('+Inf' if bound == float('inf') else _format_value(bound))
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {repr(float(state[-2]))}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], List[str]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.setdefault(metric.name, metric)
+            return self._metrics[metric.name]
+
+    def add_collector(self, collect: Callable[[], List[str]]):
+        """``collect`` returns complete exposition lines (HELP/TYPE included), evaluated on every scrape"""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            lines.extend(metric.samples())
+        for collect in self._collectors:
+            lines.extend(collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'stage_duration_seconds', 'Time spent in each instrumented stage', ('stage', 'detail')
+))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    'stage_errors_total', 'Stages that raised an exception', ('stage', 'detail')
+))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    'cache_lookups_total', 'Cache lookups by result (hit, miss or stale)', ('cache', 'result')
+))
+MODEL_ITEMS = REGISTRY.register(Counter(
+    'model_items_total', 'Items scored by each base model', ('model',)
+))
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'http_requests_total', 'HTTP requests by endpoint and status', ('endpoint', 'method', 'status')
+))
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by endpoint', ('endpoint', 'method')
+))
+
+
+class timed:
+    """
+    Record a stage's duration in ``stage_duration_seconds``.
+
+        with timed('gemini', 'bias_detection'):
+            ...
+
+        @timed('scraper_profile')
+        def get_user_profile(...): ...
+
+    Exceptions are counted in ``stage_errors`` and re-raised. Inside a traced
+    request the stage is also recorded as a span.
+    """
+
+    def __init__(self, stage: str, detail: str = ''):
+        self.stage = stage
+        self.detail = detail
+
+    def __enter__(self):
+        self._span = tracing.start_span(self.stage, **({'detail': self.detail} if self.detail else {}))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self._start, stage=self.stage, detail=self.detail)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(stage=self.stage, detail=self.detail)
+            tracing.end_span(self._span, error=exc_type.__name__)
+        else:
+            tracing.end_span(self._span)
+        return False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.stage, self.detail):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def record_cache(cache: str, result: str):
+    """Count a cache lookup; ``result`` is hit, miss or stale"""
+    CACHE_LOOKUPS.inc(cache=cache, result=result)
+
+
+def observe_since(stage: str, start: float, detail: str = ''):
+    """Record a stage that started at ``start`` (time.perf_counter) and ends now"""
+    STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage, detail=detail)
+
+
+def init_app(app):
+    """Count and time every request by its Flask endpoint"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('metrics_start', None)
+        endpoint = request.endpoint or 'unmatched'
+        if start is not None:
+            HTTP_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint, method=request.method)
+        HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        return response
+
+
+def gauge_lines(name: str, documentation: str, samples: Dict[Tuple[Tuple[str, str], ...], float],
+                type_name: str = 'gauge') -> List[str]:
+    """Exposition lines for a collector; ``samples`` maps ((label, value), ...) to a value"""
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} {type_name}']
+    for labels, value in sorted(samples.items()):
+        lines.append(f'{name}{_format_labels([k for k, _ in labels], [v for _, v in labels])} {_format_value(value)}')
+    return lines
+
+
+def _collect_runtime_caches() -> List[str]:
+    """Token cache and micro-batcher statistics, only for modules the process has already loaded"""
+    lines = []
+    tokenization = sys.modules.get('app.utils.tokenization')
+    token_cache = getattr(tokenization, '_token_cache', None)
+    if token_cache is not None:
+        lines += gauge_lines('token_cache_lookups_total', 'Token cache lookups by result', {
+            (('result', 'hit'),): token_cache.hits,
+            (('result', 'miss'),): token_cache.misses
+        }, type_name='counter')
+
+    batching = sys.modules.get('app.utils.batching')
+    if batching is not None and batching.batcher_stats():
+        stats = batching.batcher_stats()
+        lines += gauge_lines('batcher_mean_batch_size', 'Mean items per micro-batch',
+                             {(('batcher', name),): batch['mean_batch_size'] for name, batch in stats.items()})
+        lines += gauge_lines('batcher_queued_items', 'Items waiting for a micro-batch',
+                             {(('batcher', name),): batch['queued'] for name, batch in stats.items()})
+    return lines
+
+
+REGISTRY.add_collector(_collect_runtime_caches)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
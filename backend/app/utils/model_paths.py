@@ -0,0 +1,35 @@
+import os
+
+# Locations of the trained models (fetched by download_models)
+BASE_DIR = os.path.dirname(__file__)
+
+BERT_MODEL_PATH = f"{BASE_DIR}/final_bert_model"
+VGG_MODEL_PATH = f"{BASE_DIR}/x_image_classification_model.keras"
+XLNET_MODEL_PATH = f"{BASE_DIR}/final_model"
+CLIP_MODEL_NAME = "openai/clip-vit-base-patch32"
+
+TEXT_MODEL_PATHS = {
+    'xlnet': XLNET_MODEL_PATH,
+    'bert': BERT_MODEL_PATH
+}
+
+# ONNX exports of the same models (written by export_onnx.py)
+ONNX_DIR = f"{BASE_DIR}/onnx_models"
+ONNX_MODEL_PATHS = {
+    'xlnet': f"{ONNX_DIR}/xlnet.onnx",
+    'bert': f"{ONNX_DIR}/bert.onnx",
+    'vgg16': f"{ONNX_DIR}/vgg16.onnx",
+    'clip': f"{ONNX_DIR}/clip_vision.onnx"
+}
+CLIP_TEXT_EMBEDDINGS_PATH = f"{ONNX_DIR}/clip_text_embeddings.npz"
+CLIP_PROCESSOR_PATH = f"{ONNX_DIR}/clip_processor"
+
+# Versioned fusion artifacts: <dir>/<version>/*.pkl, with <dir>/CURRENT naming the served version
+FUSION_ARTIFACT_DIR = f"{BASE_DIR}/fusion_artifacts"
+
+# Zero-shot prompts for the CLIP image classifier, in class order
+CLIP_TEXT_LABELS = [
+    "an image showing non-radical, moderate, or neutral content, sports person, athletes, normal people, families, nature, landscapes, animals, food, entertainment, celebrities, art, music, technology, science, education, business, fashion, travel",
+    "an image showing political content, government, elections, politician, political figures, voting, campaigns, political rallies, government buildings, flags, political parties, political debates, political meetings, political speeches",
+    "an image showing radical content, terrorism, extremism, violent protests, revolutionary symbols, anarchist symbols, hate symbols, armed conflicts, radical propaganda",
+]
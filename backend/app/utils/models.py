@@ -1,5 +1,5 @@
-from transformers import XLNetTokenizer, XLNetForSequenceClassification, CLIPProcessor, CLIPModel, BertTokenizer, \
-    BertForSequenceClassification
+from transformers import XLNetTokenizer, XLNetTokenizerFast, XLNetForSequenceClassification, CLIPProcessor, \
+    CLIPModel, BertTokenizer, BertTokenizerFast, BertForSequenceClassification
 from keras.models import load_model
 from keras.preprocessing import image as keras_image
 import torch
@@ -9,11 +9,11 @@ from PIL import Image
 import requests
 from io import BytesIO
 
-BASE_DIR = os.path.dirname(__file__)
-
-BERT_MODEL_PATH = f"{BASE_DIR}/final_bert_model"
-VGG_MODEL_PATH = f"{BASE_DIR}/x_image_classification_model.keras"
-XLNET_MODEL_PATH = f"{BASE_DIR}/final_model"
+from app.config import Config
+from .model_paths import BERT_MODEL_PATH, VGG_MODEL_PATH, XLNET_MODEL_PATH, CLIP_MODEL_NAME
+from .tokenization import load_tokenizer
+from .quantization import quantize_text_model
+from .metrics import timed
 
 
 if not os.path.exists(XLNET_MODEL_PATH):
@@ -28,15 +28,21 @@ if not os.path.exists(VGG_MODEL_PATH):
 
 class TextModels:
     device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-    xlnet_text_tokenizer = XLNetTokenizer.from_pretrained(XLNET_MODEL_PATH)
+    xlnet_text_tokenizer = load_tokenizer(XLNetTokenizerFast, XLNetTokenizer, XLNET_MODEL_PATH,
+                                          use_fast=Config.USE_FAST_TOKENIZERS)
     xlnet_text_model = XLNetForSequenceClassification.from_pretrained(XLNET_MODEL_PATH)
     xlnet_text_model.eval()
     xlnet_text_model.to(device)
+    if 'xlnet' in Config.QUANTIZED_TEXT_MODELS:
+        xlnet_text_model = quantize_text_model(xlnet_text_model)
 
-    bert_text_tokenizer = BertTokenizer.from_pretrained(BERT_MODEL_PATH)
+    bert_text_tokenizer = load_tokenizer(BertTokenizerFast, BertTokenizer, BERT_MODEL_PATH,
+                                         use_fast=Config.USE_FAST_TOKENIZERS)
     bert_text_model = BertForSequenceClassification.from_pretrained(BERT_MODEL_PATH)
     bert_text_model.eval()
     bert_text_model.to(device)
+    if 'bert' in Config.QUANTIZED_TEXT_MODELS:
+        bert_text_model = quantize_text_model(bert_text_model)
 
 
 class ImageModels:
@@ -44,8 +50,8 @@ class ImageModels:
     try:
         vgg16_image_model = load_model(VGG_MODEL_PATH)
         print("✓ VGG16 image model loaded successfully")
-        clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
-        clip_model_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+        clip_model = CLIPModel.from_pretrained(CLIP_MODEL_NAME)
+        clip_model_processor = CLIPProcessor.from_pretrained(CLIP_MODEL_NAME)
         print("✓ CLIP model loaded from local cache")
         clip_model.eval()
     except Exception as e:
@@ -143,14 +149,16 @@ def analyze_with_vgg16(image_url, image_models):
     """Analyze image using VGG16 model"""
     try:
         # Load and preprocess image
-        response = requests.get(image_url)
+        with timed('image_download', 'vgg16'):
+            response = requests.get(image_url)
         img = Image.open(BytesIO(response.content))
         img = img.resize((224, 224))
         img_array = np.array(img) / 255.0
         img_array = np.expand_dims(img_array, axis=0)
         
         # Predict using VGG16
-        prediction = image_models.vgg16_image_model.predict(img_array)
+        with timed('image_predict', 'vgg16'):
+            prediction = image_models.vgg16_image_model.predict(img_array)
         
         return {
             'radical': float(prediction[0][0]),
@@ -165,7 +173,8 @@ def analyze_with_clip(image_url, image_models):
     """Analyze image using CLIP model"""
     try:
         # Load and preprocess image
-        response = requests.get(image_url)
+        with timed('image_download', 'clip'):
+            response = requests.get(image_url)
         img = Image.open(BytesIO(response.content))
         
         # Process with CLIP
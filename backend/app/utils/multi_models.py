@@ -1,29 +1,91 @@
 import os
+import time
 import numpy as np
 import torch
 import concurrent.futures
 from typing import List, Optional
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler
-import joblib
 from transformers import XLNetTokenizer, XLNetForSequenceClassification, CLIPProcessor, CLIPModel
 
+from app.config import Config
+from .batching import batched_predict_items
+from .cascade import plan_stages, run_cascade
+from .fusion_engine import FUSION_TECHNIQUES, ModelOutputs, get_fusion_engine
+from . import tracing
+from .metrics import observe_since, timed
 from .text_classification import TextClassifier
 from .image_classification import ImageClassifier
 
 target_names = ['Non-Radical', 'Political', 'Radical']
 
 
+def _executor():
+    """Threads when micro-batching (they share the in-process batchers), otherwise one process per model"""
+    if Config.MICRO_BATCHING:
+        return concurrent.futures.ThreadPoolExecutor()
+    return concurrent.futures.ProcessPoolExecutor()
+
+
 def _predict_text(model_name, texts):
+    if Config.MICRO_BATCHING and texts:
+        return np.mean(_predict_text_items(model_name, texts), axis=0)
     model = TextClassifier(model_name=model_name)
     return model.predict(texts)
 
 
 def _predict_image(model_name, images):
+    if Config.MICRO_BATCHING and images:
+        return np.mean(_predict_image_items(model_name, images), axis=0)
     model = ImageClassifier(model_name=model_name)
     return model.predict(images)
 
 
+def _predict_text_items(model_name, texts):
+    if Config.MICRO_BATCHING:
+        return batched_predict_items('text', model_name, texts)
+    return TextClassifier(model_name=model_name).predict_items(texts)
+
+
+def _predict_image_items(model_name, images):
+    if Config.MICRO_BATCHING:
+        return batched_predict_items('image', model_name, images)
+    return ImageClassifier(model_name=model_name).predict_items(images)
+
+
+def predict_model_items(kind, model_name, items):
+    """Per-item probabilities from one text or image model, shape (len(items), 3)"""
+    if kind == 'text':
+        return _predict_text_items(model_name, items)
+    return _predict_image_items(model_name, items)
+
+
+def _text_cascade(stages, texts, margin_threshold):
+    return run_cascade(texts, stages, _predict_text_items, margin_threshold)
+
+
+def _image_cascade(stages, images, margin_threshold):
+    return run_cascade(images, stages, _predict_image_items, margin_threshold)
+
+
+def _submit(executor, predict, kind, model_name, items, precomputed=None):
+    """Future for one model's mean probabilities, already resolved when ``precomputed`` has them"""
+    outputs = (precomputed or {}).get(kind, {})
+    if model_name in outputs:
+        future = concurrent.futures.Future()
+        future.set_result(np.asarray(outputs[model_name]))
+        return future
+
+    # Timed here rather than only in the classifiers, whose metrics stay in the worker process
+    start, parent = time.perf_counter(), tracing.capture()
+
+    def _done(_):
+        observe_since('model_call', start, model_name)
+        tracing.record_span(parent, 'model_call', start, detail=model_name, items=len(items))
+
+    future = executor.submit(predict, model_name, items)
+    future.add_done_callback(_done)
+    return future
+
+
 def format_results(final_probs):
     label_idx = np.argmax(final_probs)
     dominant_label = target_names[label_idx]
@@ -58,6 +120,53 @@ def add_content_stats(result, texts=None, images=None):
     return result
 
 
+def compute_model_outputs(
+        text_model_names: List[str],
+        image_model_names: List[str],
+        texts: Optional[List[str]] = None,
+        images: Optional[List[str]] = None,
+        precomputed: Optional[dict] = None
+) -> ModelOutputs:
+    """Run every base model once (in parallel, reusing ``precomputed`` means) for one user"""
+    text_outputs, image_outputs = {}, {}
+    with _executor() as executor:
+        text_futures = {
+            name: _submit(executor, _predict_text, 'text', name, texts, precomputed)
+            for name in (text_model_names if texts else [])
+        }
+        image_futures = {
+            name: _submit(executor, _predict_image, 'image', name, images, precomputed)
+            for name in (image_model_names if images else [])
+        }
+        for name, future in text_futures.items():
+            text_outputs[name] = future.result()
+        for name, future in image_futures.items():
+            image_outputs[name] = future.result()
+
+    return ModelOutputs.from_user(text_outputs, image_outputs, text_model_names, image_model_names,
+                                  len(texts or []), len(images or []))
+
+
+def fusion_result(technique, outputs: ModelOutputs, texts=None, images=None, alpha=0.5, engine=None):
+    """Formatted result of one fusion technique for a single-user ModelOutputs"""
+    engine = engine or get_fusion_engine()
+    with timed('fusion', technique):
+        final_probs, extras = engine.fuse(technique, outputs, alpha)
+    result = format_results(final_probs[0])
+    result["fusion_version"] = engine.version
+    if technique == 'attention':
+        result["modality_weights"] = {
+            "text_weight": float(extras['text_weight'][0]),
+            "image_weight": float(extras['image_weight'][0])
+        }
+    elif technique == 'learned_weights':
+        result["fusion_weights"] = {
+            "text_weight": float(extras['text_weight'][0]),
+            "image_weight": float(extras['image_weight'][0])
+        }
+    return add_content_stats(result, texts, images)
+
+
 # 1. Simple Weighted Average
 def predict_multimodal(
         text_model_names=['vgg16'],
@@ -65,328 +174,126 @@ def predict_multimodal(
         texts: Optional[List[str]] = None,
         images: Optional[List[str]] = None,
         alpha=0.5,
-        username="user"
+        username="user",
+        precomputed=None
 ):
-    text_output = np.zeros(3)
-    image_output = np.zeros(3)
-
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        text_futures = [
-            executor.submit(_predict_text, name, texts)
-            for name in text_model_names
-        ]
-        for future in concurrent.futures.as_completed(text_futures):
-            text_output += future.result()
-        image_futures = [
-            executor.submit(_predict_image, name, images)
-            for name in image_model_names
-        ]
-        for future in concurrent.futures.as_completed(image_futures):
-            image_output += future.result()
-
-    text_probs = text_output / len(text_model_names)
-    image_probs = image_output / len(image_model_names)
-
-    final_probs = alpha * text_probs + (1 - alpha) * image_probs
-
-    result = format_results(final_probs)
-    return add_content_stats(result, texts, images)
+    outputs = compute_model_outputs(text_model_names, image_model_names, texts, images, precomputed)
+    return fusion_result('weighted_average', outputs, texts, images, alpha)
 
 
 # 2. Feature-Level Fusion
-class FeatureFusionModel:
-    def __init__(self, model_path="fusion_model.pkl"):
-        self.base_path = os.path.dirname(__file__)
-        self.model_path = os.path.join(self.base_path, model_path)
-        self.model = self._load_model() if os.path.exists(self.model_path) else None
-        self.feature_scaler = self._load_scaler() if os.path.exists(
-            self.base_path + "/feature_scaler.pkl") else StandardScaler()
-
-    def _load_model(self):
-        try:
-            return joblib.load(self.model_path)
-        except:
-            # Fallback model if saved one doesn't exist
-            return LogisticRegression(max_iter=1000)
-
-    def _load_scaler(self):
-        try:
-            return joblib.load(self.base_path + "/feature_scaler.pkl")
-        except:
-            return StandardScaler()
-
-    def predict(self, features):
-        if self.model is None:
-            # Fallback to softmax if no model exists
-            exp_scores = np.exp(features)
-            return exp_scores / np.sum(exp_scores, axis=1, keepdims=True)
-
-        scaled_features = self.feature_scaler.transform(features)
-        return self.model.predict_proba(scaled_features)
-
-
 def predict_multimodal_feature_fusion(
         text_model_names=['xlnet', 'bert'],
         image_model_names=['vgg16', 'clip'],
         texts: Optional[List[str]] = None,
         images: Optional[List[str]] = None,
-        username="user"
+        username="user",
+        precomputed=None
 ):
-    text_features = np.zeros((1, 768 * len(text_model_names))) if texts else np.zeros((1, 768 * len(text_model_names)))
-    image_features = np.zeros((1, 512 * len(image_model_names))) if images else np.zeros(
-        (1, 512 * len(image_model_names)))
-
-    text_preds = np.zeros(3)
-    image_preds = np.zeros(3)
-
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        if texts:
-            text_futures = [
-                executor.submit(_predict_text, name, texts)
-                for name in text_model_names
-            ]
-            for future in concurrent.futures.as_completed(text_futures):
-                text_preds += future.result()
-
-        if images:
-            image_futures = [
-                executor.submit(_predict_image, name, images)
-                for name in image_model_names
-            ]
-            for future in concurrent.futures.as_completed(image_futures):
-                image_preds += future.result()
-
-    if texts:
-        text_preds = text_preds / len(text_model_names)
-    if images:
-        image_preds = image_preds / len(image_model_names)
-
-    combined_features = np.concatenate([
-        text_preds.reshape(1, -1) if texts else np.zeros((1, 3)),
-        image_preds.reshape(1, -1) if images else np.zeros((1, 3))
-    ], axis=1)
-
-    fusion_model = FeatureFusionModel()
-    final_probs = fusion_model.predict(combined_features)[0]
-
-    result = format_results(final_probs)
-    return add_content_stats(result, texts, images)
+    outputs = compute_model_outputs(text_model_names, image_model_names, texts, images, precomputed)
+    return fusion_result('feature_fusion', outputs, texts, images)
 
 
 # 3. Attention-Based Fusion
-class AttentionFusionModel:
-    def __init__(self, input_dim=6):
-        self.attention_weights = np.array([0.6, 0.4])  # Default: text weight, image weight
-
-    def calculate_attention(self, text_confidence, image_confidence):
-        text_conf = np.max(text_confidence)
-        image_conf = np.max(image_confidence)
-
-        total_conf = text_conf + image_conf
-        if total_conf > 0:
-            text_weight = text_conf / total_conf
-            image_weight = image_conf / total_conf
-        else:
-            text_weight = 0.5
-            image_weight = 0.5
-
-        return np.array([text_weight, image_weight])
-
-
 def predict_multimodal_attention(
         text_model_names=['xlnet', 'bert'],
         image_model_names=['vgg16', 'clip'],
         texts: Optional[List[str]] = None,
         images: Optional[List[str]] = None,
-        username="user"
+        username="user",
+        precomputed=None
 ):
-    text_output = np.zeros(3)
-    image_output = np.zeros(3)
-
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        text_futures = []
-        if texts:
-            text_futures = [
-                executor.submit(_predict_text, name, texts)
-                for name in text_model_names
-            ]
-
-        image_futures = []
-        if images:
-            image_futures = [
-                executor.submit(_predict_image, name, images)
-                for name in image_model_names
-            ]
-        for future in concurrent.futures.as_completed(text_futures):
-            text_output += future.result()
-
-        for future in concurrent.futures.as_completed(image_futures):
-            image_output += future.result()
-
-    text_probs = text_output / max(1, len(text_model_names))
-    image_probs = image_output / max(1, len(image_model_names))
-
-    attention_model = AttentionFusionModel()
-
-    if texts is None or len(texts) == 0:
-        attention_weights = np.array([0, 1])
-    elif images is None or len(images) == 0:
-        attention_weights = np.array([1, 0])
-    else:
-        attention_weights = attention_model.calculate_attention(text_probs, image_probs)
-
-    final_probs = attention_weights[0] * text_probs + attention_weights[1] * image_probs
-
-    result = format_results(final_probs)
-    result["modality_weights"] = {
-        "text_weight": float(attention_weights[0]),
-        "image_weight": float(attention_weights[1])
-    }
-
-    return add_content_stats(result, texts, images)
+    outputs = compute_model_outputs(text_model_names, image_model_names, texts, images, precomputed)
+    return fusion_result('attention', outputs, texts, images)
 
 
 # 4. Model Stacking
-class MetaClassifier:
-    def __init__(self, model_path="meta_classifier.pkl"):
-        self.base_path = os.path.dirname(__file__)
-        self.model_path = os.path.join(self.base_path, model_path)
-
-        try:
-            self.model = joblib.load(self.model_path)
-            self.using_pretrained = True
-        except:
-            self.model = None
-            self.using_pretrained = False
-
-    def predict(self, features):
-        if self.model is None or not self.using_pretrained:
-            num_models = features.shape[1] // 3
-            reshaped = features.reshape(-1, num_models, 3)
-            return np.mean(reshaped, axis=1)
-
-        return self.model.predict_proba(features)
-
-
 def predict_multimodal_stacking(
         text_model_names=['xlnet', 'bert'],
         image_model_names=['vgg16', 'clip'],
         texts: Optional[List[str]] = None,
         images: Optional[List[str]] = None,
-        username="user"
+        username="user",
+        precomputed=None
 ):
-    all_model_outputs = []
-
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        text_futures = []
-        if texts:
-            text_futures = [
-                executor.submit(_predict_text, name, texts)
-                for name in text_model_names
-            ]
-
-        image_futures = []
-        if images:
-            image_futures = [
-                executor.submit(_predict_image, name, images)
-                for name in image_model_names
-            ]
-
-        for future in concurrent.futures.as_completed(text_futures):
-            all_model_outputs.append(future.result())
-
-        for future in concurrent.futures.as_completed(image_futures):
-            all_model_outputs.append(future.result())
-
-    if not all_model_outputs:
-        default_probs = np.array([0.33, 0.33, 0.34])  # Default to balanced probabilities
-        result = format_results(default_probs)
-        return add_content_stats(result, texts, images)
-
-    meta_features = np.hstack([output.reshape(1, -1) for output in all_model_outputs])
-
-    meta_clf = MetaClassifier()
-    final_probs = meta_clf.predict(meta_features)[0]
-
-    result = format_results(final_probs)
-    return add_content_stats(result, texts, images)
+    outputs = compute_model_outputs(text_model_names, image_model_names, texts, images, precomputed)
+    return fusion_result('stacking', outputs, texts, images)
 
 
 # 5. Late Fusion with Learned Weights
-class LearnedWeightsFusionModel:
-    def __init__(self, model_path="fusion_weights.pkl"):
-        self.base_path = os.path.dirname(__file__)
-        self.model_path = os.path.join(self.base_path, model_path)
-
-        self.text_weight = 0.5
-        self.image_weight = 0.5
-        self.bias = np.zeros(3)
-
-        try:
-            weights = joblib.load(self.model_path)
-            self.text_weight = weights['text_weight']
-            self.image_weight = weights['image_weight']
-            self.bias = weights.get('bias', np.zeros(3))
-        except:
-            pass
-
-    def predict(self, text_preds, image_preds):
-        return self.text_weight * text_preds + self.image_weight * image_preds + self.bias
+def predict_multimodal_learned_weights(
+        text_model_names=['xlnet', 'bert'],
+        image_model_names=['vgg16', 'clip'],
+        texts: Optional[List[str]] = None,
+        images: Optional[List[str]] = None,
+        username="user",
+        precomputed=None
+):
+    outputs = compute_model_outputs(text_model_names, image_model_names, texts, images, precomputed)
+    return fusion_result('learned_weights', outputs, texts, images)
 
 
-def predict_multimodal_learned_weights(
+# All techniques from one inference pass
+def predict_multimodal_compare(
         text_model_names=['xlnet', 'bert'],
         image_model_names=['vgg16', 'clip'],
         texts: Optional[List[str]] = None,
         images: Optional[List[str]] = None,
+        alpha=0.5,
+        username="user",
+        precomputed=None
+):
+    outputs = compute_model_outputs(text_model_names, image_model_names, texts, images, precomputed)
+    engine = get_fusion_engine()  # every technique from the same artifact version
+    result = {
+        "techniques": {
+            technique: fusion_result(technique, outputs, texts, images, alpha, engine)
+            for technique in FUSION_TECHNIQUES
+        },
+        "fusion_version": engine.version
+    }
+    return add_content_stats(result, texts, images)
+
+
+# 6. Early-Exit Cascade
+def predict_multimodal_cascade(
+        texts: Optional[List[str]] = None,
+        images: Optional[List[str]] = None,
+        text_model_names: Optional[List[str]] = None,
+        image_model_names: Optional[List[str]] = None,
+        margin_threshold: Optional[float] = None,
+        alpha=0.5,
         username="user"
 ):
-    text_output = np.zeros(3)
-    image_output = np.zeros(3)
-
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        text_futures = []
-        if texts:
-            text_futures = [
-                executor.submit(_predict_text, name, texts)
-                for name in text_model_names
-            ]
-
-        image_futures = []
-        if images:
-            image_futures = [
-                executor.submit(_predict_image, name, images)
-                for name in image_model_names
-            ]
-
-        for future in concurrent.futures.as_completed(text_futures):
-            text_output += future.result()
-
-        for future in concurrent.futures.as_completed(image_futures):
-            image_output += future.result()
-
-    text_probs = text_output / max(1, len(text_model_names))
-    image_probs = image_output / max(1, len(image_model_names))
-
-    if texts is None or len(texts) == 0:
-        text_probs = np.zeros(3)
-    if images is None or len(images) == 0:
-        image_probs = np.zeros(3)
-
-    fusion_model = LearnedWeightsFusionModel()
-    final_probs = fusion_model.predict(text_probs, image_probs)
-
-    if np.sum(final_probs) <= 0:
-        final_probs = np.array([0.33, 0.33, 0.34])
+    """Early exit: the configured cheap stage, then the requested models (all configured ones when None)"""
+    text_stages = plan_stages(Config.CASCADE_TEXT_STAGES if text_model_names is None else text_model_names,
+                              Config.CASCADE_TEXT_STAGES)
+    image_stages = plan_stages(Config.CASCADE_IMAGE_STAGES if image_model_names is None else image_model_names,
+                               Config.CASCADE_IMAGE_STAGES)
+    if margin_threshold is None:
+        margin_threshold = Config.CASCADE_MARGIN_THRESHOLD
+
+    cascade_stats = {"margin_threshold": float(margin_threshold)}
+    modality_probs = {}
+
+    with timed('cascade'), _executor() as executor:
+        futures = {}
+        if texts and text_stages:
+            futures['text'] = executor.submit(_text_cascade, text_stages, texts, margin_threshold)
+        if images and image_stages:
+            futures['image'] = executor.submit(_image_cascade, image_stages, images, margin_threshold)
+        for modality, future in futures.items():
+            item_probs, stats = future.result()
+            modality_probs[modality] = item_probs.mean(axis=0)
+            cascade_stats[modality] = stats
+
+    if 'text' in modality_probs and 'image' in modality_probs:
+        final_probs = alpha * modality_probs['text'] + (1 - alpha) * modality_probs['image']
     else:
-        final_probs = final_probs / np.sum(final_probs)
+        final_probs = next(iter(modality_probs.values()), np.full(3, 1 / 3))  # neutral when no model ran
 
     result = format_results(final_probs)
-    result["fusion_weights"] = {
-        "text_weight": float(fusion_model.text_weight),
-        "image_weight": float(fusion_model.image_weight)
-    }
-
+    result["cascade"] = cascade_stats
     return add_content_stats(result, texts, images)
 
 
@@ -395,9 +302,11 @@ def multimodal_predict(
         images: Optional[List[str]] = None,
         text_models: List[str] = ['xlnet', 'bert'],
         image_models: List[str] = ['vgg16', 'clip'],
-        fusion_technique: str = 'weighted_average',
-        alpha: float = 0.5,  # Only used for weighted_average
-        username: str = "user"
+        fusion_technique: str = 'weighted_average',  # or 'all' to compare every technique
+        alpha: float = 0.5,  # Only used for weighted_average and cascade
+        username: str = "user",
+        cascade_threshold: Optional[float] = None,  # Only used for cascade
+        precomputed: Optional[dict] = None  # {'text'|'image': {model_name: mean probabilities}} to reuse
 ):
     if not texts and not images:
         return {
@@ -415,7 +324,8 @@ def multimodal_predict(
             texts=texts,
             images=images,
             alpha=alpha,
-            username=username
+            username=username,
+            precomputed=precomputed
         )
     elif fusion_technique == 'feature_fusion':
         return predict_multimodal_feature_fusion(
@@ -423,7 +333,8 @@ def multimodal_predict(
             image_model_names=image_models,
             texts=texts,
             images=images,
-            username=username
+            username=username,
+            precomputed=precomputed
         )
     elif fusion_technique == 'attention':
         return predict_multimodal_attention(
@@ -431,7 +342,8 @@ def multimodal_predict(
             image_model_names=image_models,
             texts=texts,
             images=images,
-            username=username
+            username=username,
+            precomputed=precomputed
         )
     elif fusion_technique == 'stacking':
         return predict_multimodal_stacking(
@@ -439,6 +351,27 @@ def multimodal_predict(
             image_model_names=image_models,
             texts=texts,
             images=images,
+            username=username,
+            precomputed=precomputed
+        )
+    elif fusion_technique == 'all':
+        return predict_multimodal_compare(
+            text_model_names=text_models,
+            image_model_names=image_models,
+            texts=texts,
+            images=images,
+            alpha=alpha,
+            username=username,
+            precomputed=precomputed
+        )
+    elif fusion_technique == 'cascade':
+        return predict_multimodal_cascade(
+            texts=texts,
+            images=images,
+            text_model_names=text_models,
+            image_model_names=image_models,
+            margin_threshold=cascade_threshold,
+            alpha=alpha,
             username=username
         )
     elif fusion_technique == 'learned_weights':
@@ -447,7 +380,8 @@ def multimodal_predict(
             image_model_names=image_models,
             texts=texts,
             images=images,
-            username=username
+            username=username,
+            precomputed=precomputed
         )
     else:
         # Default to weighted average if invalid technique specified
@@ -457,5 +391,6 @@ def multimodal_predict(
             texts=texts,
             images=images,
             alpha=alpha,
-            username=username
+            username=username,
+            precomputed=precomputed
         )
\ No newline at end of file
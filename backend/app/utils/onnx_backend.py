@@ -0,0 +1,99 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+import onnxruntime as ort
+
+from app.config import Config
+from .model_paths import CLIP_PROCESSOR_PATH, CLIP_TEXT_EMBEDDINGS_PATH, CLIP_TEXT_LABELS, ONNX_MODEL_PATHS
+
+logger = logging.getLogger(__name__)
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    'disable': ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    'basic': ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    'extended': ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    'all': ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+}
+
+
+def session_options() -> ort.SessionOptions:
+    """Thread counts and graph optimization level from the config"""
+    options = ort.SessionOptions()
+    options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS.get(
+        Config.ONNX_GRAPH_OPTIMIZATION, ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    )
+    if Config.ONNX_INTRA_OP_THREADS:
+        options.intra_op_num_threads = Config.ONNX_INTRA_OP_THREADS
+    if Config.ONNX_INTER_OP_THREADS:
+        options.inter_op_num_threads = Config.ONNX_INTER_OP_THREADS
+        options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    return options
+
+
+def available_providers() -> List[str]:
+    """Configured execution providers that this onnxruntime build supports"""
+    available = set(ort.get_available_providers())
+    providers = [name for name in Config.ONNX_PROVIDERS if name in available]
+    skipped = [name for name in Config.ONNX_PROVIDERS if name not in available]
+    if skipped:
+        logger.warning(f"ONNX Runtime providers not available, skipping: {', '.join(skipped)}")
+    return providers or ['CPUExecutionProvider']
+
+
+class OnnxModel:
+    """An ONNX Runtime session with a single output"""
+
+    def __init__(self, path: str, use_io_binding: bool = True):
+        self.path = path
+        self.session = ort.InferenceSession(path, sess_options=session_options(), providers=available_providers())
+        self.input_names = [node.name for node in self.session.get_inputs()]
+        self.output_name = self.session.get_outputs()[0].name
+        self.use_io_binding = use_io_binding
+        self.output_device = 'cuda' if 'CUDAExecutionProvider' in self.session.get_providers() else 'cpu'
+
+    def run(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Run the graph; inputs it does not declare (e.g. token_type_ids) are ignored"""
+        feeds = {name: np.ascontiguousarray(inputs[name]) for name in self.input_names}
+        if not self.use_io_binding:
+            return self.session.run([self.output_name], feeds)[0]
+
+        binding = self.session.io_binding()
+        for name, value in feeds.items():
+            binding.bind_cpu_input(name, value)
+        binding.bind_output(self.output_name, self.output_device)
+        self.session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()[0]
+
+
+@lru_cache(maxsize=None)
+def get_onnx_model(model_name: str) -> OnnxModel:
+    """Shared session for one exported model"""
+    path = ONNX_MODEL_PATHS[model_name]
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"ONNX model not found: {path} (run export_onnx.py first)")
+    model = OnnxModel(path, use_io_binding=Config.ONNX_USE_IO_BINDING)
+    logger.info(f"Loaded ONNX model {model_name} with providers {model.session.get_providers()}")
+    return model
+
+
+@lru_cache(maxsize=1)
+def load_clip_text_embeddings() -> Tuple[np.ndarray, float]:
+    """Normalized CLIP prompt embeddings and the logit scale saved at export time"""
+    with np.load(CLIP_TEXT_EMBEDDINGS_PATH) as saved:
+        if list(saved['labels']) != CLIP_TEXT_LABELS:
+            raise ValueError("CLIP prompts changed since the ONNX export; re-run export_onnx.py --models clip")
+        return saved['text_embeds'], float(saved['logit_scale'])
+
+
+@lru_cache(maxsize=1)
+def get_clip_image_processor():
+    from transformers import CLIPImageProcessor
+    return CLIPImageProcessor.from_pretrained(CLIP_PROCESSOR_PATH)
+
+
+def softmax(logits: np.ndarray, axis: int = -1) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=axis, keepdims=True))
+    return exp / exp.sum(axis=axis, keepdims=True)
@@ -0,0 +1,127 @@
+import cProfile
+import itertools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_sequence = itertools.count()
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def fold_stack(frame) -> str:
+    """Root-first "a;b;c" stack of ``frame``, the folded format of flamegraph.pl and speedscope"""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    """Samples one thread's stack every ``interval`` seconds from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[fold_stack(frame)] += 1
+
+
+class RequestProfile:
+    """Sampler (and optionally cProfile) running over one request's thread"""
+
+    def __init__(self, endpoint: str, interval: float, use_cprofile: bool):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.sampler = StackSampler(threading.get_ident(), interval).start()
+        self.profiler: Optional[cProfile.Profile] = None
+        if use_cprofile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError as e:  # another profiler is already active on this thread
+                logger.warning(f"cProfile unavailable for {endpoint}: {e}")
+
+    def finish(self, directory: str) -> str:
+        """Write the request's files and append its stacks to the endpoint's aggregate; returns the file prefix"""
+        if self.profiler is not None:
+            self.profiler.disable()
+        stacks = self.sampler.stop()
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+
+        os.makedirs(directory, exist_ok=True)
+        prefix = os.path.join(directory, f'{self.endpoint}-{int(time.time() * 1000)}-{os.getpid()}-{next(_sequence)}')
+        if self.profiler is not None:
+            self.profiler.dump_stats(f'{prefix}.prof')
+        lines = ''.join(f'{stack} {count}\n' for stack, count in stacks.items())
+        with open(f'{prefix}.folded', 'w') as f:
+            f.write(lines)
+        # Appends from every worker process; flame graph tools sum repeated stacks
+        with open(os.path.join(directory, f'{self.endpoint}.folded'), 'a') as f:
+            f.write(lines)
+
+        logger.info(f"Profiled {self.endpoint} ({elapsed_ms:.0f}ms, {sum(stacks.values())} samples) -> {prefix}")
+        return prefix
+
+
+def init_app(app):
+    """
+    Profile a PROFILE_SAMPLE_RATE fraction of requests to PROFILE_ENDPOINTS.
+    Each profiled request writes <endpoint>-<time>-<pid>-<n>.folded (plus .prof
+    with PROFILE_CPROFILE) to PROFILE_DIR and appends its stacks to
+    <endpoint>.folded, the aggregate to feed to flamegraph.pl or speedscope.
+    """
+    rate = app.config.get('PROFILE_SAMPLE_RATE', 0)
+    if rate <= 0:
+        return
+
+    from flask import g, request
+
+    endpoints = set(app.config.get('PROFILE_ENDPOINTS', ()))
+    directory = app.config.get('PROFILE_DIR', os.path.join('instance', 'profiles'))
+    interval = app.config.get('PROFILE_INTERVAL_MS', 5) / 1000
+    use_cprofile = app.config.get('PROFILE_CPROFILE', False)
+    logger.info(f"Profiling {rate:.0%} of requests to {', '.join(sorted(endpoints))} into {directory}")
+
+    @app.before_request
+    def _start_profile():
+        name = (request.endpoint or '').rsplit('.', 1)[-1]
+        if name in endpoints and random.random() < rate:
+            g.request_profile = RequestProfile(name, interval, use_cprofile)
+
+    @app.teardown_request
+    def _finish_profile(exc):
+        profile = g.pop('request_profile', None)
+        if profile is not None:
+            try:
+                profile.finish(directory)
+            except OSError as e:
+                logger.warning(f"Could not write profile for {profile.endpoint}: {e}")
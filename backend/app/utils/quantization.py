@@ -0,0 +1,29 @@
+import io
+import logging
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def quantize_text_model(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    INT8 dynamic quantization of the Linear layers for CPU inference.
+
+    Weights are stored as int8 and activations are quantized on the fly, so no
+    calibration data is needed. CUDA models are returned unchanged.
+    """
+    if next(model.parameters()).device.type != 'cpu':
+        logger.warning("Dynamic quantization only runs on CPU; keeping the fp32 model")
+        return model
+
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+
+def model_size_bytes(model: torch.nn.Module) -> int:
+    """Serialized state_dict size, a proxy for the model's weight memory"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes
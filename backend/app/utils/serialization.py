@@ -0,0 +1,138 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Cache blob header: magic byte, codec, compression
+BLOB_MAGIC = b'\x00'
+CODEC_JSON = b'j'
+CODEC_MSGPACK = b'm'
+COMPRESSION_NONE = b'-'
+COMPRESSION_ZSTD = b'z'
+
+
+def _default(obj: Any) -> Any:
+    """Convert values the JSON/msgpack encoders don't handle natively"""
+    if np is not None:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, default=_default, sort_keys=sort_keys, ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by :func:`dumps` / :func:`loads`"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            kwargs.setdefault('default', _default)
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            dumps(obj, sort_keys=self.sort_keys) + b'\n',
+            mimetype=self.mimetype
+        )
+
+
+def pack_blob(obj: Any, codec: str = 'json', compress_threshold: int = 0,
+              compression_level: int = 3) -> Optional[bytes]:
+    """
+    Encode a value for storage in a cache column.
+
+    ``codec`` is ``'json'`` or ``'msgpack'`` (falls back to JSON when msgpack
+    is missing). Payloads of at least ``compress_threshold`` bytes are
+    zstd-compressed when zstandard is installed; 0 disables compression.
+    """
+    if obj is None:
+        return None
+
+    if codec == 'msgpack' and msgpack is not None:
+        codec_tag = CODEC_MSGPACK
+        payload = msgpack.packb(obj, default=_default, use_bin_type=True)
+    else:
+        codec_tag = CODEC_JSON
+        payload = dumps(obj)
+
+    compression_tag = COMPRESSION_NONE
+    if zstandard is not None and compress_threshold and len(payload) >= compress_threshold:
+        payload = zstandard.ZstdCompressor(level=compression_level).compress(payload)
+        compression_tag = COMPRESSION_ZSTD
+
+    return BLOB_MAGIC + codec_tag + compression_tag + payload
+
+
+def unpack_blob(blob: Union[bytes, str, None]) -> Any:
+    """Decode a value written by :func:`pack_blob` or a legacy JSON text column"""
+    if blob is None:
+        return None
+    if isinstance(blob, str):
+        return loads(blob)
+    if not blob.startswith(BLOB_MAGIC):
+        return loads(blob)
+
+    codec_tag, compression_tag, payload = blob[1:2], blob[2:3], blob[3:]
+
+    if compression_tag == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Cache blob is zstd-compressed but zstandard is not installed")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+
+    if codec_tag == CODEC_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("Cache blob is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return loads(payload)
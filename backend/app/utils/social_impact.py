@@ -1,20 +1,30 @@
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import numpy as np
+from app.utils.analysis_context import AnalysisContext
 
-def calculate_social_impact(text_analysis: Dict, user_data: Dict) -> Dict:
+TextAnalysis = Union[Dict, AnalysisContext]
+
+PROTECTED_GROUPS = [
+    'women', 'people_of_color', 'lgbtq', 'disabilities', 'religious_minorities', 'economic_disadvantaged'
+]
+SUPPORTED_GROUPS = ['women', 'people_of_color', 'lgbtq', 'disabilities']
+
+def calculate_social_impact(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """
     Calculate social justice impact metrics from analysis results
     """
     try:
+        context = AnalysisContext.ensure(text_analysis)
+        
         # Analyze protected groups representation
-        protected_groups = analyze_protected_groups(text_analysis, user_data)
+        protected_groups = analyze_protected_groups(context, user_data)
         
         # Calculate social justice score
-        social_justice_score = calculate_social_justice_score(text_analysis, user_data)
+        social_justice_score = calculate_social_justice_score(context, user_data)
         
         # Calculate community impact
-        community_impact = calculate_community_impact(text_analysis, user_data)
+        community_impact = calculate_community_impact(context, user_data)
         
         return {
             'marginalized_groups': protected_groups,
@@ -26,29 +36,14 @@ def calculate_social_impact(text_analysis: Dict, user_data: Dict) -> Dict:
         logging.error(f"Error in social impact calculation: {str(e)}")
         return get_default_social_impact()
 
-def analyze_protected_groups(text_analysis: Dict, user_data: Dict) -> Dict:
+def analyze_protected_groups(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Analyze representation of protected groups"""
     try:
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
+        # Protected group keywords live in KEYWORD_CATEGORIES ('protected.<group>')
+        counts = AnalysisContext.ensure(text_analysis).keyword_counts
         
-        # Define protected groups and their keywords
-        protected_groups = {
-            'women': ['woman', 'women', 'female', 'girl', 'she', 'her'],
-            'people_of_color': ['black', 'asian', 'hispanic', 'latino', 'african', 'minority'],
-            'lgbtq': ['lgbt', 'lgbtq', 'gay', 'lesbian', 'transgender', 'queer'],
-            'disabilities': ['disability', 'disabled', 'wheelchair', 'accessibility'],
-            'religious_minorities': ['muslim', 'jewish', 'hindu', 'buddhist', 'religious'],
-            'economic_disadvantaged': ['poor', 'poverty', 'low-income', 'affordable', 'economic']
-        }
-        
-        group_counts = {}
-        total_mentions = 0
-        
-        for group, keywords in protected_groups.items():
-            count = sum(text_content.count(keyword) for keyword in keywords)
-            group_counts[group] = count
-            total_mentions += count
+        group_counts = {group: counts[f'protected.{group}'] for group in PROTECTED_GROUPS}
+        total_mentions = sum(group_counts.values())
         
         # Calculate bias scores for each group
         bias_scores = {}
@@ -79,13 +74,14 @@ def analyze_protected_groups(text_analysis: Dict, user_data: Dict) -> Dict:
         logging.error(f"Error in protected groups analysis: {str(e)}")
         return get_default_protected_groups()
 
-def calculate_social_justice_score(text_analysis: Dict, user_data: Dict) -> Dict:
+def calculate_social_justice_score(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Calculate overall social justice score"""
     try:
         # Analyze various aspects of social justice
-        representation_score = calculate_representation_score(text_analysis, user_data)
-        fairness_score = calculate_fairness_score(text_analysis, user_data)
-        inclusivity_score = calculate_inclusivity_score(text_analysis, user_data)
+        context = AnalysisContext.ensure(text_analysis)
+        representation_score = calculate_representation_score(context, user_data)
+        fairness_score = calculate_fairness_score(context, user_data)
+        inclusivity_score = calculate_inclusivity_score(context, user_data)
         
         # Calculate overall score
         overall_score = np.mean([representation_score, fairness_score, inclusivity_score])
@@ -101,19 +97,11 @@ def calculate_social_justice_score(text_analysis: Dict, user_data: Dict) -> Dict
         logging.error(f"Error in social justice score calculation: {str(e)}")
         return get_default_social_justice_score()
 
-def calculate_representation_score(text_analysis: Dict, user_data: Dict) -> float:
+def calculate_representation_score(text_analysis: TextAnalysis, user_data: Dict) -> float:
     """Calculate representation score"""
     try:
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
-        
         # Count diverse representation indicators
-        diversity_indicators = [
-            'diversity', 'inclusive', 'representation', 'minority', 'marginalized',
-            'equality', 'equity', 'justice', 'rights', 'freedom'
-        ]
-        
-        diversity_count = sum(text_content.count(indicator) for indicator in diversity_indicators)
+        diversity_count = AnalysisContext.ensure(text_analysis).keyword_counts['representation']
         
         # Normalize score (0-1)
         max_expected = len(text_analysis.get('tweets', [])) * 0.1  # 10% of tweets might mention diversity
@@ -125,19 +113,11 @@ def calculate_representation_score(text_analysis: Dict, user_data: Dict) -> floa
         logging.error(f"Error in representation score calculation: {str(e)}")
         return 0.82  # Default score
 
-def calculate_fairness_score(text_analysis: Dict, user_data: Dict) -> float:
+def calculate_fairness_score(text_analysis: TextAnalysis, user_data: Dict) -> float:
     """Calculate fairness score"""
     try:
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
-        
         # Count fairness indicators
-        fairness_indicators = [
-            'fair', 'unfair', 'bias', 'discrimination', 'prejudice', 'stereotype',
-            'equal', 'unequal', 'justice', 'injustice', 'rights', 'freedom'
-        ]
-        
-        fairness_count = sum(text_content.count(indicator) for indicator in fairness_indicators)
+        fairness_count = AnalysisContext.ensure(text_analysis).keyword_counts['fairness']
         
         # Normalize score (0-1)
         max_expected = len(text_analysis.get('tweets', [])) * 0.15  # 15% of tweets might mention fairness
@@ -149,19 +129,11 @@ def calculate_fairness_score(text_analysis: Dict, user_data: Dict) -> float:
         logging.error(f"Error in fairness score calculation: {str(e)}")
         return 0.91  # Default score
 
-def calculate_inclusivity_score(text_analysis: Dict, user_data: Dict) -> float:
+def calculate_inclusivity_score(text_analysis: TextAnalysis, user_data: Dict) -> float:
     """Calculate inclusivity score"""
     try:
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
-        
         # Count inclusivity indicators
-        inclusivity_indicators = [
-            'inclusive', 'inclusion', 'welcome', 'accept', 'embrace', 'support',
-            'community', 'together', 'unity', 'solidarity', 'ally', 'advocate'
-        ]
-        
-        inclusivity_count = sum(text_content.count(indicator) for indicator in inclusivity_indicators)
+        inclusivity_count = AnalysisContext.ensure(text_analysis).keyword_counts['inclusivity']
         
         # Normalize score (0-1)
         max_expected = len(text_analysis.get('tweets', [])) * 0.12  # 12% of tweets might mention inclusivity
@@ -173,19 +145,13 @@ def calculate_inclusivity_score(text_analysis: Dict, user_data: Dict) -> float:
         logging.error(f"Error in inclusivity score calculation: {str(e)}")
         return 0.85  # Default score
 
-def calculate_community_impact(text_analysis: Dict, user_data: Dict) -> Dict:
+def calculate_community_impact(text_analysis: TextAnalysis, user_data: Dict) -> Dict:
     """Calculate community impact metrics"""
     try:
-        text_content = ' '.join([tweet.get('text', '') for tweet in text_analysis.get('tweets', [])])
-        text_content = text_content.lower()
+        counts = AnalysisContext.ensure(text_analysis).keyword_counts
         
         # Count positive intervention indicators
-        positive_indicators = [
-            'help', 'support', 'assist', 'aid', 'volunteer', 'donate',
-            'community', 'charity', 'nonprofit', 'foundation', 'initiative'
-        ]
-        
-        positive_count = sum(text_content.count(indicator) for indicator in positive_indicators)
+        positive_count = counts['community']
         
         # Calculate bias reduction (simplified)
         bias_reduction = min(positive_count * 0.05, 0.5)  # Max 50% reduction
@@ -193,8 +159,8 @@ def calculate_community_impact(text_analysis: Dict, user_data: Dict) -> Dict:
         return {
             'positive_interventions': positive_count,
             'bias_reduction': bias_reduction,
-            'protected_groups_supported': len([g for g in ['women', 'people_of_color', 'lgbtq', 'disabilities'] 
-                                            if text_content.count(g) > 0]),
+            'protected_groups_supported': len([g for g in SUPPORTED_GROUPS
+                                               if counts[f'supported_group.{g}'] > 0]),
             'social_justice_initiatives': positive_count // 10  # Every 10 positive mentions = 1 initiative
         }
         
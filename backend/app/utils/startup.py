@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .model_paths import BERT_MODEL_PATH, VGG_MODEL_PATH, XLNET_MODEL_PATH
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_ARTIFACTS = {
+    'xlnet': XLNET_MODEL_PATH,
+    'bert': BERT_MODEL_PATH,
+    'vgg16': VGG_MODEL_PATH
+}
+
+
+def missing_artifacts() -> List[str]:
+    """Models whose files download_models has not fetched yet"""
+    return [name for name, path in REQUIRED_ARTIFACTS.items() if not os.path.exists(path)]
+
+
+def prepare_artifacts():
+    """Fetch model files only when some are missing, so a prepared host never starts the OAuth flow"""
+    missing = missing_artifacts()
+    if missing:
+        logger.info(f"Downloading missing model artifacts: {', '.join(missing)}")
+        from .download_models import download_models
+        download_models()
+        missing = missing_artifacts()
+    if missing:
+        raise FileNotFoundError(f"Model artifacts missing after download: {', '.join(missing)}")
+
+
+def load_fusion_artifacts():
+    from .fusion_engine import get_artifact_store
+    get_artifact_store()
+
+
+def load_route_models():
+    """Import app.utils.models, which loads XLNet, BERT, VGG16 and CLIP, and the multimodal pipeline"""
+    from .models import load_models
+    load_models()
+    from . import multi_models  # noqa: F401  (torch, transformers and the classifiers)
+
+
+class Readiness:
+    """Progress of the startup steps; the worker is ready once all of them succeeded"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps: Dict[str, Dict] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = time.time()
+
+    def plan(self, names: List[str]):
+        with self._lock:
+            for name in names:
+                self._steps[name] = {'status': 'pending'}
+
+    def run_step(self, name: str, func: Callable):
+        with self._lock:
+            self._steps[name] = {'status': 'running'}
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            with self._lock:
+                self._steps[name] = {'status': 'failed', 'seconds': time.perf_counter() - start, 'error': str(e)}
+            raise
+        with self._lock:
+            self._steps[name] = {'status': 'done', 'seconds': time.perf_counter() - start}
+
+    def run(self, steps: List[Tuple[str, Callable]]):
+        for name, func in steps:
+            self.run_step(name, func)
+
+    def run_in_background(self, steps: List[Tuple[str, Callable]]):
+        def _run():
+            try:
+                self.run(steps)
+                logger.info(f"Worker ready after {time.time() - self.started_at:.1f}s")
+            except Exception as e:
+                logger.error(f"Startup failed, worker stays not ready: {e}")
+
+        self._thread = threading.Thread(target=_run, name='model-prepare', daemon=True)
+        self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return all(step['status'] == 'done' for step in self._steps.values())
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            steps = {name: dict(step) for name, step in self._steps.items()}
+        failed = any(step['status'] == 'failed' for step in steps.values())
+        ready = all(step['status'] == 'done' for step in steps.values())
+        return {
+            'status': 'ready' if ready else 'failed' if failed else 'starting',
+            'uptime_seconds': time.time() - self.started_at,
+            'steps': steps
+        }
+
+
+READINESS = Readiness()
+
+
+def startup_steps(config) -> List[Tuple[str, Callable]]:
+    steps = []
+    if config.get('MODEL_DOWNLOAD_ON_STARTUP', True):
+        steps.append(('artifacts', prepare_artifacts))
+    steps.append(('fusion_artifacts', load_fusion_artifacts))
+    steps.append(('models', load_route_models))
+    if config.get('WARMUP_MODELS'):
+        from .warmup import warm_up
+        steps.append(('warmup', warm_up))
+    return steps
+
+
+def init_app(app):
+    """
+    Prepare model artifacts, load and warm the models per MODEL_PREPARE_MODE:
+    "sync" before create_app returns, or "background" in a thread so the
+    worker serves /api/live at once and /api/ready reports not ready until done
+    """
+    steps = startup_steps(app.config)
+    READINESS.plan([name for name, _ in steps])
+    mode = app.config.get('MODEL_PREPARE_MODE', 'sync')
+    if mode == 'background':
+        READINESS.run_in_background(steps)
+    elif mode == 'sync':
+        READINESS.run(steps)
+    else:
+        raise ValueError(f"Unknown MODEL_PREPARE_MODE: {mode}")
@@ -0,0 +1,83 @@
+from flask import Response, current_app, request, stream_with_context
+from typing import Callable, Dict, Iterable, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_CHUNK_SIZE = 100
+
+
+def wants_ndjson() -> bool:
+    """Client asked for newline-delimited JSON"""
+    return NDJSON_MIMETYPE in request.headers.get('Accept', '')
+
+
+def wants_stream() -> bool:
+    """Client asked for a streamed listing (NDJSON or ?stream=true)"""
+    return wants_ndjson() or request.args.get('stream', 'false').lower() == 'true'
+
+
+def _serialize_items(items: Iterable, serialize: Callable) -> Iterator:
+    for item in items:
+        yield serialize(item)
+
+
+def _json_chunks(payload: Dict, listings: Dict[str, Iterable], serialize: Callable) -> Iterator[str]:
+    """Yield one JSON object piece by piece, listings last"""
+    dumps = current_app.json.dumps
+    fields = [f'{dumps(key)}: {dumps(value)}' for key, value in payload.items()]
+    yield '{' + ', '.join(fields)
+
+    for index, (key, items) in enumerate(listings.items()):
+        yield f'{", " if fields or index else ""}{dumps(key)}: ['
+        batch = []
+        first = True
+        for data in _serialize_items(items, serialize):
+            batch.append(dumps(data))
+            if len(batch) >= STREAM_CHUNK_SIZE:
+                yield ('' if first else ', ') + ', '.join(batch)
+                first = False
+                batch = []
+        if batch:
+            yield ('' if first else ', ') + ', '.join(batch)
+        yield ']'
+
+    yield '}\n'
+
+
+def _ndjson_lines(payload: Dict, listings: Dict[str, Iterable], serialize: Callable) -> Iterator[str]:
+    """Yield a meta record followed by one record per listed item"""
+    dumps = current_app.json.dumps
+    yield dumps({'type': 'meta', 'data': payload}) + '\n'
+
+    for key, items in listings.items():
+        batch = []
+        for data in _serialize_items(items, serialize):
+            batch.append(dumps({'type': key, 'data': data}) + '\n')
+            if len(batch) >= STREAM_CHUNK_SIZE:
+                yield ''.join(batch)
+                batch = []
+        if batch:
+            yield ''.join(batch)
+
+
+def stream_listing(payload: Dict, listings: Dict[str, Iterable],
+                   serialize: Callable = lambda obj: obj.to_dict(), status: int = 200) -> Response:
+    """
+    Stream a JSON response whose list fields are produced lazily.
+
+    ``payload`` holds the small top-level fields, ``listings`` maps response keys
+    to iterables (typically ``yield_per`` queries) that are serialized in chunks,
+    so the full listing is never held in memory. NDJSON is used when the client
+    sends ``Accept: application/x-ndjson``, otherwise the body is the same JSON
+    document the non-streamed endpoint returns.
+    """
+    if wants_ndjson():
+        body = _ndjson_lines(payload, listings, serialize)
+        mimetype = NDJSON_MIMETYPE
+    else:
+        body = _json_chunks(payload, listings, serialize)
+        mimetype = 'application/json'
+
+    return Response(stream_with_context(body), status=status, mimetype=mimetype)
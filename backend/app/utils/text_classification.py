@@ -1,60 +1,75 @@
 from transformers import XLNetTokenizer, XLNetForSequenceClassification
-from keras.models import load_model
-from keras.preprocessing import image as keras_image
 import torch
 import torchvision.transforms as transforms
 from PIL import Image
 import numpy as np
 from dotenv import load_dotenv
-import re
-import string
 from typing import List, Optional
-from .models import  TextModels
+from app.config import Config
+from .metrics import MODEL_ITEMS, timed
+from .text_preprocessing import normalize_text, normalize_texts
+from .tokenization import Encoding, encode_texts, get_text_tokenizer, get_token_cache
 load_dotenv(override=True)
 
 class TextClassifier:
-    def __init__(self, model_name: str = "xlnet"):
+    def __init__(self, model_name: str = "xlnet", backend: Optional[str] = None):
         self.model_name = model_name
+        self.backend = backend or Config.INFERENCE_BACKEND
+        if model_name not in ("xlnet", "bert"):
+            raise ValueError(f"Unsupported model: {model_name}")
+
+        if self.backend == "onnx":
+            # ONNX Runtime session; the eager models are never loaded
+            from .onnx_backend import get_onnx_model
+            self.tokenizer = get_text_tokenizer(model_name)
+            self.model = get_onnx_model(model_name)
+            return
+
+        from .models import TextModels
         self.text_models = TextModels()
         if model_name == "xlnet":
             self.tokenizer = self.text_models.xlnet_text_tokenizer
             self.model = self.text_models.xlnet_text_model
-        elif model_name == "bert":
+        else:
             self.tokenizer = self.text_models.bert_text_tokenizer
             self.model = self.text_models.bert_text_model
-        else:
-            raise ValueError(f"Unsupported model: {model_name}")
 
     def preprocess_text(self,text):
-        # Lowercase
-        text = text.lower()
-        # Remove URLs
-        text = re.sub(r"http\S+|www\S+|https\S+", '', text, flags=re.MULTILINE)
-        # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
-        # Remove numbers
-        text = re.sub(r'\d+', '', text)
-        # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
-
-        return text
+        # Lowercase, remove URLs, punctuation, numbers and extra spaces
+        return normalize_text(text)
+
+    def tokenize(self, texts: List[str]) -> List[Encoding]:
+        """Token ids for preprocessed texts (batched, served from the LRU cache when possible)"""
+        return encode_texts(self.tokenizer, self.model_name, texts, get_token_cache())
 
     def predict(self, texts: List[str]) -> np.ndarray:
         if not texts:
             return np.array([1 / 3, 1 / 3, 1 / 3])  # Neutral
 
-        probs_list = []
-        for text in texts:
-            text = self.preprocess_text(text)
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-            probs = torch.softmax(outputs.logits, dim=1).squeeze().numpy()
-            probs_list.append(probs)
-
-        return np.mean(probs_list, axis=0)
-
+        return np.mean(self.predict_items(texts), axis=0)
 
+    def predict_items(self, texts: List[str], batch_size: int = 1) -> np.ndarray:
+        """Class probabilities for each text, shape (len(texts), 3), ``batch_size`` texts per forward pass"""
+        with timed('text_predict', self.model_name):
+            encodings = self.tokenize(normalize_texts(texts))
+            probs_list = []
+            for start in range(0, len(encodings), batch_size):
+                probs_list.extend(self._forward(encodings[start:start + batch_size]))
+        MODEL_ITEMS.inc(len(encodings), model=self.model_name)
+        return np.array(probs_list).reshape(-1, 3)
 
+    def _forward(self, encodings: List[Encoding]) -> np.ndarray:
+        if len(encodings) == 1:
+            batch = {name: tensor.unsqueeze(0) for name, tensor in encodings[0].items()}
+        else:
+            # Pads on the side the model was trained with (left for XLNet)
+            batch = self.tokenizer.pad(encodings, return_tensors='pt')
 
+        if self.backend == "onnx":
+            from .onnx_backend import softmax
+            return softmax(self.model.run({name: tensor.numpy() for name, tensor in batch.items()}))
 
+        inputs = {name: tensor.to(self.text_models.device) for name, tensor in batch.items()}
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+        return torch.softmax(outputs.logits, dim=1).cpu().numpy()
@@ -0,0 +1,31 @@
+import re
+import string
+from typing import Iterable, List
+
+# URLs and digit runs are both deleted, so one alternation does both in a single
+# pass. Digits never start a URL and URLs are matched first, which keeps the
+# result identical to removing URLs, punctuation and digits one after another.
+URL_OR_DIGITS_PATTERN = re.compile(r"http\S+|www\S+|https\S+|\d+")
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+# Joins a batch into one string; it is whitespace, so \S+ never crosses it
+_BATCH_SEPARATOR = '\x1e'
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip URLs, punctuation and digits, collapse whitespace"""
+    text = URL_OR_DIGITS_PATTERN.sub('', text.lower())
+    return ' '.join(text.translate(PUNCTUATION_TABLE).split())
+
+
+def normalize_texts(texts: Iterable[str]) -> List[str]:
+    """Batch version of :func:`normalize_text` (one regex and translate call per batch)"""
+    texts = list(texts)
+    if not texts:
+        return []
+    if any(_BATCH_SEPARATOR in text for text in texts):
+        return [normalize_text(text) for text in texts]
+
+    joined = URL_OR_DIGITS_PATTERN.sub('', _BATCH_SEPARATOR.join(texts).lower())
+    joined = joined.translate(PUNCTUATION_TABLE)
+    return [' '.join(text.split()) for text in joined.split(_BATCH_SEPARATOR)]
@@ -0,0 +1,90 @@
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import torch
+
+from .lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+Encoding = Dict[str, torch.Tensor]
+
+
+def load_tokenizer(fast_cls, slow_cls, path: str, use_fast: bool = True):
+    """Load the Rust-backed tokenizer when the saved model supports it, else the Python one"""
+    if use_fast:
+        try:
+            tokenizer = fast_cls.from_pretrained(path)
+            logger.info(f"Loaded fast tokenizer {fast_cls.__name__} from {path}")
+            return tokenizer
+        except Exception as e:
+            logger.warning(f"Fast tokenizer unavailable for {path}, using {slow_cls.__name__}: {e}")
+    return slow_cls.from_pretrained(path)
+
+
+@lru_cache(maxsize=None)
+def get_text_tokenizer(model_name: str):
+    """Tokenizer saved with a text model, loaded without the model weights"""
+    from transformers import BertTokenizer, BertTokenizerFast, XLNetTokenizer, XLNetTokenizerFast
+    from app.config import Config
+    from .model_paths import TEXT_MODEL_PATHS
+
+    classes = {
+        'xlnet': (XLNetTokenizerFast, XLNetTokenizer),
+        'bert': (BertTokenizerFast, BertTokenizer)
+    }
+    fast_cls, slow_cls = classes[model_name]
+    return load_tokenizer(fast_cls, slow_cls, TEXT_MODEL_PATHS[model_name], use_fast=Config.USE_FAST_TOKENIZERS)
+
+
+def text_key(model_name: str, text: str) -> tuple:
+    """Cache key for a preprocessed text"""
+    return model_name, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+_token_cache: Optional[LRUCache] = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache() -> LRUCache:
+    """Process-wide token cache sized by TOKEN_CACHE_SIZE"""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                from app.config import Config
+                _token_cache = LRUCache(Config.TOKEN_CACHE_SIZE)
+    return _token_cache
+
+
+def encode_texts(tokenizer, model_name: str, texts: Sequence[str],
+                 cache: Optional[LRUCache] = None) -> List[Encoding]:
+    """
+    Tokenize preprocessed texts into unpadded 1-D tensors, one dict per text.
+
+    Cached texts are served from ``cache``; the rest are tokenized in a single
+    batch call (parallelized in Rust by fast tokenizers) and then cached.
+    """
+    encodings: List[Optional[Encoding]] = [None] * len(texts)
+    keys = [text_key(model_name, text) for text in texts]
+
+    missing = []
+    for i, key in enumerate(keys):
+        encoding = cache.get(key) if cache is not None else None
+        if encoding is None:
+            missing.append(i)
+        else:
+            encodings[i] = encoding
+
+    if missing:
+        batch = tokenizer([texts[i] for i in missing], truncation=True)
+        for position, i in enumerate(missing):
+            encoding = {name: torch.tensor(values[position]) for name, values in batch.items()}
+            encodings[i] = encoding
+            if cache is not None:
+                cache.put(keys[i], encoding)
+
+    return encodings
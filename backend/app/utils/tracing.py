@@ -0,0 +1,228 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRACE_HEADER = 'X-Trace'
+SQL_PREVIEW_CHARS = 200
+
+
+class Span:
+    __slots__ = ('name', 'attributes', 'start', 'end', 'children')
+
+    def __init__(self, name: str, attributes: Dict, start: float):
+        self.name = name
+        self.attributes = attributes
+        self.start = start
+        self.end: Optional[float] = None
+        self.children: List['Span'] = []
+
+    def to_dict(self, origin: float) -> Dict:
+        end = self.end if self.end is not None else time.perf_counter()
+        node = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round((end - self.start) * 1000, 3)
+        }
+        if self.attributes:
+            node['attributes'] = self.attributes
+        if self.children:
+            node['children'] = [child.to_dict(origin) for child in sorted(self.children, key=lambda s: s.start)]
+        return node
+
+
+class Trace:
+    """Span tree of one request, capped at ``max_spans`` spans"""
+
+    def __init__(self, name: str, attributes: Dict, max_spans: int):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.root = Span(name, attributes, time.perf_counter())
+        self.max_spans = max_spans
+        self.span_count = 1
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def attach(self, parent: Span, span: Span) -> bool:
+        with self._lock:
+            if self.span_count >= self.max_spans:
+                self.dropped += 1
+                return False
+            self.span_count += 1
+            parent.children.append(span)
+            return True
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.trace_id,
+            'started_at': self.started_at,
+            'duration_ms': round(((self.root.end or time.perf_counter()) - self.root.start) * 1000, 3),
+            'spans': self.span_count,
+            'dropped_spans': self.dropped,
+            'root': self.root.to_dict(self.root.start)
+        }
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar('trace', default=None)
+_span: ContextVar[Optional[Span]] = ContextVar('span', default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+
+def current_span() -> Optional[Span]:
+    return _span.get()
+
+
+def start_trace(name: str, max_spans: int = 10000, **attributes) -> Tuple:
+    trace = Trace(name, attributes, max_spans)
+    return trace, _trace.set(trace), _span.set(trace.root)
+
+
+def finish_trace(handle: Tuple) -> Trace:
+    trace, trace_token, span_token = handle
+    trace.root.end = time.perf_counter()
+    _span.reset(span_token)
+    _trace.reset(trace_token)
+    return trace
+
+
+def start_span(name: str, **attributes) -> Optional[Tuple]:
+    """Open a child of the current span; None (and nothing recorded) outside a traced request"""
+    trace = _trace.get()
+    if trace is None:
+        return None
+    span = Span(name, attributes, time.perf_counter())
+    if not trace.attach(_span.get() or trace.root, span):
+        return None
+    return span, _span.set(span)
+
+
+def end_span(handle: Optional[Tuple], **attributes):
+    if handle is None:
+        return
+    span, token = handle
+    span.end = time.perf_counter()
+    if attributes:
+        span.attributes.update(attributes)
+    _span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    handle = start_span(name, **attributes)
+    try:
+        yield
+    finally:
+        end_span(handle)
+
+
+def capture() -> Optional[Tuple[Trace, Span]]:
+    """The active trace and span, for ``record_span`` calls made from other threads"""
+    trace = _trace.get()
+    return (trace, _span.get() or trace.root) if trace is not None else None
+
+
+def record_span(parent: Optional[Tuple[Trace, Span]], name: str, start: float, end: Optional[float] = None,
+                **attributes):
+    """
+    Attach an already finished span under ``parent`` (from ``capture``), for
+    work whose end is observed in another thread, e.g. a future's done callback
+    """
+    if parent is None:
+        return
+    trace, span = parent
+    finished = Span(name, attributes, start)
+    finished.end = end if end is not None else time.perf_counter()
+    trace.attach(span, finished)
+
+
+def _install_sql_events():
+    """Time every DBAPI cursor execution of a traced request"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('trace_spans', []).append(
+            start_span('sql', statement=' '.join(statement.split())[:SQL_PREVIEW_CHARS], executemany=executemany)
+        )
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get('trace_spans')
+        if spans:
+            end_span(spans.pop(), rows=cursor.rowcount)
+
+    @event.listens_for(Engine, 'handle_error')
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        spans = connection.info.get('trace_spans') if connection is not None else None
+        if spans:
+            end_span(spans.pop(), error=type(exception_context.original_exception).__name__)
+
+
+_sql_events_installed = False
+
+
+def _wants_trace(request, config) -> bool:
+    flag = request.args.get('trace') or request.headers.get(TRACE_HEADER)
+    return bool(config.get('TRACE_ALL_REQUESTS')) or (flag or '').lower() in ('1', 'true', 'yes')
+
+
+def _export(path: str, record: Dict):
+    try:
+        with open(path, 'a') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+    except OSError as e:
+        logger.warning(f"Could not export trace to {path}: {e}")
+
+
+def init_app(app):
+    """
+    Trace requests flagged with ?trace=1 or an X-Trace: 1 header (or every
+    request with TRACE_ALL_REQUESTS). Flagged JSON responses get the span
+    tree under "trace"; every traced request is appended to TRACE_FILE.
+    """
+    from flask import g, request
+
+    global _sql_events_installed
+    if not _sql_events_installed:
+        _install_sql_events()
+        _sql_events_installed = True
+
+    @app.before_request
+    def _start_request_trace():
+        if _wants_trace(request, app.config):
+            g.trace_handle = start_trace(request.endpoint or request.path,
+                                         max_spans=app.config.get('TRACE_MAX_SPANS', 10000),
+                                         method=request.method, path=request.path)
+
+    @app.after_request
+    def _finish_request_trace(response):
+        handle = g.pop('trace_handle', None)
+        if handle is None:
+            return response
+        trace = finish_trace(handle)
+        trace.root.attributes['status'] = response.status_code
+        record = trace.to_dict()
+
+        flag = request.args.get('trace') or request.headers.get(TRACE_HEADER)
+        if flag and response.is_json and not response.is_streamed:
+            body = response.get_json(silent=True)
+            if isinstance(body, dict):
+                body['trace'] = record
+                response.set_data(app.json.dumps(body))
+        response.headers['X-Trace-Id'] = trace.trace_id
+
+        path = app.config.get('TRACE_FILE')
+        if path:
+            _export(path, record)
+        return response
@@ -23,4 +23,18 @@ def validate_pagination(page: int, per_page: int, max_per_page: int = 100) -> tu
     """Validate pagination parameters"""
     page = max(1, page)
     per_page = min(max(1, per_page), max_per_page)
-    return page, per_page
\ No newline at end of file
+    return page, per_page
+
+def parse_bool(value) -> Optional[bool]:
+    """Strict boolean for JSON/query flags: true/false, 1/0, yes/no; None for anything else"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ('true', '1', 'yes'):
+            return True
+        if lowered in ('false', '0', 'no'):
+            return False
+    return None
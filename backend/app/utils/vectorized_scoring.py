@@ -0,0 +1,238 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from app.utils.keyword_engine import TOKEN_PATTERN, KeywordEngine, get_keyword_engine
+from app.utils.lru import LRUCache
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_NAT = np.iinfo(np.int64).min
+
+WINDOWS = {
+    'hour': 'datetime64[h]',
+    'day': 'datetime64[D]',
+    'week': 'datetime64[D]',  # snapped to Monday below
+    'month': 'datetime64[M]'
+}
+
+
+def _clip(values: np.ndarray) -> np.ndarray:
+    return np.minimum(values, 1.0)
+
+
+def _ratio(a: np.ndarray, b: np.ndarray, weight: float) -> np.ndarray:
+    """min(|a - b| / (a + b) * weight, 1), 0 where there are no mentions"""
+    total = a + b
+    ratio = np.divide(np.abs(a - b), total, out=np.zeros_like(total, dtype=float), where=total > 0)
+    return _clip(ratio * weight)
+
+
+def _per_expected(count: np.ndarray, tweets: np.ndarray, share: float) -> np.ndarray:
+    """min(count / (tweets * share), 1), 0 for empty groups"""
+    expected = tweets * share
+    return _clip(np.divide(count, expected, out=np.zeros_like(count, dtype=float), where=expected > 0))
+
+
+class HeuristicMatrix:
+    """
+    Sparse tweets x keyword-category count matrix with vectorized scoring.
+
+    The scores reproduce the aggregate heuristics in ``bias_detection`` and
+    ``social_impact``, but for any grouping of rows: a single tweet, a time
+    window, or the whole corpus.
+    """
+
+    def __init__(self, counts: sparse.csr_matrix, categories: Sequence[str],
+                 tweet_ids: Optional[Sequence] = None, posted_at: Optional[np.ndarray] = None):
+        self.counts = counts
+        self.categories = list(categories)
+        self.tweet_ids = list(tweet_ids) if tweet_ids is not None else list(range(counts.shape[0]))
+        self.posted_at = posted_at
+        self._column = {category: i for i, category in enumerate(self.categories)}
+
+    @classmethod
+    def from_token_lists(cls, token_lists: Sequence[List[str]], engine: Optional[KeywordEngine] = None,
+                         tweet_ids: Optional[Sequence] = None,
+                         posted_at: Optional[Sequence] = None) -> 'HeuristicMatrix':
+        """Build the matrix as (tweets x vocabulary) @ (vocabulary x categories)"""
+        engine = engine or get_keyword_engine()
+        all_tokens = list(chain.from_iterable(token_lists))
+        vocabulary: Dict[str, int] = {token: i for i, token in enumerate(dict.fromkeys(all_tokens))}
+        columns = np.fromiter(map(vocabulary.__getitem__, all_tokens), dtype=np.int64, count=len(all_tokens))
+        row_lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+
+        rows = np.repeat(np.arange(len(token_lists)), row_lengths)
+        tweet_tokens = sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.int32), (rows, columns)),
+            shape=(len(token_lists), len(vocabulary))
+        )
+
+        category_index = {category: i for i, category in enumerate(engine.categories)}
+        keyword_rows, keyword_columns = [], []
+        for token, column in vocabulary.items():
+            for category in engine.token_categories(token):
+                keyword_rows.append(column)
+                keyword_columns.append(category_index[category])
+        token_categories = sparse.csr_matrix(
+            (np.ones(len(keyword_rows), dtype=np.int32), (keyword_rows, keyword_columns)),
+            shape=(len(vocabulary), len(engine.categories))
+        )
+
+        timestamps = _to_datetime64(posted_at) if posted_at is not None else None
+
+        return cls((tweet_tokens @ token_categories).tocsr(), engine.categories, tweet_ids, timestamps)
+
+    @classmethod
+    def from_texts(cls, texts: Sequence[str], **kwargs) -> 'HeuristicMatrix':
+        return cls.from_token_lists([TOKEN_PATTERN.findall(text.lower()) for text in texts], **kwargs)
+
+    @classmethod
+    def from_context(cls, context) -> 'HeuristicMatrix':
+        """Build from an AnalysisContext, reusing its tokens"""
+        tweets = context.tweets
+        return cls.from_token_lists(
+            context.tweet_tokens,
+            tweet_ids=[tweet.get('tweet_id', i) for i, tweet in enumerate(tweets)],
+            posted_at=[tweet.get('posted_at') for tweet in tweets]
+        )
+
+    def column(self, dense: np.ndarray, category: str) -> np.ndarray:
+        return dense[:, self._column[category]].astype(float)
+
+    def score_counts(self, dense: np.ndarray, tweets: np.ndarray) -> Dict[str, np.ndarray]:
+        """Bias and impact scores for rows of category counts covering ``tweets`` tweets each"""
+        def c(category):
+            return self.column(dense, category)
+
+        tweets = tweets.astype(float)
+
+        scores = {
+            'gender_bias': _ratio(c('gender.male'), c('gender.female'), 0.5),
+            'racial_bias': _clip(c('racial') * 0.1),
+            'age_bias': _ratio(c('age.young'), c('age.old'), 0.6),
+            'socioeconomic_bias': _clip(c('socioeconomic') * 0.08)
+        }
+        scores['overall_bias'] = np.mean(
+            [scores['gender_bias'], scores['racial_bias'], scores['age_bias'], scores['socioeconomic_bias']], axis=0
+        )
+
+        scores['representation'] = _per_expected(c('representation'), tweets, 0.1)
+        scores['fairness'] = _per_expected(c('fairness'), tweets, 0.15)
+        scores['inclusivity'] = _per_expected(c('inclusivity'), tweets, 0.12)
+        scores['social_justice'] = np.mean(
+            [scores['representation'], scores['fairness'], scores['inclusivity']], axis=0
+        )
+        scores['positive_interventions'] = c('community')
+        scores['bias_reduction'] = np.minimum(c('community') * 0.05, 0.5)
+        return scores
+
+    def per_tweet_scores(self) -> Dict[str, np.ndarray]:
+        """One score per tweet for every metric"""
+        return self.score_counts(self.counts.toarray(), np.ones(self.counts.shape[0]))
+
+    def aggregate_scores(self) -> Dict[str, float]:
+        """Scores for the whole corpus (same values as the aggregate heuristics)"""
+        totals = np.asarray(self.counts.sum(axis=0))
+        scores = self.score_counts(totals, np.array([self.counts.shape[0]]))
+        return {name: float(values[0]) for name, values in scores.items()}
+
+    def window_keys(self, window: str = 'day') -> np.ndarray:
+        if self.posted_at is None:
+            raise ValueError("Tweets have no timestamps")
+        if window not in WINDOWS:
+            raise ValueError(f"window must be one of {', '.join(WINDOWS)}")
+
+        keys = self.posted_at.astype(WINDOWS[window])
+        if window == 'week':
+            # 1970-01-01 was a Thursday; shift every day back to its Monday
+            days = keys.astype(np.int64)
+            keys = (days - (days + 3) % 7).astype('datetime64[D]')
+        return keys
+
+    def window_scores(self, window: str = 'day') -> List[Dict]:
+        """Scores per time window, oldest first"""
+        keys = self.window_keys(window)
+        valid = ~np.isnat(keys)
+        if not valid.any():
+            return []
+
+        windows, inverse = np.unique(keys[valid], return_inverse=True)
+        rows = np.flatnonzero(valid)
+        membership = sparse.csr_matrix(
+            (np.ones(len(rows)), (inverse, rows)), shape=(len(windows), self.counts.shape[0])
+        )
+        tweets = np.bincount(inverse, minlength=len(windows))
+        scores = self.score_counts((membership @ self.counts).toarray(), tweets)
+
+        return [
+            {
+                'window_start': str(windows[i]),
+                'tweets': int(tweets[i]),
+                **{name: float(values[i]) for name, values in scores.items()}
+            }
+            for i in range(len(windows))
+        ]
+
+    def top_tweets(self, metric: str = 'overall_bias', limit: int = 20) -> List[Dict]:
+        """Tweets with the highest value of ``metric`` (drill-down for flagged accounts)"""
+        scores = self.per_tweet_scores()
+        ranked = scores[metric]
+        limit = min(limit, len(ranked))
+        if limit <= 0:
+            return []
+
+        top = np.argpartition(-ranked, limit - 1)[:limit]
+        top = top[np.argsort(-ranked[top], kind='stable')]
+        return [
+            {
+                'tweet_id': self.tweet_ids[i],
+                'posted_at': str(self.posted_at[i]) if self.posted_at is not None else None,
+                **{name: float(values[i]) for name, values in scores.items()}
+            }
+            for i in top if ranked[i] > 0
+        ]
+
+
+_matrix_cache: Optional[LRUCache] = None
+_matrix_cache_lock = threading.Lock()
+
+
+def get_matrix_cache() -> LRUCache:
+    """
+    Process-wide cache of built HeuristicMatrix objects, sized by HEURISTICS_CACHE_SIZE.
+
+    Building a matrix tokenizes every tweet (~2s for 100k) while scoring it
+    takes ~0.1s, so requests for an unchanged user reuse it. Callers put a
+    version of the user's tweets in the key so any change misses the cache.
+    """
+    global _matrix_cache
+    if _matrix_cache is None:
+        with _matrix_cache_lock:
+            if _matrix_cache is None:
+                from app.config import Config
+                _matrix_cache = LRUCache(Config.HEURISTICS_CACHE_SIZE)
+    return _matrix_cache
+
+
+def _to_datetime64(values: Sequence) -> np.ndarray:
+    """Naive-UTC datetimes or ISO strings (None for unknown) to a datetime64[s] array"""
+    seconds = np.empty(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            value = _parse_datetime(value)
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        seconds[i] = (value - _EPOCH) // _SECOND if value else _NAT
+    return seconds.view('datetime64[s]')
+
+
+def _parse_datetime(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
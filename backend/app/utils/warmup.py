@@ -0,0 +1,130 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+MODEL_KINDS = {'xlnet': 'text', 'bert': 'text', 'vgg16': 'image', 'clip': 'image'}
+
+# Tweet-like filler; lengths vary so tokenizers pad and truncate as they do on real batches
+VOCABULARY = ('election', 'community', 'protest', 'weekend', 'football', 'policy', 'breaking', 'news', 'music',
+              'family', 'government', 'freedom', 'rally', 'today', 'great', 'vote', 'people', 'city', 'support',
+              'change', 'world', 'https://t.co/abc123', '#news', '@someone', '2024', '!!')
+IMAGE_SIZES = ((224, 224), (640, 480))
+
+_states: Dict[str, Dict] = {}
+_states_lock = threading.Lock()
+
+
+def _set_state(model_name: str, **state):
+    with _states_lock:
+        _states[model_name] = state
+
+
+def model_states() -> Dict[str, Dict]:
+    """Per-model warm-up status (pending, warming, warm or failed) and timings"""
+    with _states_lock:
+        return {name: dict(state) for name, state in _states.items()}
+
+
+def default_batch_sizes() -> List[int]:
+    """Batch shapes serving runs: single items, plus full micro-batches when MICRO_BATCHING is on"""
+    if Config.WARMUP_BATCH_SIZES:
+        return Config.WARMUP_BATCH_SIZES
+    return [1, Config.BATCH_MAX_SIZE] if Config.MICRO_BATCHING else [1]
+
+
+def synthetic_texts(count: int, seed: int = 0) -> List[str]:
+    rng = np.random.default_rng(seed)
+    return [' '.join(rng.choice(VOCABULARY, size=int(rng.integers(5, 50)))) for _ in range(count)]
+
+
+def synthetic_images(count: int, directory: str, seed: int = 0) -> List[str]:
+    """Random-noise JPEGs in ``directory``, alternating sizes so the resize paths run too"""
+    from PIL import Image
+    rng = np.random.default_rng(seed)
+    paths = []
+    for index in range(count):
+        width, height = IMAGE_SIZES[index % len(IMAGE_SIZES)]
+        path = os.path.join(directory, f'warmup_{index}.jpg')
+        Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8)).save(path)
+        paths.append(path)
+    return paths
+
+
+def warm_model(model_name: str, batch_sizes: Sequence[int], rounds: int, workdir: str) -> List[Dict]:
+    """
+    Run ``rounds`` synthetic batches of each size through one classifier; returns per-run timings.
+
+    Goes through the classifier's forward pass directly rather than
+    predict_items, so warm-up shows up in neither the model latency and item
+    metrics nor the token cache.
+    """
+    if MODEL_KINDS[model_name] == 'text':
+        from .text_classification import TextClassifier
+        from .text_preprocessing import normalize_texts
+        from .tokenization import encode_texts
+        classifier = TextClassifier(model_name=model_name)
+        texts = normalize_texts(synthetic_texts(max(batch_sizes)))
+
+        def forward(size):
+            # Tokenizing without a cache keeps the synthetic texts out of the serving LRU
+            return classifier._forward(encode_texts(classifier.tokenizer, model_name, texts[:size]))
+    else:
+        from .image_classification import ImageClassifier
+        classifier = ImageClassifier(model_name=model_name)
+        images = synthetic_images(max(batch_sizes), workdir)
+
+        def forward(size):
+            return classifier._forward(images[:size])
+
+    runs = []
+    for batch_size in batch_sizes:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            forward(batch_size)
+            runs.append({'batch_size': batch_size, 'ms': (time.perf_counter() - start) * 1000})
+    return runs
+
+
+def warm_up(model_names: Optional[Sequence[str]] = None, batch_sizes: Optional[Sequence[int]] = None,
+            rounds: Optional[int] = None):
+    """
+    Warm every model in WARMUP_MODELS so the first real request does not pay
+    for kernel JIT, graph building and tokenizer setup. All models are tried;
+    a RuntimeError naming the failed ones is raised at the end.
+    """
+    model_names = list(Config.WARMUP_MODELS if model_names is None else model_names)
+    batch_sizes = list(batch_sizes or default_batch_sizes())
+    rounds = Config.WARMUP_ROUNDS if rounds is None else rounds
+    for model_name in model_names:
+        _set_state(model_name, status='pending')
+
+    failed = []
+    with tempfile.TemporaryDirectory(prefix='warmup_') as workdir:
+        for model_name in model_names:
+            _set_state(model_name, status='warming')
+            start = time.perf_counter()
+            try:
+                runs = warm_model(model_name, batch_sizes, rounds, workdir)
+            except Exception as e:
+                logger.error(f"Warm-up of {model_name} failed: {e}")
+                _set_state(model_name, status='failed', seconds=time.perf_counter() - start, error=str(e))
+                failed.append(model_name)
+                continue
+
+            seconds = time.perf_counter() - start
+            _set_state(model_name, status='warm', seconds=seconds, first_batch_ms=runs[0]['ms'],
+                       last_batch_ms=runs[-1]['ms'], runs=runs)
+            logger.info(f"{model_name} warm in {seconds:.1f}s (first batch {runs[0]['ms']:.0f}ms, "
+                        f"last {runs[-1]['ms']:.0f}ms)")
+
+    if failed:
+        raise RuntimeError(f"Warm-up failed for {', '.join(failed)}")
@@ -0,0 +1,359 @@
+"""
+Load test of the Flask API with local stand-ins for X and Gemini.
+
+Starts create_app('testing') in a server process where XScraper returns
+canned profiles and tweets (texts and images from Dataset_Image_text, so the
+real classifiers run) and GeminiAIService answers after a configurable
+latency. The Google Drive model download is skipped, so the models must
+already be on disk. Concurrent clients then drive a weighted mix of
+
+    POST /api/user/get-info           (cached profile, or a fresh "scrape")
+    POST /api/user/<username>/analyze
+    GET  /api/bias-detection          (cached, or a fresh Gemini analysis)
+    GET  /api/profiles
+
+over HTTP, for each worker model (Werkzeug threads or one forked process
+per request) and concurrency level, reporting throughput, latency
+percentiles and error rates per endpoint.
+
+    python -m benchmarks.bench_api_load --concurrency 1 4 16 --duration 20
+    python -m benchmarks.bench_api_load --worker-models threads --gemini-latency-ms 2000 --output load.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import types
+import urllib.error
+import urllib.request
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from benchmarks.datasets import load_image_samples, load_text_corpus
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ('get-info', 'analyze', 'bias-detection', 'profiles')
+WORKER_MODELS = ('threads', 'processes')
+
+
+def _sleep(latency_ms, jitter):
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000 * random.uniform(1 - jitter, 1 + jitter))
+
+
+def install_stand_ins(args):
+    """Replace the scraper, Gemini and model download modules before create_app imports them"""
+    texts = load_text_corpus(args.corpus_size, args.seed)
+    images = [path for path, _ in load_image_samples(seed=args.seed)]
+
+    class XScraper:
+        def __init__(self, headless=True, delay=2):
+            self.delay = delay
+
+        def get_user_profile(self, username):
+            _sleep(args.scrape_latency_ms, args.latency_jitter)
+            rng = random.Random(zlib.crc32(username.encode()))
+            return {
+                'username': username,
+                'name': username.title(),
+                'bio': rng.choice(texts),
+                'followers_count': rng.randint(0, 100000),
+                'following_count': rng.randint(0, 5000),
+                'joined_date': None,
+                'profile_image_url': '',
+                'banner_image_url': '',
+                'tweets_count': args.tweets,
+                'verified': False,
+                'protected': False,
+                'likes_count': 0,
+                'location': ''
+            }
+
+        def get_user_tweets(self, username, max_tweets=50, media_only=False, since=None, known_tweet_ids=None):
+            _sleep(args.scrape_latency_ms, args.latency_jitter)
+            rng = random.Random(zlib.crc32(username.encode()))
+            now = datetime.utcnow()
+            tweets = []
+            for i in range(min(max_tweets, args.tweets)):
+                media = []
+                if images and rng.random() < args.media_ratio:
+                    path = rng.choice(images)
+                    media = [{'media_url': f'https://pbs.twimg.com/media/{os.path.basename(path)}', 'local_path': path}]
+                tweets.append({
+                    'tweet_id': f'{zlib.crc32(username.encode())}{i:05d}',
+                    'text': rng.choice(texts),
+                    'language': 'en',
+                    'media_urls': [item['media_url'] for item in media],
+                    'local_media_paths': [item['local_path'] for item in media],
+                    'media': media,
+                    'urls': [],
+                    'hashtags': [],
+                    'posted_at': now - timedelta(hours=i)
+                })
+            return [tweet for tweet in tweets if tweet['media'] or not media_only]
+
+        def scrape_user_tweets(self, username, max_tweets=50):
+            return self.get_user_tweets(username, max_tweets)
+
+        def get_user_posts(self, username, max_posts=20):
+            return []
+
+        def close(self):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            self.close()
+
+    class GeminiAIService:
+        def _respond(self, result):
+            _sleep(args.gemini_latency_ms, args.latency_jitter)
+            return result
+
+        def analyze_bias_detection(self, tweets, user_profile):
+            return self._respond({
+                'gender_bias': {'score': 0.15, 'status': 'low', 'description': 'Stand-in gender bias'},
+                'racial_bias': {'score': 0.08, 'status': 'very-low', 'description': 'Stand-in racial bias'},
+                'age_bias': {'score': 0.22, 'status': 'moderate', 'description': 'Stand-in age bias'},
+                'socioeconomic_bias': {'score': 0.12, 'status': 'low', 'description': 'Stand-in socioeconomic bias'}
+            })
+
+        def analyze_social_impact(self, tweets, user_profile):
+            return self._respond({'social_justice_score': {'overall': 0.87}})
+
+        def analyze_community_outreach(self, tweets, user_profile):
+            return self._respond({'impact_metrics': {'total_participants': 0}})
+
+        def analyze_images_for_bias(self, image_paths):
+            return self._respond({})
+
+    def module(name, **attributes):
+        stand_in = types.ModuleType(name)
+        stand_in.__dict__.update(attributes)
+        sys.modules[name] = stand_in
+
+    module('app.services.x_scraper', XScraper=XScraper)
+    module('app.services.gemini_ai_service', GeminiAIService=GeminiAIService)
+    module('app.utils.download_models', download_models=lambda: None)
+
+
+def serve(args, worker_model, port, workdir):
+    """Server process: the testing app on a file-backed SQLite DB shared by forked workers"""
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(workdir)  # AnalysisCache and the scraper write relative to the working directory
+    install_stand_ins(args)
+
+    from app import create_app, db
+    from app.config import config
+    from create_cache_table import create_analysis_cache_table
+    from werkzeug.serving import make_server
+
+    os.makedirs('instance', exist_ok=True)
+    config['testing'].SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'load_test.db')}"
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+    create_analysis_cache_table()
+
+    threaded = worker_model == 'threads'
+    server = make_server('127.0.0.1', port, app, threaded=threaded,
+                         processes=1 if threaded else args.processes)
+    server.serve_forever()
+
+
+class Client:
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def request(self, method, path, payload=None):
+        """(status, latency_ms); status 0 when the request did not complete"""
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (urllib.error.URLError, OSError):
+            status = 0
+        return status, (time.perf_counter() - start) * 1000
+
+
+def make_request(endpoint, rng, args, users):
+    """(method, path, payload) for one request to ``endpoint``"""
+    fresh = rng.random() < args.fresh_ratio
+    username = rng.choice(users)
+    if endpoint == 'get-info':
+        if fresh:
+            username = f'load{rng.randrange(10 ** 9)}'
+        return 'POST', '/api/user/get-info', {'username': username, 'max_tweets': args.tweets}
+    if endpoint == 'analyze':
+        return 'POST', f'/api/user/{username}/analyze', {
+            'fusion_technique': args.fusion_technique,
+            'text_model': args.text_models,
+            'image_model': args.image_models
+        }
+    if endpoint == 'bias-detection':
+        return 'GET', f"/api/bias-detection?username={username}&refresh={'true' if fresh else 'false'}", None
+    return 'GET', f'/api/profiles?page={rng.randint(1, 3)}&per_page=20', None
+
+
+def run_level(client, args, users, concurrency, mix):
+    """Drive ``concurrency`` clients for ``args.duration`` seconds; per-endpoint (status, latency) samples"""
+    endpoints, weights = zip(*mix.items())
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        local = defaultdict(list)
+        while time.monotonic() < deadline:
+            endpoint = rng.choices(endpoints, weights)[0]
+            local[endpoint].append(client.request(*make_request(endpoint, rng, args, users)))
+        with lock:
+            for endpoint, values in local.items():
+                samples[endpoint].extend(values)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(args.seed * 1000 + i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.monotonic() - start
+
+
+def summarize(samples, elapsed):
+    if not samples:
+        return {'requests': 0}
+    statuses = np.array([status for status, _ in samples])
+    latencies = np.array([latency for _, latency in samples])
+    errors = (statuses < 200) | (statuses >= 400)
+    return {
+        'requests': len(samples),
+        'throughput_rps': len(samples) / elapsed,
+        'error_rate': float(errors.mean()),
+        'status_counts': {str(code): int((statuses == code).sum()) for code in np.unique(statuses)},
+        'latency_ms': {
+            'mean': float(latencies.mean()),
+            'p50': float(np.percentile(latencies, 50)),
+            'p90': float(np.percentile(latencies, 90)),
+            'p99': float(np.percentile(latencies, 99))
+        }
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(client, server, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not server.is_alive():
+            raise RuntimeError('Server process exited during startup')
+        if client.request('GET', '/api/profiles')[0] == 200:
+            return
+        time.sleep(0.5)
+    raise RuntimeError(f'Server not ready after {timeout}s')
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        endpoint, _, weight = part.partition('=')
+        if endpoint not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f'unknown endpoint {endpoint!r}, expected one of {", ".join(ENDPOINTS)}')
+        mix[endpoint] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--worker-models', nargs='+', choices=WORKER_MODELS, default=list(WORKER_MODELS))
+    parser.add_argument('--processes', type=int, default=4, help='max forked workers in the processes model')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16], help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=20, help='seconds per concurrency level')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('get-info=4,analyze=1,bias-detection=2,profiles=4'))
+    parser.add_argument('--seed-users', type=int, default=20, help='profiles fetched before the run')
+    parser.add_argument('--fresh-ratio', type=float, default=0.1,
+                        help='share of get-info/bias-detection requests that bypass the caches')
+    parser.add_argument('--tweets', type=int, default=30, help='canned tweets per profile')
+    parser.add_argument('--media-ratio', type=float, default=0.2, help='share of canned tweets with an image')
+    parser.add_argument('--corpus-size', type=int, default=2000, help='dataset texts the canned tweets draw from')
+    parser.add_argument('--scrape-latency-ms', type=float, default=200)
+    parser.add_argument('--gemini-latency-ms', type=float, default=800)
+    parser.add_argument('--latency-jitter', type=float, default=0.25, help='relative +/- jitter of stand-in latency')
+    parser.add_argument('--fusion-technique', default='weighted_average')
+    parser.add_argument('--text-models', nargs='+', default=['xlnet'])
+    parser.add_argument('--image-models', nargs='+', default=['clip'])
+    parser.add_argument('--timeout', type=float, default=120, help='per-request timeout in seconds')
+    parser.add_argument('--startup-timeout', type=float, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the report as JSON to this path')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('fork')
+    users = [f'loaduser{i}' for i in range(args.seed_users)]
+    report = {'mix': args.mix, 'stand_in_latency_ms': {'scrape': args.scrape_latency_ms,
+                                                       'gemini': args.gemini_latency_ms}, 'runs': {}}
+
+    for worker_model in args.worker_models:
+        port = _free_port()
+        workdir = tempfile.mkdtemp(prefix='load_test_')
+        server = context.Process(target=serve, args=(args, worker_model, port, workdir), daemon=True)
+        server.start()
+        client = Client(f'http://127.0.0.1:{port}', args.timeout)
+        try:
+            print(f"🚀 Starting server ({worker_model}) in {workdir}")
+            wait_until_ready(client, server, args.startup_timeout)
+            for username in users:
+                status, _ = client.request('POST', '/api/user/get-info', {'username': username, 'max_tweets': args.tweets})
+                if status != 200:
+                    raise RuntimeError(f'Seeding {username} failed with status {status}')
+
+            report['runs'][worker_model] = {}
+            for concurrency in args.concurrency:
+                samples, elapsed = run_level(client, args, users, concurrency, args.mix)
+                level = {endpoint: summarize(values, elapsed) for endpoint, values in samples.items()}
+                level['overall'] = summarize([value for values in samples.values() for value in values], elapsed)
+                report['runs'][worker_model][concurrency] = level
+
+                print(f"  {worker_model} x{concurrency}: {level['overall']['throughput_rps']:.1f} req/s, "
+                      f"errors {level['overall']['error_rate']:.1%}")
+                for endpoint in ENDPOINTS:
+                    if endpoint in level:
+                        result = level[endpoint]
+                        print(f"    {endpoint:<15}{result['requests']:>6} req {result['throughput_rps']:>7.1f}/s "
+                              f"p50={result['latency_ms']['p50']:.0f}ms p90={result['latency_ms']['p90']:.0f}ms "
+                              f"p99={result['latency_ms']['p99']:.0f}ms errors={result['error_rate']:.1%}")
+        finally:
+            server.terminate()
+            server.join()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
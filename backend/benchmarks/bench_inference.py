@@ -0,0 +1,260 @@
+"""
+End-to-end inference benchmark for the classifiers and multimodal_predict.
+
+Uses tweets and images from Dataset_Image_text. For every base model it
+measures cold start (a fresh interpreter importing, loading and scoring one
+item), per-item latency percentiles, batch throughput and CPU utilization.
+For every fusion technique it runs multimodal_predict on synthetic profiles
+and reports the same figures per profile, plus peak RSS for the whole run.
+
+    python -m benchmarks.bench_inference --output bench.json
+    python -m benchmarks.bench_inference --models bert clip --techniques attention cascade
+    python -m benchmarks.bench_inference --baseline bench.json --max-regression 0.1
+
+With --baseline the run exits non-zero when any throughput drops by more
+than --max-regression against the saved report, so two commits can be
+compared on the same machine. Honors INFERENCE_BACKEND, MICRO_BATCHING and
+the other Config settings from the environment.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.datasets import load_image_samples, load_text_corpus
+
+MODELS = {'xlnet': 'text', 'bert': 'text', 'vgg16': 'image', 'clip': 'image'}
+TECHNIQUES = ['weighted_average', 'feature_fusion', 'attention', 'stacking', 'learned_weights', 'cascade', 'all']
+
+
+def _summary(latencies_ms):
+    values = np.asarray(latencies_ms)
+    return {
+        'mean': float(values.mean()),
+        'p50': float(np.percentile(values, 50)),
+        'p90': float(np.percentile(values, 90)),
+        'p99': float(np.percentile(values, 99))
+    }
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF):
+    return resource.getrusage(who).ru_maxrss / 1024  # KiB on Linux
+
+
+def _cpu_seconds():
+    """User + system time of this process and its finished children (the ProcessPool workers)"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class _Meter:
+    """Wall time and CPU utilization (busy cores) over a block"""
+
+    def __enter__(self):
+        self.wall, self.cpu = time.perf_counter(), _cpu_seconds()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.wall
+        self.cpu_utilization = (_cpu_seconds() - self.cpu) / self.wall if self.wall else 0.0
+
+
+def load_classifier(model_name):
+    if MODELS[model_name] == 'text':
+        from app.utils.text_classification import TextClassifier
+        return TextClassifier(model_name=model_name)
+    from app.utils.image_classification import ImageClassifier
+    return ImageClassifier(model_name=model_name)
+
+
+def cold_start_child(model_name, item):
+    """Runs in a fresh interpreter: time to load the model and score one item"""
+    start = time.perf_counter()
+    classifier = load_classifier(model_name)
+    loaded = time.perf_counter()
+    classifier.predict_items([item])
+    print(json.dumps({
+        'load_s': loaded - start,
+        'first_item_ms': (time.perf_counter() - loaded) * 1000,
+        'peak_rss_mb': _peak_rss_mb()
+    }))
+
+
+def cold_start(model_name, item):
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_inference', '--cold-start', model_name, item],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    total = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold start of {model_name} failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['total_s'] = total  # includes interpreter start and imports
+    return result
+
+
+def bench_model(model_name, items, batch_size, skip_cold_start):
+    result = {} if skip_cold_start else {'cold_start': cold_start(model_name, items[0])}
+    classifier = load_classifier(model_name)
+    classifier.predict_items(items[:2])  # warm up
+
+    latencies = []
+    with _Meter() as single:
+        for item in items:
+            start = time.perf_counter()
+            classifier.predict_items([item])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    with _Meter() as batched:
+        classifier.predict_items(items, batch_size=batch_size)
+
+    result.update({
+        'items': len(items),
+        'latency_ms': _summary(latencies),
+        'cpu_utilization': single.cpu_utilization,
+        'batch_size': batch_size,
+        'throughput_items_per_s': len(items) / batched.wall,
+        'batch_cpu_utilization': batched.cpu_utilization
+    })
+    return result
+
+
+def bench_technique(technique, profiles, text_models, image_models):
+    from app.utils.multi_models import multimodal_predict
+
+    latencies = []
+    with _Meter() as meter:
+        for texts, images in profiles:
+            start = time.perf_counter()
+            result = multimodal_predict(texts=texts, images=images, text_models=text_models,
+                                        image_models=image_models, fusion_technique=technique)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if 'error' in result:
+                raise RuntimeError(f"{technique} failed: {result['error']}")
+
+    return {
+        'profiles': len(profiles),
+        'latency_ms': _summary(latencies),
+        'throughput_profiles_per_s': len(profiles) / meter.wall,
+        'cpu_utilization': meter.cpu_utilization
+    }
+
+
+def throughputs(report):
+    """Every throughput figure in a report, keyed by where it came from"""
+    figures = {f'models.{name}': result['throughput_items_per_s'] for name, result in report['models'].items()}
+    figures.update({f'fusion.{name}': result['throughput_profiles_per_s']
+                    for name, result in report['fusion'].items()})
+    return figures
+
+
+def regressions(report, baseline, max_regression):
+    """(figure, baseline, current, change) for throughputs that dropped by more than max_regression"""
+    current, previous = throughputs(report), throughputs(baseline)
+    found = []
+    for key, value in current.items():
+        if key in previous and previous[key] > 0:
+            change = value / previous[key] - 1
+            if change < -max_regression:
+                found.append((key, previous[key], value, change))
+    return found
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', nargs='+', choices=list(MODELS), default=list(MODELS))
+    parser.add_argument('--techniques', nargs='+', choices=TECHNIQUES, default=TECHNIQUES[:-1])
+    parser.add_argument('--texts', type=int, default=200, help='texts per model benchmark')
+    parser.add_argument('--images', type=int, default=50, help='images per model benchmark')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--profiles', type=int, default=10, help='multimodal_predict calls per technique')
+    parser.add_argument('--profile-texts', type=int, default=20)
+    parser.add_argument('--profile-images', type=int, default=5)
+    parser.add_argument('--skip-cold-start', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the report as JSON to this path')
+    parser.add_argument('--baseline', help='JSON report to compare throughput against')
+    parser.add_argument('--max-regression', type=float, default=0.1,
+                        help='allowed relative throughput drop against --baseline (0.1 = 10%%)')
+    parser.add_argument('--cold-start', nargs=2, metavar=('MODEL', 'ITEM'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start:
+        cold_start_child(*args.cold_start)
+        return
+
+    from app.config import Config
+    texts = load_text_corpus(max(args.texts, args.profiles * args.profile_texts), args.seed)
+    images = [path for path, _ in load_image_samples(max(args.images, args.profiles * args.profile_images),
+                                                     args.seed)]
+    text_models = [name for name in args.models if MODELS[name] == 'text']
+    image_models = [name for name in args.models if MODELS[name] == 'image']
+    report = {
+        'commit': _git_commit(),
+        'config': {
+            'inference_backend': Config.INFERENCE_BACKEND,
+            'micro_batching': Config.MICRO_BATCHING,
+            'quantized_text_models': Config.QUANTIZED_TEXT_MODELS,
+            'cpu_count': os.cpu_count(),
+            'batch_size': args.batch_size
+        },
+        'models': {},
+        'fusion': {}
+    }
+
+    print(f"⏱️ Inference benchmark (backend={Config.INFERENCE_BACKEND}, micro_batching={Config.MICRO_BATCHING})")
+    for model_name in args.models:
+        items = texts[:args.texts] if MODELS[model_name] == 'text' else images[:args.images]
+        result = bench_model(model_name, items, args.batch_size, args.skip_cold_start)
+        report['models'][model_name] = result
+        cold = f"cold start {result['cold_start']['total_s']:.1f}s, " if 'cold_start' in result else ''
+        print(f"  {model_name:<6} {cold}p50={result['latency_ms']['p50']:.1f}ms "
+              f"p99={result['latency_ms']['p99']:.1f}ms, {result['throughput_items_per_s']:.1f} items/s "
+              f"(batch {args.batch_size}), cpu {result['batch_cpu_utilization']:.1f} cores")
+
+    profiles = [
+        (texts[i * args.profile_texts:(i + 1) * args.profile_texts] if text_models else None,
+         images[i * args.profile_images:(i + 1) * args.profile_images] if image_models else None)
+        for i in range(args.profiles)
+    ]
+    for technique in args.techniques:
+        result = bench_technique(technique, profiles, text_models, image_models)
+        report['fusion'][technique] = result
+        print(f"  {technique:<17} p50={result['latency_ms']['p50']:.0f}ms p99={result['latency_ms']['p99']:.0f}ms, "
+              f"{result['throughput_profiles_per_s']:.2f} profiles/s, cpu {result['cpu_utilization']:.1f} cores")
+
+    report['peak_rss_mb'] = {'self': _peak_rss_mb(), 'children': _peak_rss_mb(resource.RUSAGE_CHILDREN)}
+    print(f"  peak RSS {report['peak_rss_mb']['self']:.0f}MB (children {report['peak_rss_mb']['children']:.0f}MB)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        found = regressions(report, baseline, args.max_regression)
+        for key, previous, value, change in found:
+            print(f"❌ {key}: {previous:.2f} -> {value:.2f}/s ({change:+.1%})")
+        if found:
+            sys.exit(1)
+        print(f"✅ No throughput regression beyond {args.max_regression:.0%} vs {baseline.get('commit') or args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
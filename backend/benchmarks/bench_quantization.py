@@ -0,0 +1,137 @@
+"""
+Accuracy drift, latency and memory of INT8 dynamic quantization on CPU.
+
+Loads each text model in fp32, quantizes a copy with quantize_text_model and
+runs both over a held-out slice of the labeled tweets in Dataset_Image_text.
+Reports top-1 agreement with fp32, probability drift, label accuracy for both
+variants, per-text latency and weight size.
+
+    python -m benchmarks.bench_quantization --texts 500 --models xlnet bert
+"""
+import argparse
+import copy
+import json
+import math
+import time
+
+import numpy as np
+import torch
+from transformers import (BertForSequenceClassification, BertTokenizer, BertTokenizerFast,
+                          XLNetForSequenceClassification, XLNetTokenizer, XLNetTokenizerFast)
+
+from app.utils.model_paths import TEXT_MODEL_PATHS
+from app.utils.quantization import model_size_bytes, quantize_text_model
+from app.utils.text_preprocessing import normalize_texts
+from app.utils.tokenization import encode_texts, load_tokenizer
+from benchmarks.datasets import load_text_samples
+
+MODEL_CLASSES = {
+    'xlnet': (XLNetForSequenceClassification, XLNetTokenizerFast, XLNetTokenizer),
+    'bert': (BertForSequenceClassification, BertTokenizerFast, BertTokenizer)
+}
+
+
+def held_out_slice(num_texts, seed):
+    """The last ``num_texts`` labeled samples of the deterministic shuffle"""
+    samples = [(text, label) for text, label in load_text_samples(seed=seed, labeled_only=True)
+               if not (isinstance(label, float) and math.isnan(label))]
+    return samples[-num_texts:]
+
+
+def run_model(model, encodings):
+    """Per-text probabilities and latencies, the way TextClassifier.predict runs them"""
+    probs, latencies = [], []
+    with torch.no_grad():
+        for encoding in encodings:
+            inputs = {name: tensor.unsqueeze(0) for name, tensor in encoding.items()}
+            start = time.perf_counter()
+            logits = model(**inputs).logits
+            latencies.append((time.perf_counter() - start) * 1000)
+            probs.append(torch.softmax(logits, dim=1).squeeze(0).numpy())
+    return np.array(probs), np.array(latencies)
+
+
+def _latency_summary(latencies):
+    return {
+        'mean': float(latencies.mean()),
+        'p50': float(np.percentile(latencies, 50)),
+        'p95': float(np.percentile(latencies, 95))
+    }
+
+
+def _percent(value):
+    return 'n/a' if value is None else f'{value:.2%}'
+
+
+def bench_model(model_name, texts, labels, threads):
+    model_cls, fast_cls, slow_cls = MODEL_CLASSES[model_name]
+    path = TEXT_MODEL_PATHS[model_name]
+    torch.set_num_threads(threads)
+
+    tokenizer = load_tokenizer(fast_cls, slow_cls, path)
+    encodings = encode_texts(tokenizer, model_name, texts)
+
+    fp32 = model_cls.from_pretrained(path).eval()
+    int8 = quantize_text_model(copy.deepcopy(fp32))
+
+    run_model(fp32, encodings[:5])  # warm up kernels
+    run_model(int8, encodings[:5])
+    fp32_probs, fp32_latency = run_model(fp32, encodings)
+    int8_probs, int8_latency = run_model(int8, encodings)
+
+    fp32_pred = fp32_probs.argmax(axis=1)
+    int8_pred = int8_probs.argmax(axis=1)
+    num_labels = fp32_probs.shape[1]
+    scored = np.array([label is not None and 0 <= label < num_labels for label in labels])
+    targets = np.array([int(label) if keep else -1 for label, keep in zip(labels, scored)])
+
+    def accuracy(predictions):
+        return float((predictions[scored] == targets[scored]).mean()) if scored.any() else None
+
+    fp32_size, int8_size = model_size_bytes(fp32), model_size_bytes(int8)
+    return {
+        'agreement': float((fp32_pred == int8_pred).mean()),
+        'mean_abs_prob_drift': float(np.abs(fp32_probs - int8_probs).mean()),
+        'max_abs_prob_drift': float(np.abs(fp32_probs - int8_probs).max()),
+        'label_accuracy': {'fp32': accuracy(fp32_pred), 'int8': accuracy(int8_pred), 'scored_texts': int(scored.sum())},
+        'latency_ms': {'fp32': _latency_summary(fp32_latency), 'int8': _latency_summary(int8_latency)},
+        'speedup': float(fp32_latency.mean() / int8_latency.mean()),
+        'weights_mb': {'fp32': fp32_size / 2 ** 20, 'int8': int8_size / 2 ** 20},
+        'size_ratio': int8_size / fp32_size
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=500)
+    parser.add_argument('--models', nargs='+', choices=list(MODEL_CLASSES), default=list(MODEL_CLASSES))
+    parser.add_argument('--threads', type=int, default=torch.get_num_threads())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the report as JSON to this path')
+    args = parser.parse_args()
+
+    samples = held_out_slice(args.texts, args.seed)
+    texts = normalize_texts(text for text, _ in samples)
+    labels = [label for _, label in samples]
+    report = {'texts': len(texts), 'threads': args.threads, 'models': {}}
+
+    print(f"⚖️ Quantization benchmark ({len(texts)} held-out texts, {args.threads} threads)")
+    for model_name in args.models:
+        result = bench_model(model_name, texts, labels, args.threads)
+        report['models'][model_name] = result
+        accuracy = result['label_accuracy']
+        print(f"  {model_name:<6} agreement={result['agreement']:.2%} "
+              f"prob drift={result['mean_abs_prob_drift']:.4f} (max {result['max_abs_prob_drift']:.4f}) "
+              f"accuracy fp32={_percent(accuracy['fp32'])} int8={_percent(accuracy['int8'])}")
+        print(f"         latency fp32={result['latency_ms']['fp32']['mean']:.1f}ms "
+              f"int8={result['latency_ms']['int8']['mean']:.1f}ms ({result['speedup']:.2f}x), "
+              f"weights {result['weights_mb']['fp32']:.0f}MB -> {result['weights_mb']['int8']:.0f}MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
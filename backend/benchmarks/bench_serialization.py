@@ -0,0 +1,145 @@
+"""
+Compare stdlib JSON against the pluggable serializer in app.utils.serialization.
+
+Measures encode/decode CPU time for an analysis-cache sized payload and the
+on-disk size of the analysis_cache rows it produces in SQLite.
+
+    python -m benchmarks.bench_serialization --tweets 1000 --rows 50
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.utils import serialization
+
+
+def build_payload(num_tweets):
+    """Build a payload shaped like AnalysisCache.tweets_data plus results"""
+    rng = random.Random(42)
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(2000)]
+    now = datetime.utcnow()
+
+    tweets = []
+    for i in range(num_tweets):
+        text = ' '.join(rng.choices(words, k=rng.randint(8, 40)))
+        tweets.append({
+            'tweet_id': str(10 ** 18 + i),
+            'text': text,
+            'language': 'en',
+            'media_urls': [f'https://pbs.twimg.com/media/{i}.jpg?format=jpg&name=large'] if i % 3 == 0 else [],
+            'local_media_paths': [f'downloaded_images/user/{i}_abcdef12.jpg'] if i % 3 == 0 else [],
+            'urls': [],
+            'hashtags': ['#' + rng.choice(words) for _ in range(rng.randint(0, 3))],
+            'posted_at': (now - timedelta(minutes=i)).isoformat()
+        })
+
+    probs = np.random.default_rng(0).dirichlet(np.ones(3))
+    results = {
+        'overall_confidence': np.float32(probs.max() * 100),
+        'percentages': {
+            'non_radical': np.float64(probs[0] * 100),
+            'political': np.float64(probs[1] * 100),
+            'radical': np.float64(probs[2] * 100)
+        },
+        'content_stats': {'total_tweets': np.int64(num_tweets)}
+    }
+    return tweets, results
+
+
+def _time(fn, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1000
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, default=serialization._default)
+
+
+def _sqlite_size(blobs, rows):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE analysis_cache (id INTEGER PRIMARY KEY, tweets_data TEXT, analysis_results TEXT)')
+        for _ in range(rows):
+            conn.execute('INSERT INTO analysis_cache (tweets_data, analysis_results) VALUES (?, ?)', blobs)
+        conn.commit()
+        conn.execute('VACUUM')
+        conn.close()
+        return os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+
+def run(num_tweets, iterations, rows, threshold, codec):
+    tweets, results = build_payload(num_tweets)
+
+    stdlib_text = _stdlib_dumps(tweets)
+    packed = serialization.pack_blob(tweets, codec=codec, compress_threshold=threshold)
+    assert serialization.unpack_blob(packed) == json.loads(stdlib_text)
+
+    report = {
+        'tweets': num_tweets,
+        'backends': {
+            'orjson': serialization.orjson is not None,
+            'msgpack': serialization.msgpack is not None,
+            'zstandard': serialization.zstandard is not None
+        },
+        'encode_ms': {
+            'stdlib': _time(lambda: _stdlib_dumps(tweets), iterations),
+            'fast': _time(lambda: serialization.dumps(tweets), iterations),
+            'cache_blob': _time(lambda: serialization.pack_blob(
+                tweets, codec=codec, compress_threshold=threshold), iterations)
+        },
+        'decode_ms': {
+            'stdlib': _time(lambda: json.loads(stdlib_text), iterations),
+            'cache_blob': _time(lambda: serialization.unpack_blob(packed), iterations)
+        },
+        'blob_bytes': {
+            'stdlib': len(stdlib_text.encode('utf-8')),
+            'cache_blob': len(packed)
+        },
+        'sqlite_bytes': {
+            'stdlib': _sqlite_size((stdlib_text, _stdlib_dumps(results)), rows),
+            'cache_blob': _sqlite_size((packed, serialization.pack_blob(
+                results, codec=codec, compress_threshold=threshold)), rows)
+        }
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tweets', type=int, default=1000)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=50, help='cache rows written to SQLite')
+    parser.add_argument('--threshold', type=int, default=4096, help='zstd threshold in bytes')
+    parser.add_argument('--codec', choices=['json', 'msgpack'], default='json')
+    parser.add_argument('--output', help='write the report as JSON to this path')
+    args = parser.parse_args()
+
+    report = run(args.tweets, args.iterations, args.rows, args.threshold, args.codec)
+
+    print(f"📦 Serialization benchmark ({args.tweets} tweets, backends: {report['backends']})")
+    for section in ('encode_ms', 'decode_ms', 'blob_bytes', 'sqlite_bytes'):
+        values = ', '.join(f'{name}={value:,.2f}' for name, value in report[section].items())
+        print(f"  {section:<13} {values}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
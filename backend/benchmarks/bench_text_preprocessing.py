@@ -0,0 +1,85 @@
+"""
+Timing for app.utils.text_preprocessing.
+
+Times normalize_text / normalize_texts against the original four-pass
+TextClassifier.preprocess_text on a synthetic tweet corpus. Output parity is
+covered by tests/test_text_preprocessing.py.
+
+    python -m benchmarks.bench_text_preprocessing --texts 20000
+"""
+import argparse
+import json
+import random
+import re
+import string
+import time
+
+from app.utils.text_preprocessing import normalize_text, normalize_texts
+
+
+def legacy_preprocess_text(text):
+    """TextClassifier.preprocess_text before the shared module"""
+    text = text.lower()
+    text = re.sub(r"http\S+|www\S+|https\S+", '', text, flags=re.MULTILINE)
+    text = text.translate(str.maketrans('', '', string.punctuation))
+    text = re.sub(r'\d+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def build_corpus(num_texts, seed=0):
+    rng = random.Random(seed)
+    pieces = [
+        'Hello', 'WORLD', 'the', 'ΣΟΦΟΣ', 'İstanbul', 'straße', 'naïve', 'ÉCOLE', '東京', '١٢٣', '2024',
+        'https://t.co/abc123', 'http://x.com/a?b=1', 'www.example.org/path', 'email@site.com',
+        '#Hashtag', '@mention', "don't", 'e.g.', '...', '!!!', '$100', '50%', ' ', ' ',
+        '\t', '\n', '  ', '\r\n', '\x1c', '🙂', '3http://a', 'wwwdot', 'héllo', 'ﬁne'
+    ]
+    corpus = []
+    for _ in range(num_texts):
+        words = rng.choices(pieces, k=rng.randint(0, 30))
+        corpus.append(''.join(word + rng.choice(['', ' ', ' ', '\n']) for word in words))
+    corpus.append(''.join(chr(code) for code in range(0x110000) if not 0xD800 <= code <= 0xDFFF))
+    corpus.extend(chr(code) + 'x ' + chr(code) for code in range(0, 0x3000))
+    return corpus
+
+
+def _time(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run(num_texts, iterations):
+    texts = build_corpus(num_texts)[:num_texts]
+    return {
+        'texts': len(texts),
+        'ms_per_batch': {
+            'legacy': _time(lambda: [legacy_preprocess_text(text) for text in texts], iterations),
+            'normalize_text': _time(lambda: [normalize_text(text) for text in texts], iterations),
+            'normalize_texts': _time(lambda: normalize_texts(texts), iterations)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=20000)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--output', help='write the report as JSON to this path')
+    args = parser.parse_args()
+
+    report = run(args.texts, args.iterations)
+
+    timings = ', '.join(f'{name}={value:,.2f}' for name, value in report['ms_per_batch'].items())
+    print(f"ms per {report['texts']} texts: {timings}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
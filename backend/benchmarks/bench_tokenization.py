@@ -0,0 +1,88 @@
+"""
+Tokenization throughput for the XLNet and BERT text models.
+
+Compares the previous path (slow Python tokenizer, one call per text) with the
+fast tokenizer per text, batched encode_texts, and encode_texts served from a
+warm LRUCache, on tweets from Dataset_Image_text/Text Database. Also counts
+texts whose token ids differ between the slow and fast tokenizers.
+
+    python -m benchmarks.bench_tokenization --texts 5000 --models xlnet bert
+"""
+import argparse
+import json
+import time
+
+from transformers import BertTokenizer, BertTokenizerFast, XLNetTokenizer, XLNetTokenizerFast
+
+from app.utils.lru import LRUCache
+from app.utils.model_paths import TEXT_MODEL_PATHS
+from app.utils.text_preprocessing import normalize_texts
+from app.utils.tokenization import encode_texts, load_tokenizer
+from benchmarks.datasets import load_text_corpus
+
+TOKENIZER_CLASSES = {
+    'xlnet': (XLNetTokenizerFast, XLNetTokenizer),
+    'bert': (BertTokenizerFast, BertTokenizer)
+}
+
+
+def _throughput(fn, count):
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def bench_model(model_name, texts):
+    fast_cls, slow_cls = TOKENIZER_CLASSES[model_name]
+    path = TEXT_MODEL_PATHS[model_name]
+    slow = slow_cls.from_pretrained(path)
+    fast = load_tokenizer(fast_cls, slow_cls, path)
+
+    cache = LRUCache(max_size=len(texts))
+    encode_texts(fast, model_name, texts, cache)  # warm the cache
+
+    mismatches = sum(
+        1 for text in texts
+        if slow(text, truncation=True)['input_ids'] != fast(text, truncation=True)['input_ids']
+    )
+
+    return {
+        'fast_tokenizer': fast.is_fast,
+        'slow_fast_id_mismatches': mismatches,
+        'texts_per_second': {
+            'slow_per_text': _throughput(
+                lambda: [slow(text, return_tensors='pt', truncation=True, padding=True) for text in texts], len(texts)),
+            'fast_per_text': _throughput(
+                lambda: [fast(text, return_tensors='pt', truncation=True, padding=True) for text in texts], len(texts)),
+            'fast_batch': _throughput(lambda: encode_texts(fast, model_name, texts), len(texts)),
+            'cached': _throughput(lambda: encode_texts(fast, model_name, texts, cache), len(texts))
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=5000)
+    parser.add_argument('--models', nargs='+', choices=list(TOKENIZER_CLASSES), default=list(TOKENIZER_CLASSES))
+    parser.add_argument('--output', help='write the report as JSON to this path')
+    args = parser.parse_args()
+
+    texts = normalize_texts(load_text_corpus(limit=args.texts))
+    report = {'texts': len(texts), 'models': {}}
+
+    print(f"🔤 Tokenization benchmark ({len(texts)} texts)")
+    for model_name in args.models:
+        result = bench_model(model_name, texts)
+        report['models'][model_name] = result
+        rates = ', '.join(f'{name}={value:,.0f}/s' for name, value in result['texts_per_second'].items())
+        print(f"  {model_name:<6} {rates} (fast={result['fast_tokenizer']}, "
+              f"id mismatches={result['slow_fast_id_mismatches']})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Sample loaders for the local datasets under Dataset_Image_text/"""
+import glob
+import os
+import random
+from typing import List, Optional, Tuple
+
+DATASET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Dataset_Image_text'))
+TEXT_DATASET_DIR = os.path.join(DATASET_DIR, 'Text Database')
+IMAGE_DATASET_DIR = os.path.join(DATASET_DIR, 'images')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+def _read_text_file(path: str) -> List[Tuple[str, Optional[float]]]:
+    import pandas as pd
+
+    if path.endswith('.csv'):
+        # Raw exports have no header: id, text
+        frame = pd.read_csv(path, header=None, encoding_errors='ignore')
+        return [(str(text), None) for text in frame.iloc[:, -1].dropna()]
+
+    frame = pd.read_excel(path)
+    text_column, label_column = frame.columns[0], frame.columns[1]
+    frame = frame.dropna(subset=[text_column])
+    return [(str(text), label) for text, label in zip(frame[text_column], frame[label_column])]
+
+
+def load_text_samples(limit: Optional[int] = None, seed: int = 0, labeled_only: bool = False,
+                      directory: str = TEXT_DATASET_DIR) -> List[Tuple[str, Optional[float]]]:
+    """(text, label) pairs from every CSV/XLSX file, shuffled deterministically"""
+    samples = []
+    seen = set()
+    for path in sorted(glob.glob(os.path.join(directory, '**', '*.*'), recursive=True)):
+        if not path.endswith(('.csv', '.xlsx')):
+            continue
+        for text, label in _read_text_file(path):
+            if text in seen or (labeled_only and label is None):
+                continue
+            seen.add(text)
+            samples.append((text, label))
+
+    random.Random(seed).shuffle(samples)
+    return samples[:limit] if limit else samples
+
+
+def load_text_corpus(limit: Optional[int] = None, seed: int = 0) -> List[str]:
+    return [text for text, _ in load_text_samples(limit, seed)]
+
+
+def load_image_samples(limit: Optional[int] = None, seed: int = 0,
+                       directory: str = IMAGE_DATASET_DIR) -> List[Tuple[str, str]]:
+    """(path, class folder) pairs for the image dataset, shuffled deterministically"""
+    samples = [
+        (path, os.path.basename(os.path.dirname(path)))
+        for path in sorted(glob.glob(os.path.join(directory, '*', '*')))
+        if path.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+    random.Random(seed).shuffle(samples)
+    return samples[:limit] if limit else samples
@@ -0,0 +1,142 @@
+"""
+Export the classifiers to ONNX for the ONNX Runtime backend (INFERENCE_BACKEND=onnx).
+
+    python export_onnx.py                       # xlnet, bert, vgg16 and clip
+    python export_onnx.py --models bert clip --verify
+
+Text models export their logits. CLIP exports only the vision tower (normalized
+image embeddings); the prompt embeddings and logit scale are fixed, so they are
+computed once here and saved next to the graph. VGG16 needs tf2onnx.
+"""
+import argparse
+import os
+
+import numpy as np
+import torch
+
+from app.utils.model_paths import (CLIP_MODEL_NAME, CLIP_PROCESSOR_PATH, CLIP_TEXT_EMBEDDINGS_PATH, CLIP_TEXT_LABELS,
+                                   ONNX_DIR, ONNX_MODEL_PATHS, TEXT_MODEL_PATHS, VGG_MODEL_PATH)
+from app.utils.text_preprocessing import normalize_text
+from app.utils.tokenization import get_text_tokenizer
+
+SAMPLE_TEXT = "Sample tweet used to trace the graph for export"
+
+
+class _Logits(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, *inputs):
+        return self.model(**dict(zip(self.input_names, inputs))).logits
+
+
+class _ClipImageEmbeddings(torch.nn.Module):
+    def __init__(self, clip_model):
+        super().__init__()
+        self.clip_model = clip_model
+
+    def forward(self, pixel_values):
+        pooled = self.clip_model.vision_model(pixel_values=pixel_values).pooler_output
+        embeds = self.clip_model.visual_projection(pooled)
+        return embeds / embeds.norm(dim=-1, keepdim=True)
+
+
+def export_text_model(model_name, opset):
+    from transformers import BertForSequenceClassification, XLNetForSequenceClassification
+
+    model_cls = XLNetForSequenceClassification if model_name == 'xlnet' else BertForSequenceClassification
+    model = model_cls.from_pretrained(TEXT_MODEL_PATHS[model_name]).eval()
+    tokenizer = get_text_tokenizer(model_name)
+    sample = tokenizer(normalize_text(SAMPLE_TEXT), return_tensors='pt', truncation=True)
+
+    wrapper = _Logits(model)
+    wrapper.input_names = list(sample.keys())
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in wrapper.input_names}
+    dynamic_axes['logits'] = {0: 'batch'}
+
+    args = tuple(sample[name] for name in wrapper.input_names)
+    with torch.no_grad():
+        # Reference outputs are taken before tracing, which can change what the eager model returns
+        expected = wrapper(*args).numpy()
+        torch.onnx.export(
+            wrapper, args, ONNX_MODEL_PATHS[model_name],
+            input_names=wrapper.input_names, output_names=['logits'], dynamic_axes=dynamic_axes,
+            opset_version=opset, dynamo=False
+        )
+    return {name: tensor.numpy() for name, tensor in sample.items()}, expected
+
+
+def export_vgg16(opset):
+    import tensorflow as tf
+    import tf2onnx
+    from keras.models import load_model
+
+    model = load_model(VGG_MODEL_PATH)
+    signature = [tf.TensorSpec((None, 224, 224, 3), tf.float32, name='input')]
+    tf2onnx.convert.from_keras(model, input_signature=signature, opset=opset, output_path=ONNX_MODEL_PATHS['vgg16'])
+
+    sample = np.random.default_rng(0).random((1, 224, 224, 3), dtype=np.float32)
+    return {'input': sample}, model.predict(sample)
+
+
+def export_clip(opset):
+    from PIL import Image
+    from transformers import CLIPModel, CLIPProcessor
+
+    model = CLIPModel.from_pretrained(CLIP_MODEL_NAME).eval()
+    processor = CLIPProcessor.from_pretrained(CLIP_MODEL_NAME)
+    processor.image_processor.save_pretrained(CLIP_PROCESSOR_PATH)
+
+    with torch.no_grad():
+        text_inputs = processor(text=CLIP_TEXT_LABELS, return_tensors='pt', padding=True)
+        text_embeds = model.text_projection(model.text_model(**text_inputs).pooler_output)
+        text_embeds = text_embeds / text_embeds.norm(dim=-1, keepdim=True)
+        np.savez(CLIP_TEXT_EMBEDDINGS_PATH, text_embeds=text_embeds.numpy(),
+                 logit_scale=model.logit_scale.exp().item(), labels=np.array(CLIP_TEXT_LABELS))
+
+        image = Image.fromarray(np.random.default_rng(0).integers(0, 255, (224, 224, 3), dtype=np.uint8))
+        pixel_values = processor(images=image, return_tensors='pt')['pixel_values']
+        wrapper = _ClipImageEmbeddings(model)
+        expected = wrapper(pixel_values).numpy()
+        torch.onnx.export(
+            wrapper, (pixel_values,), ONNX_MODEL_PATHS['clip'],
+            input_names=['pixel_values'], output_names=['image_embeds'],
+            dynamic_axes={'pixel_values': {0: 'batch'}, 'image_embeds': {0: 'batch'}},
+            opset_version=opset, dynamo=False
+        )
+    return {'pixel_values': pixel_values.numpy()}, expected
+
+
+def verify(model_name, inputs, expected):
+    from app.utils.onnx_backend import OnnxModel
+
+    actual = OnnxModel(ONNX_MODEL_PATHS[model_name]).run(inputs)
+    return float(np.abs(actual - expected).max())
+
+
+def main():
+    exporters = {
+        'xlnet': lambda opset: export_text_model('xlnet', opset),
+        'bert': lambda opset: export_text_model('bert', opset),
+        'vgg16': export_vgg16,
+        'clip': export_clip
+    }
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', nargs='+', choices=list(exporters), default=list(exporters))
+    parser.add_argument('--opset', type=int, default=17)
+    parser.add_argument('--verify', action='store_true', help='compare ONNX Runtime outputs with the source model')
+    args = parser.parse_args()
+
+    os.makedirs(ONNX_DIR, exist_ok=True)
+    for model_name in args.models:
+        print(f"📦 Exporting {model_name} to {ONNX_MODEL_PATHS[model_name]}")
+        inputs, expected = exporters[model_name](args.opset)
+        size_mb = os.path.getsize(ONNX_MODEL_PATHS[model_name]) / 2 ** 20
+        print(f"✅ {model_name} exported ({size_mb:.0f}MB)")
+        if args.verify:
+            print(f"🔍 {model_name} max abs difference vs source model: {verify(model_name, inputs, expected):.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Store per-item model predictions and per-profile running sums
+
+Revision ID: add_prediction_tables
+Revises: add_tweet_media_table
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_prediction_tables'
+down_revision = 'add_tweet_media_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('item_predictions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('item_type', sa.String(length=10), nullable=False),
+        sa.Column('item_key', sa.String(length=500), nullable=False),
+        sa.Column('model_name', sa.String(length=20), nullable=False),
+        sa.Column('prob_non_radical', sa.Float(), nullable=False),
+        sa.Column('prob_political', sa.Float(), nullable=False),
+        sa.Column('prob_radical', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'item_type', 'item_key', 'model_name', name='uq_item_prediction')
+    )
+    with op.batch_alter_table('item_predictions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_item_predictions_user_id'), ['user_id'], unique=False)
+
+    op.create_table('profile_aggregates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('item_type', sa.String(length=10), nullable=False),
+        sa.Column('model_name', sa.String(length=20), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('sum_non_radical', sa.Float(), nullable=False),
+        sa.Column('sum_political', sa.Float(), nullable=False),
+        sa.Column('sum_radical', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'item_type', 'model_name', name='uq_profile_aggregate')
+    )
+    with op.batch_alter_table('profile_aggregates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_profile_aggregates_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('profile_aggregates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_profile_aggregates_user_id'))
+    op.drop_table('profile_aggregates')
+
+    with op.batch_alter_table('item_predictions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_item_predictions_user_id'))
+    op.drop_table('item_predictions')
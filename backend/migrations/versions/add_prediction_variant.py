@@ -0,0 +1,55 @@
+"""Key item predictions by model variant and drop the profile running sums
+
+Revision ID: add_prediction_variant
+Revises: add_prediction_tables
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_prediction_variant'
+down_revision = 'add_prediction_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows stored so far came from the default torch fp32 models
+    with op.batch_alter_table('item_predictions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('variant', sa.String(length=20), nullable=False, server_default='torch'))
+        batch_op.drop_constraint('uq_item_prediction', type_='unique')
+        batch_op.create_unique_constraint(
+            'uq_item_prediction', ['user_id', 'item_type', 'item_key', 'model_name', 'variant']
+        )
+
+    with op.batch_alter_table('profile_aggregates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_profile_aggregates_user_id'))
+    op.drop_table('profile_aggregates')
+
+
+def downgrade():
+    op.create_table('profile_aggregates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('item_type', sa.String(length=10), nullable=False),
+        sa.Column('model_name', sa.String(length=20), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('sum_non_radical', sa.Float(), nullable=False),
+        sa.Column('sum_political', sa.Float(), nullable=False),
+        sa.Column('sum_radical', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'item_type', 'model_name', name='uq_profile_aggregate')
+    )
+    with op.batch_alter_table('profile_aggregates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_profile_aggregates_user_id'), ['user_id'], unique=False)
+
+    # Keep one variant per item so the narrower key holds
+    op.execute("DELETE FROM item_predictions WHERE variant != 'torch'")
+    with op.batch_alter_table('item_predictions', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_item_prediction', type_='unique')
+        batch_op.create_unique_constraint('uq_item_prediction', ['user_id', 'item_type', 'item_key', 'model_name'])
+        batch_op.drop_column('variant')
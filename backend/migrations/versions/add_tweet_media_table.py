@@ -0,0 +1,91 @@
+"""Move tweet media into a normalized tweet_media table
+
+Revision ID: add_tweet_media_table
+Revises: add_analysis_cache_table
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+# revision identifiers, used by Alembic.
+revision = 'add_tweet_media_table'
+down_revision = 'add_analysis_cache_table'
+branch_labels = None
+depends_on = None
+
+
+def _load_list(value):
+    if not value:
+        return []
+    try:
+        items = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    return items if isinstance(items, list) else []
+
+
+def upgrade():
+    tweet_media = op.create_table('tweet_media',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tweet_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('media_url', sa.String(length=1000), nullable=True),
+        sa.Column('local_path', sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(['tweet_id'], ['tweets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tweet_media', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tweet_media_tweet_id'), ['tweet_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_tweet_media_local_path'), ['local_path'], unique=False)
+
+    # Copy the JSON-encoded media lists into rows
+    conn = op.get_bind()
+    rows = conn.execute(sa.text('SELECT id, media_urls, local_media_paths FROM tweets')).fetchall()
+    media_rows = []
+    for tweet_id, media_urls, local_media_paths in rows:
+        items = [(url, None) for url in _load_list(media_urls)]
+        items += [(None, path) for path in _load_list(local_media_paths)]
+        for position, (url, path) in enumerate(items):
+            media_rows.append({
+                'tweet_id': tweet_id,
+                'position': position,
+                'media_url': url,
+                'local_path': path
+            })
+    if media_rows:
+        op.bulk_insert(tweet_media, media_rows)
+
+    with op.batch_alter_table('tweets', schema=None) as batch_op:
+        batch_op.drop_column('media_urls')
+        batch_op.drop_column('local_media_paths')
+
+
+def downgrade():
+    with op.batch_alter_table('tweets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('media_urls', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('local_media_paths', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        'SELECT tweet_id, media_url, local_path FROM tweet_media ORDER BY tweet_id, position'
+    )).fetchall()
+    media = {}
+    for tweet_id, url, path in rows:
+        urls, paths = media.setdefault(tweet_id, ([], []))
+        if url:
+            urls.append(url)
+        if path:
+            paths.append(path)
+    for tweet_id, (urls, paths) in media.items():
+        conn.execute(
+            sa.text('UPDATE tweets SET media_urls = :urls, local_media_paths = :paths WHERE id = :id'),
+            {'urls': json.dumps(urls), 'paths': json.dumps(paths), 'id': tweet_id}
+        )
+
+    with op.batch_alter_table('tweet_media', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tweet_media_local_path'))
+        batch_op.drop_index(batch_op.f('ix_tweet_media_tweet_id'))
+
+    op.drop_table('tweet_media')
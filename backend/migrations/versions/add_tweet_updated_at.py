@@ -0,0 +1,25 @@
+"""Track when a tweet row was last rewritten
+
+Revision ID: add_tweet_updated_at
+Revises: add_prediction_variant
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_tweet_updated_at'
+down_revision = 'add_prediction_variant'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tweets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('tweets', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,52 @@
+"""
+Fetch the model artifacts ahead of time, as a deploy step separate from the web workers.
+
+    python prepare_models.py            # download missing models and cache CLIP
+    python prepare_models.py --check    # exit 1 if any model file is missing, download nothing
+    python prepare_models.py --load     # also load every model once to verify the files
+
+Run this (it may start the Google Drive OAuth flow) before starting workers
+with MODEL_DOWNLOAD_ON_STARTUP=false and MODEL_PREPARE_MODE=background, so
+they boot at once and only load models that are already on disk.
+"""
+import argparse
+import sys
+import time
+
+from app.utils.model_paths import CLIP_MODEL_NAME
+from app.utils.startup import REQUIRED_ARTIFACTS, load_route_models, missing_artifacts, prepare_artifacts
+
+
+def cache_clip():
+    """Download CLIP into the Hugging Face cache, where app.utils.models loads it from"""
+    from transformers import CLIPModel, CLIPProcessor
+    CLIPModel.from_pretrained(CLIP_MODEL_NAME)
+    CLIPProcessor.from_pretrained(CLIP_MODEL_NAME)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--check', action='store_true', help='only report missing model files')
+    parser.add_argument('--load', action='store_true', help='load every model after fetching')
+    args = parser.parse_args()
+
+    missing = missing_artifacts()
+    for name, path in REQUIRED_ARTIFACTS.items():
+        print(f"{'❌' if name in missing else '✓'} {name}: {path}")
+    if args.check:
+        sys.exit(1 if missing else 0)
+
+    start = time.perf_counter()
+    prepare_artifacts()
+    print(f"🔄 Caching {CLIP_MODEL_NAME}")
+    cache_clip()
+    print(f"✅ Model artifacts ready in {time.perf_counter() - start:.1f}s")
+
+    if args.load:
+        start = time.perf_counter()
+        load_route_models()
+        print(f"✅ Models loaded in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Manage the background scrape queue.
+
+    python scrape_workers.py enqueue elonmusk nasa --max-tweets 100
+    python scrape_workers.py enqueue --file accounts.txt --mode full
+    python scrape_workers.py run --workers 4 --drain
+    python scrape_workers.py status
+"""
+import argparse
+import json
+import multiprocessing
+import os
+
+from app.config import config
+from app.services.scrape_queue import ScrapeQueue
+
+
+def get_queue(config_name):
+    cfg = config[config_name]
+    return ScrapeQueue(
+        cfg.SCRAPE_QUEUE_PATH,
+        lease_seconds=cfg.SCRAPE_LEASE_SECONDS,
+        max_attempts=cfg.SCRAPE_MAX_ATTEMPTS,
+        backoff_seconds=cfg.SCRAPE_BACKOFF_SECONDS
+    )
+
+
+def enqueue(args):
+    usernames = [name.lstrip('@').strip() for name in args.usernames]
+    if args.file:
+        with open(args.file) as f:
+            usernames.extend(line.lstrip('@').strip() for line in f if line.strip() and not line.startswith('#'))
+
+    queue = get_queue(args.config)
+    added = 0
+    for username in usernames:
+        job_id = queue.enqueue(username, max_tweets=args.max_tweets, mode=args.mode, priority=args.priority)
+        if job_id:
+            added += 1
+            print(f"➕ Queued @{username} (job {job_id})")
+        else:
+            print(f"⏭️  @{username} already queued")
+    print(f"✅ {added} job(s) added")
+
+
+def run(args):
+    from app.services.scrape_worker import run_worker
+
+    get_queue(args.config)  # create the schema before workers race for it
+    processes = []
+    for index in range(args.workers):
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(index, args.config, args.idle_sleep, args.drain),
+            name=f'scrape-worker-{index}'
+        )
+        process.start()
+        processes.append(process)
+    print(f"🚀 Started {len(processes)} scrape worker(s)")
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print("🛑 Stopping workers (leases of unfinished jobs will expire and be retried)")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+def status(args):
+    queue = get_queue(args.config)
+    if args.jobs:
+        print(json.dumps(queue.list_jobs(status=args.status, limit=args.limit), indent=2))
+    else:
+        print(json.dumps(queue.stats(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG') or 'default')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='add accounts to the queue')
+    enqueue_parser.add_argument('usernames', nargs='*')
+    enqueue_parser.add_argument('--file', help='file with one username per line')
+    enqueue_parser.add_argument('--max-tweets', type=int, default=config['default'].MAX_TWEETS_PER_REQUEST)
+    enqueue_parser.add_argument('--mode', choices=['incremental', 'full'], default='incremental')
+    enqueue_parser.add_argument('--priority', type=int, default=0)
+    enqueue_parser.set_defaults(func=enqueue)
+
+    run_parser = subparsers.add_parser('run', help='start a fleet of worker processes')
+    run_parser.add_argument('--workers', type=int, default=config['default'].SCRAPE_WORKERS)
+    run_parser.add_argument('--idle-sleep', type=float, default=5.0)
+    run_parser.add_argument('--drain', action='store_true', help='exit once the queue is empty')
+    run_parser.set_defaults(func=run)
+
+    status_parser = subparsers.add_parser('status', help='show queue counts and running jobs')
+    status_parser.add_argument('--jobs', action='store_true', help='list individual jobs')
+    status_parser.add_argument('--status', choices=['pending', 'leased', 'done', 'failed'])
+    status_parser.add_argument('--limit', type=int, default=50)
+    status_parser.set_defaults(func=status)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Parity of the shared text preprocessing with the original TextClassifier.preprocess_text"""
+import pytest
+
+from app.utils.text_preprocessing import _BATCH_SEPARATOR, normalize_text, normalize_texts
+from benchmarks.bench_text_preprocessing import build_corpus, legacy_preprocess_text
+
+EDGE_CASES = [
+    '',
+    '   ',
+    '\t\n\r\n',
+    'Hello WORLD',
+    'see https://t.co/abc123 now',
+    'http://x.com/a?b=1,www.example.org/path and wwwdot',
+    '3http://a 2024 ١٢٣ $100 50%',
+    "don't e.g. ... !!! #Hashtag @mention email@site.com",
+    'ΣΟΦΟΣ İstanbul straße naïve ÉCOLE 東京 héllo ﬁne',
+    'emoji 🙂🔥 👩‍👩‍👧 inside🙂words',
+    'ends with a url https://t.co/x',
+    'https://t.co/x starts with a url',
+    f'contains the {_BATCH_SEPARATOR} batch separator',
+    f'url before separator http://a.b{_BATCH_SEPARATOR}next',
+    _BATCH_SEPARATOR,
+    'other separators \x1c\x1d\x1f between words',
+]
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_normalize_text_matches_legacy(text):
+    assert normalize_text(text) == legacy_preprocess_text(text)
+
+
+def test_normalize_texts_matches_legacy_per_text():
+    texts = [text for text in EDGE_CASES if _BATCH_SEPARATOR not in text]
+    assert normalize_texts(texts) == [legacy_preprocess_text(text) for text in texts]
+
+
+def test_normalize_texts_with_separator_in_input():
+    # A text containing the join character falls back to per-text normalization
+    assert normalize_texts(EDGE_CASES) == [legacy_preprocess_text(text) for text in EDGE_CASES]
+
+
+def test_urls_do_not_run_across_batch_items():
+    texts = ['ends with http://a.com/x', 'keep these words', 'www.b.org', 'tail']
+    assert normalize_texts(texts) == ['ends with', 'keep these words', '', 'tail']
+
+
+def test_normalize_texts_empty_batch():
+    assert normalize_texts([]) == []
+
+
+def test_synthetic_corpus_and_every_code_point():
+    corpus = build_corpus(2000)
+    expected = [legacy_preprocess_text(text) for text in corpus]
+    assert [normalize_text(text) for text in corpus] == expected
+    assert normalize_texts(corpus) == expected
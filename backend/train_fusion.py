@@ -0,0 +1,213 @@
+"""
+Train the fusion models offline and publish them as a new artifact version.
+
+    python train_fusion.py                                  # score Dataset_Image_text, fit, publish
+    python train_fusion.py --workers 4 --batch-size 32 --limit-texts 5000
+    python train_fusion.py --fit-only --profiles 50000      # refit from the cached outputs only
+
+Base-model outputs are cached per item in --cache-dir as text.npz and
+image.npz (item keys, labels and one (items, 3) column per model), so a rerun
+only scores new items or models and refitting never runs XLNet/CLIP. Items
+are split into train and held-out sets before synthetic profiles are drawn
+from each; the held-out report is published as metadata.json. Running servers
+pick the new version up through the artifact store's hot reload.
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import math
+import os
+import time
+
+import numpy as np
+
+from app.config import Config
+from app.utils.artifact_store import ArtifactStore
+from app.utils.fusion_engine import ARTIFACT_FILES, FusionEngine
+from app.utils.fusion_training import evaluate, fit_fusion_models, sample_profiles
+from app.utils.model_paths import FUSION_ARTIFACT_DIR
+from benchmarks.datasets import DATASET_DIR, TEXT_DATASET_DIR, load_image_samples, load_text_samples
+
+# The multi-class sheet uses the classifiers' label order; the binary sheets do not
+TEXT_LABELED_DIR = os.path.join(TEXT_DATASET_DIR, 'Multi_Class')
+IMAGE_LABELS = {'Non-radical': 0, 'Radical': 2}
+DEFAULT_CACHE_DIR = os.path.join('instance', 'fusion_cache')
+
+
+def load_text_items(limit=None):
+    """(keys, texts, labels) for the labeled tweets of the three classes"""
+    samples = [
+        (text, int(label)) for text, label in load_text_samples(directory=TEXT_LABELED_DIR, labeled_only=True)
+        if not (isinstance(label, float) and math.isnan(label)) and 0 <= label < 3
+    ][:limit]
+    keys = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text, _ in samples]
+    return keys, [text for text, _ in samples], np.array([label for _, label in samples], dtype=int)
+
+
+def load_image_items(limit=None):
+    """(keys, paths, labels) for the image folders with a known class"""
+    samples = [(path, IMAGE_LABELS[folder]) for path, folder in load_image_samples() if folder in IMAGE_LABELS][:limit]
+    keys = [os.path.relpath(path, DATASET_DIR) for path, _ in samples]
+    return keys, [path for path, _ in samples], np.array([label for _, label in samples], dtype=int)
+
+
+def load_cache(path):
+    """Columns of a cached output file: keys, labels and one array per model"""
+    if not os.path.exists(path):
+        return {'keys': np.array([], dtype=str), 'labels': np.array([], dtype=int)}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def save_cache(path, columns):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    staging = f'{path}.tmp'
+    with open(staging, 'wb') as f:
+        np.savez(f, **columns)
+    os.replace(staging, path)
+
+
+def _init_worker(threads):
+    import torch
+    torch.set_num_threads(threads)
+
+
+def _score_batch(kind, model_name, items):
+    """Per-item probabilities for one batch, in a worker process holding its own models"""
+    if kind == 'text':
+        from app.utils.text_classification import TextClassifier
+        return TextClassifier(model_name=model_name).predict_items(items, batch_size=len(items))
+    from app.utils.image_classification import ImageClassifier
+    return ImageClassifier(model_name=model_name).predict_items(items, batch_size=len(items))
+
+
+def score_items(kind, model_names, keys, inputs, labels, cache_path, workers, batch_size):
+    """Extend the cache with every model's outputs for items it has not scored yet"""
+    columns = load_cache(cache_path)
+    known = set(columns['keys'].tolist())
+    new_rows = [row for row, key in enumerate(keys) if key not in known]
+    if new_rows:
+        columns['keys'] = np.concatenate([columns['keys'], np.array([keys[row] for row in new_rows])])
+        columns['labels'] = np.concatenate([columns['labels'], labels[new_rows]])
+    size = len(columns['keys'])
+    input_by_key = dict(zip(keys, inputs))
+
+    for model_name in model_names:
+        column = columns.get(model_name, np.full((0, 3), np.nan))
+        column = np.concatenate([column, np.full((size - len(column), 3), np.nan)])
+        pending = [row for row in np.flatnonzero(np.isnan(column).any(axis=1))
+                   if columns['keys'][row] in input_by_key]
+        if not pending:
+            print(f"✓ {model_name}: all {size} {kind} items cached")
+            columns[model_name] = column
+            continue
+
+        print(f"🔄 Scoring {len(pending)} {kind} items with {model_name} ({workers} workers, batches of {batch_size})")
+        start = time.perf_counter()
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            futures = {}
+            for offset in range(0, len(pending), batch_size):
+                rows = pending[offset:offset + batch_size]
+                batch = [input_by_key[columns['keys'][row]] for row in rows]
+                futures[pool.submit(_score_batch, kind, model_name, batch)] = rows
+            for future in concurrent.futures.as_completed(futures):
+                column[futures[future]] = future.result()
+
+        columns[model_name] = column
+        save_cache(cache_path, columns)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {model_name}: {len(pending)} items in {elapsed:.1f}s ({len(pending) / elapsed:.1f} items/s)")
+    return columns
+
+
+def cached_outputs(columns, model_names):
+    """(items, models, 3) outputs and labels for the items every model has scored"""
+    missing = [name for name in model_names if name not in columns]
+    if missing:
+        raise SystemExit(f"No cached outputs for {', '.join(missing)}; run without --fit-only first")
+    probs = np.stack([columns[name] for name in model_names], axis=1) if model_names else \
+        np.empty((len(columns['labels']), 0, 3))
+    complete = ~np.isnan(probs).any(axis=(1, 2))
+    return probs[complete], columns['labels'][complete]
+
+
+def split(probs, labels, holdout, rng):
+    held_out = rng.random(len(labels)) < holdout
+    return (probs[~held_out], labels[~held_out]), (probs[held_out], labels[held_out])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--text-models', nargs='+', choices=['xlnet', 'bert'], default=['xlnet', 'bert'])
+    parser.add_argument('--image-models', nargs='+', choices=['vgg16', 'clip'], default=['vgg16', 'clip'])
+    parser.add_argument('--workers', type=int, default=2, help='scoring processes, each loads its own models')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--limit-texts', type=int, default=None)
+    parser.add_argument('--limit-images', type=int, default=None)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--fit-only', action='store_true', help='skip scoring and fit from the cache')
+    parser.add_argument('--profiles', type=int, default=20000, help='synthetic training profiles')
+    parser.add_argument('--holdout', type=float, default=0.2, help='fraction of items kept for evaluation')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--artifact-dir', default=Config.FUSION_ARTIFACT_DIR or FUSION_ARTIFACT_DIR)
+    parser.add_argument('--version', default=None, help='artifact version name (default: timestamp)')
+    parser.add_argument('--no-publish', action='store_true', help='fit and report without writing artifacts')
+    args = parser.parse_args()
+
+    text_cache = os.path.join(args.cache_dir, 'text.npz')
+    image_cache = os.path.join(args.cache_dir, 'image.npz')
+    if args.fit_only:
+        text_columns, image_columns = load_cache(text_cache), load_cache(image_cache)
+    else:
+        keys, texts, labels = load_text_items(args.limit_texts)
+        text_columns = score_items('text', args.text_models, keys, texts, labels, text_cache,
+                                   args.workers, args.batch_size)
+        keys, paths, labels = load_image_items(args.limit_images)
+        image_columns = score_items('image', args.image_models, keys, paths, labels, image_cache,
+                                    args.workers, args.batch_size)
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(args.seed)
+    text_train, text_test = split(*cached_outputs(text_columns, args.text_models), args.holdout, rng)
+    image_train, image_test = split(*cached_outputs(image_columns, args.image_models), args.holdout, rng)
+
+    def profiles(text, image, count, seed):
+        return sample_profiles(text[0], text[1], image[0], image[1], args.text_models, args.image_models,
+                               count, seed=seed)
+
+    train_outputs, train_labels = profiles(text_train, image_train, args.profiles, args.seed)
+    test_outputs, test_labels = profiles(text_test, image_test, max(1, int(args.profiles * args.holdout)),
+                                         args.seed + 1)
+
+    artifacts = fit_fusion_models(train_outputs, train_labels)
+    fitted = evaluate(FusionEngine.from_artifacts(artifacts), test_outputs, test_labels)
+    untrained = evaluate(FusionEngine(), test_outputs, test_labels)
+    print(f"⚡ Fitted fusion models on {len(train_labels)} profiles in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'technique':<18}{'accuracy':>10}{'log loss':>10}   (untrained fallback)")
+    for technique, scores in fitted.items():
+        baseline = untrained[technique]
+        print(f"{technique:<18}{scores['accuracy']:>10.3f}{scores['log_loss']:>10.3f}"
+              f"   ({baseline['accuracy']:.3f} / {baseline['log_loss']:.3f})")
+
+    if args.no_publish:
+        return
+
+    store = ArtifactStore(args.artifact_dir, list(ARTIFACT_FILES.values()), FusionEngine.from_artifacts)
+    version = store.publish(artifacts, args.version, metadata={
+        'text_models': args.text_models,
+        'image_models': args.image_models,
+        'text_items': int(len(text_train[1]) + len(text_test[1])),
+        'image_items': int(len(image_train[1]) + len(image_test[1])),
+        'profiles': args.profiles,
+        'holdout': args.holdout,
+        'seed': args.seed,
+        'held_out': fitted,
+        'untrained_fallback': untrained
+    })
+    print(f"📦 Published fusion artifacts version {version} to {args.artifact_dir}")
+
+
+if __name__ == '__main__':
+    main()
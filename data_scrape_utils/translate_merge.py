@@ -16,6 +16,13 @@ DetectorFactory.seed = 0
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Precompiled clean_text patterns (applied in this order)
+MENTION_PATTERN = re.compile(r'@\w+')
+HASHTAG_PATTERN = re.compile(r'#(\w+)')
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,!?;:\-\'\"()]')
+
 class TweetProcessor:
     def __init__(self, folder_path=".", output_file="processed_tweets.csv"):
         self.folder_path = folder_path
@@ -32,22 +39,22 @@ class TweetProcessor:
             return ""
             
         # Remove @ mentions
-        text = re.sub(r'@\w+', '', text)
+        text = MENTION_PATTERN.sub('', text)
         
         # Remove hashtags but keep the text (remove # symbol)
-        text = re.sub(r'#(\w+)', r'\1', text)
+        text = HASHTAG_PATTERN.sub(r'\1', text)
         
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+        text = URL_PATTERN.sub('', text)
         
         # Remove extra whitespace and newlines
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
         
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?;:\-\'\"()]', '', text)
+        text = SPECIAL_CHARS_PATTERN.sub('', text)
         
         return text
     